@@ -0,0 +1,348 @@
+"""
+RAG Policy Assistant - Headless HTTP Query Service
+Async JSON/SSE API over the RAG pipeline for programmatic clients
+
+Endpoints:
+    POST /ask          {"question": "...", "k": 4} -> answer JSON
+    POST /ask/stream   same body -> text/event-stream of token/result events
+    GET  /healthz      liveness: the process is up
+    GET  /readyz       readiness: the shared vector store is loaded
+    GET  /metrics      Prometheus text format latency and token metrics
+
+Each worker checks the index manifest every INDEX_POLL_SECONDS and reopens
+the store when another process (e.g. the Streamlit app) publishes a new
+version, and holds a lease so that process's garbage collection keeps the
+collection it is serving.
+
+Run from the project root:
+    python app/api.py --workers 4
+    uvicorn app.api:app --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+# Load environment variables from .env file
+from dotenv import load_dotenv
+load_dotenv()
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.index_manifest import index_version, load_manifest
+from src.metrics import registry
+from src.rag_pipeline import check_system_health, rag_answer_astream, rag_answer_async
+from src.shared_resources import (
+    get_shared_chat_model,
+    get_shared_embeddings,
+    shared_answer_cache,
+    shared_index,
+    ServingIndex
+)
+from src.singleflight import AsyncSingleFlight, flight_key
+from src.vector_store import lease_collection, load_indexed_vector_store, load_keyword_index
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PERSIST_DIR = PROJECT_ROOT / os.getenv("VECTOR_STORE_PATH", "chroma_db")
+
+MAX_BODY_BYTES = 16 * 1024
+MAX_QUESTION_CHARS = 2000
+MAX_K = 20
+
+# Seconds between checks for a new index version (and lease refreshes)
+INDEX_POLL_SECONDS = float(os.getenv("INDEX_POLL_SECONDS", "10"))
+
+# Loading state shared by the handlers of this worker
+_state = {"error": None}
+
+# Identical questions in flight on this worker share one computation
+_flights = AsyncSingleFlight()
+
+
+def _load_store() -> None:
+    """Open the indexed collection and publish it as the shared store"""
+    # A quantized export, when present, is memory-mapped so workers share its pages
+    vectorstore, manifest = load_indexed_vector_store(
+        str(PERSIST_DIR),
+        embeddings=get_shared_embeddings(),
+        prefer_quantized=True
+    )
+    keyword_index = load_keyword_index(str(PERSIST_DIR), manifest)
+    shared_index.swap(ServingIndex(vectorstore, keyword_index, manifest))
+    # Garbage collection in other processes keeps this collection while leased
+    lease_collection(str(PERSIST_DIR), manifest["collection_name"])
+
+
+def _refresh_store() -> bool:
+    """
+    Reopen the store if the manifest names a new index version
+
+    Returns:
+        True if a new version was loaded
+    """
+    manifest = load_manifest(str(PERSIST_DIR))
+    if manifest is None:
+        return False
+    current = shared_index.peek()
+    if current is not None and index_version(manifest) == current.version:
+        lease_collection(str(PERSIST_DIR), manifest["collection_name"])
+        return False
+    _load_store()
+    _state["error"] = None
+    return True
+
+
+async def _preload() -> None:
+    try:
+        await asyncio.to_thread(_load_store)
+        # Warm the chat client so the first request doesn't build it
+        get_shared_chat_model()
+    except Exception as e:
+        _state["error"] = str(e)
+        print(f"Vector store not loaded: {e}")
+
+
+async def _watch_index() -> None:
+    """Follow reindexes by other processes (e.g. the Streamlit app)"""
+    while True:
+        await asyncio.sleep(INDEX_POLL_SECONDS)
+        try:
+            if await asyncio.to_thread(_refresh_store):
+                print(f"Loaded index version {shared_index.peek().version}")
+        except Exception as e:
+            print(f"Index refresh failed, still serving the loaded version: {e}")
+
+
+# =============================================================================
+# ASGI helpers
+# =============================================================================
+
+async def _send_json(send, status: int, payload: Dict) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii"))
+        ]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            raise ValueError("Request body too large")
+        if not message.get("more_body"):
+            return body
+
+
+async def _parse_question(receive) -> Dict:
+    """Validate an /ask body; raises ValueError with a client-facing message"""
+    try:
+        payload = json.loads(await _read_body(receive) or b"{}")
+    except json.JSONDecodeError:
+        raise ValueError("Body must be JSON")
+
+    question = payload.get("question") if isinstance(payload, dict) else None
+    if not isinstance(question, str) or not question.strip():
+        raise ValueError("'question' must be a non-empty string")
+    if len(question) > MAX_QUESTION_CHARS:
+        raise ValueError(f"'question' must be at most {MAX_QUESTION_CHARS} characters")
+
+    k = payload.get("k", 4)
+    # bool is an int subclass: {"k": true} must not mean k=1
+    if isinstance(k, bool) or not isinstance(k, int) or not 1 <= k <= MAX_K:
+        raise ValueError(f"'k' must be an integer between 1 and {MAX_K}")
+
+    return {"question": question.strip(), "k": k}
+
+
+def _pipeline_kwargs() -> Optional[Dict]:
+    """Shared store and clients for the pipeline, or None if not ready"""
+    index = shared_index.peek()
+    if index is None:
+        return None
+    return {
+        "vectorstore": index.vectorstore,
+        "llm": get_shared_chat_model(),
+        "cache": shared_answer_cache,
+        "index_version": index.version,
+        "keyword_index": index.keyword_index
+    }
+
+
+# =============================================================================
+# Handlers
+# =============================================================================
+
+async def handle_ask(scope, receive, send) -> None:
+    try:
+        request = await _parse_question(receive)
+    except ValueError as e:
+        await _send_json(send, 400, {"error": str(e)})
+        return
+
+    kwargs = _pipeline_kwargs()
+    if kwargs is None:
+        await _send_json(send, 503, {"error": "Vector store not loaded"})
+        return
+
+    result, _ = await _flights.do(
+        flight_key(request["question"], kwargs["index_version"], request["k"]),
+        lambda: rag_answer_async(question=request["question"], k=request["k"], **kwargs),
+        request["question"]
+    )
+    await _send_json(send, 200, result)
+
+
+async def handle_ask_stream(scope, receive, send) -> None:
+    try:
+        request = await _parse_question(receive)
+    except ValueError as e:
+        await _send_json(send, 400, {"error": str(e)})
+        return
+
+    kwargs = _pipeline_kwargs()
+    if kwargs is None:
+        await _send_json(send, 503, {"error": "Vector store not loaded"})
+        return
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache")
+        ]
+    })
+
+    events = _flights.stream(
+        flight_key(request["question"], kwargs["index_version"], request["k"]),
+        lambda: rag_answer_astream(question=request["question"], k=request["k"], **kwargs),
+        request["question"]
+    )
+    async for event in events:
+        data = event["content"] if event["type"] == "token" else event["result"]
+        chunk = f"event: {event['type']}\ndata: {json.dumps(data)}\n\n"
+        await send({
+            "type": "http.response.body",
+            "body": chunk.encode("utf-8"),
+            "more_body": True
+        })
+
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def handle_healthz(scope, receive, send) -> None:
+    await _send_json(send, 200, {"status": "ok"})
+
+
+async def handle_readyz(scope, receive, send) -> None:
+    index = shared_index.peek()
+    health = check_system_health(index.vectorstore if index else None)
+    health["index_version"] = index.version if index else None
+    if _state["error"]:
+        health["error"] = _state["error"]
+
+    ready = shared_index.is_loaded
+    await _send_json(send, 200 if ready else 503, health)
+
+
+async def handle_metrics(scope, receive, send) -> None:
+    body = registry.render_prometheus().encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"text/plain; version=0.0.4; charset=utf-8"),
+            (b"content-length", str(len(body)).encode("ascii"))
+        ]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+ROUTES = {
+    ("POST", "/ask"): handle_ask,
+    ("POST", "/ask/stream"): handle_ask_stream,
+    ("GET", "/healthz"): handle_healthz,
+    ("GET", "/readyz"): handle_readyz,
+    ("GET", "/metrics"): handle_metrics,
+}
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            # Load in the background so /healthz answers while the store opens
+            _state["preload"] = asyncio.create_task(_preload())
+            _state["watch"] = asyncio.create_task(_watch_index())
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _state["watch"].cancel()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    """ASGI entry point"""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    handler = ROUTES.get((scope["method"], scope["path"]))
+    if handler is None:
+        await _send_json(send, 404, {"error": "Not found"})
+        return
+
+    started = False
+
+    async def tracked_send(message):
+        nonlocal started
+        if message["type"] == "http.response.start":
+            started = True
+        await send(message)
+
+    try:
+        await handler(scope, receive, tracked_send)
+    except Exception as e:
+        # A stream that already started can only be cut short
+        if started:
+            raise
+        await _send_json(send, 500, {"error": str(e)})
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the policy assistant HTTP API")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", "1")))
+    args = parser.parse_args()
+
+    # Each worker process preloads its own copy of the store at startup
+    uvicorn.run(
+        "app.api:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        app_dir=str(PROJECT_ROOT)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,8 @@ import sys
 import os
 from pathlib import Path
 import json
+import time
 from datetime import datetime
-import hashlib
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
@@ -18,9 +18,31 @@ load_dotenv()
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from src.document_processor import process_policies
-from src.vector_store import get_or_create_vector_store
-from src.rag_pipeline import rag_answer, check_system_health
+from src.index_manifest import load_manifest
+from src.ingestion import INGEST_WORKERS
+from src.vector_store import (
+    build_indexed_vector_store,
+    collect_garbage,
+    get_embedding_cache_stats,
+    lease_collection,
+    load_indexed_vector_store,
+    load_keyword_index,
+    pending_policy_changes
+)
+from src.rag_pipeline import rag_answer_stream, check_system_health
+from src.singleflight import flight_key
+from src.shared_resources import (
+    get_shared_chat_model,
+    get_shared_embeddings,
+    shared_answer_cache,
+    shared_flights,
+    shared_index,
+    shared_reindexer,
+    ServingIndex
+)
+
+POLICIES_DIR = Path(__file__).parent.parent / "data" / "policies"
+PERSIST_DIR = Path(__file__).parent.parent / os.getenv("VECTOR_STORE_PATH", "chroma_db")
 
 # Page config
 st.set_page_config(
@@ -65,148 +87,199 @@ st.markdown("""
 if 'messages' not in st.session_state:
     st.session_state.messages = []
 
-if 'vectorstore' not in st.session_state:
-    st.session_state.vectorstore = None
+# Start time of the last background reindex this session has reported
+if 'reindex_seen' not in st.session_state:
+    st.session_state.reindex_seen = None
 
-if 'vectorstore_loaded' not in st.session_state:
-    st.session_state.vectorstore_loaded = False
+# The vector store and OpenAI clients are shared by every session in this
+# process (see src/shared_resources.py), so only chat history lives here
 
-if 'collection_version' not in st.session_state:
-    st.session_state.collection_version = 1
 
+def get_collection_version(manifest):
+    """Version number of the collection named in the manifest (0 if none)"""
+    name = (manifest or {}).get("collection_name", "")
+    if name.startswith("policy_documents_v"):
+        return int(name.rsplit("_v", 1)[1])
+    return 0
 
-def get_policies_hash():
+
+def build_vectorstore(notices):
     """
-    Calculate hash of all policy files to detect changes
+    Index all policies into a new versioned collection
+    
+    Args:
+        notices: List collecting messages to show the user
     """
-    policies_dir = Path(__file__).parent.parent / "data" / "policies"
+    manifest = load_manifest(str(PERSIST_DIR))
     
-    if not policies_dir.exists():
-        return None
+    # Use versioned collection name to avoid conflicts
+    collection_name = f"policy_documents_v{get_collection_version(manifest) + 1}"
     
-    # Get all markdown files
-    md_files = sorted(policies_dir.glob("*.md"))
+    vectorstore = build_indexed_vector_store(
+        str(POLICIES_DIR),
+        persist_directory=str(PERSIST_DIR),
+        collection_name=collection_name,
+        embeddings=get_shared_embeddings(),
+        workers=INGEST_WORKERS
+    )
     
-    # Create hash from file contents
-    hasher = hashlib.md5()
-    for md_file in md_files:
-        with open(md_file, 'rb') as f:
-            hasher.update(f.read())
+    cache_stats = get_embedding_cache_stats(vectorstore)
+    if cache_stats:
+        notices.append(
+            f"♻️ Embedding cache: {cache_stats['hits']} chunks reused, "
+            f"{cache_stats['misses']} newly embedded"
+        )
     
-    return hasher.hexdigest()
+    return vectorstore
 
 
-def initialize_vectorstore(force_reload=False):
+def open_vectorstore(notices):
     """
-    Initialize or load vector store
+    Load the collection named in the index manifest
+    
+    The manifest decides the collection and its backend. The collection is
+    never synced in place; policy changes are applied by a blue/green
+    rebuild (see refresh_changed_policies). Falls back to a full build
+    without a manifest or when the embedding model changed.
+    
+    Args:
+        notices: List collecting messages to show the user
+    """
+    if load_manifest(str(PERSIST_DIR)) is None:
+        return build_vectorstore(notices)
+    
+    try:
+        vectorstore, _ = load_indexed_vector_store(str(PERSIST_DIR), get_shared_embeddings())
+    except ValueError:
+        # Vectors from another embedding model cannot answer queries
+        notices.append("🔁 Embedding model changed; rebuilding the index")
+        return build_vectorstore(notices)
+    
+    return vectorstore
+
+
+def refresh_changed_policies(index):
+    """
+    Rebuild in the background if policies changed since the index was built
+    
+    Sessions keep answering from the current collection until the new one
+    is validated and swapped in. Unchanged chunks come from the embedding
+    cache, so only added or edited files are embedded again.
     
     Args:
-        force_reload: If True, recreate even if exists
+        index: ServingIndex currently shared by all sessions
+    """
+    if index.manifest is None:
+        return
+    
+    try:
+        changes = pending_policy_changes(str(POLICIES_DIR), index.manifest)
+    except ValueError:
+        st.info("🔁 Chunking settings changed since the index was built")
+        reload_policies()
+        return
+    
+    changed_files = changes["added"] + changes["changed"] + changes["removed"]
+    if changed_files:
+        st.info(f"📝 Policy changes detected in {len(changed_files)} file(s)")
+        reload_policies()
+
+
+def serving_index(vectorstore):
+    """
+    Pair a just built or loaded store with its manifest and keyword index
+    
+    Runs right after the build, on the same thread, so the manifest read
+    is the one the build wrote.
+    """
+    manifest = load_manifest(str(PERSIST_DIR))
+    return ServingIndex(vectorstore, load_keyword_index(str(PERSIST_DIR), manifest), manifest)
+
+
+def publish_index(index):
+    """Make a newly built index the shared one"""
+    shared_index.swap(index)
+    # Other processes' garbage collection keeps the collection while leased
+    if index.manifest is not None:
+        lease_collection(str(PERSIST_DIR), index.manifest["collection_name"])
+
+
+def remove_old_collections(status):
+    """Delete collections the new manifest no longer needs (after a swap)"""
+    report = collect_garbage(str(PERSIST_DIR))
+    if report["collections"] or report["segments"]:
+        status["notices"].append(
+            f"🧹 Removed {len(report['collections'])} old collection(s), "
+            f"{report['bytes_reclaimed'] / 1024 / 1024:.1f} MB reclaimed"
+        )
+
+
+def initialize_vectorstore():
+    """
+    Initialize or load the process-wide vector store
+    
+    The first session to call this loads the store; every other session
+    reuses it.
     """
     with st.spinner("🔄 Initializing system..."):
         try:
-            policies_dir = Path(__file__).parent.parent / "data" / "policies"
-            persist_dir = Path(__file__).parent.parent / "chroma_db"
+            notices = []
             
-            # Get current policies hash
-            current_hash = get_policies_hash()
+            index = shared_index.get(lambda: serving_index(open_vectorstore(notices)))
+            if index.manifest is not None:
+                lease_collection(str(PERSIST_DIR), index.manifest["collection_name"])
             
-            # Check if we need to reload
-            need_reload = force_reload
+            for notice in notices:
+                st.info(notice)
             
-            if persist_dir.exists() and not force_reload:
-                # Check if policies have changed
-                hash_file = persist_dir / ".policies_hash"
-                if hash_file.exists():
-                    with open(hash_file, 'r') as f:
-                        stored_hash = f.read().strip()
-                    if stored_hash != current_hash:
-                        st.info("📝 Policy changes detected. Reloading...")
-                        need_reload = True
-                else:
-                    # No hash file, assume first run
-                    need_reload = False
-            else:
-                need_reload = True
+            if not shared_reindexer.is_running:
+                refresh_changed_policies(index)
             
-            # Close existing connection if reloading
-            if need_reload and st.session_state.vectorstore is not None:
-                try:
-                    # Close connection gracefully
-                    st.session_state.vectorstore._client.reset()
-                except:
-                    pass
-                st.session_state.vectorstore = None
-                
-                # Force garbage collection
-                import gc
-                gc.collect()
-                
-                # Small delay
-                import time
-                time.sleep(0.5)
-            
-            # Create or load vector store
-            if need_reload:
-                # Process policies
-                chunks = process_policies(str(policies_dir))
-                
-                # Use versioned collection name to avoid conflicts
-                collection_name = f"policy_documents_v{st.session_state.collection_version}"
-                
-                # Create new vector store with force_recreate
-                vectorstore = get_or_create_vector_store(
-                    chunks=chunks,
-                    persist_directory=str(persist_dir),
-                    collection_name=collection_name,
-                    force_recreate=True
-                )
-                
-                # Save hash
-                hash_file = persist_dir / ".policies_hash"
-                with open(hash_file, 'w') as f:
-                    f.write(current_hash)
-                
-                if force_reload:
-                    st.success("✅ Policies reloaded successfully!")
-                else:
-                    st.success("✅ System ready! Ask me anything about company policies.")
-            else:
-                # Load existing
-                collection_name = f"policy_documents_v{st.session_state.collection_version}"
-                vectorstore = get_or_create_vector_store(
-                    persist_directory=str(persist_dir),
-                    collection_name=collection_name
-                )
-                st.success("✅ System ready! Ask me anything about company policies.")
-            
-            # Update session state
-            st.session_state.vectorstore = vectorstore
-            st.session_state.vectorstore_loaded = True
+            st.success("✅ System ready! Ask me anything about company policies.")
             
         except Exception as e:
             st.error(f"❌ Error initializing system: {str(e)}")
-            st.session_state.vectorstore_loaded = False
 
 
 def reload_policies():
     """
-    Reload policies - production ready solution
-    Works on all operating systems including Windows
+    Rebuild the index into a new collection in the background
+    
+    The new collection is validated and then swapped in atomically; until
+    then every session keeps answering from the current collection, so a
+    reload causes no query downtime.
+    
+    Returns:
+        True if a rebuild was started, False if one is already running
     """
-    try:
-        with st.spinner("♻️ Reloading policies..."):
-            # Increment collection version to use new collection
-            st.session_state.collection_version += 1
-            
-            # Reinitialize with force reload
-            initialize_vectorstore(force_reload=True)
-            
-            return True
-            
-    except Exception as e:
-        st.error(f"❌ Error reloading policies: {str(e)}")
-        return False
+    started = shared_reindexer.start(
+        build=lambda status: serving_index(build_vectorstore(status["notices"])),
+        publish=publish_index,
+        cleanup=remove_old_collections
+    )
+    if started:
+        st.info("♻️ Reloading policies in the background. Answers use the current policies until it finishes.")
+    else:
+        st.info("♻️ A policy reload is already running.")
+    return started
+
+
+def show_reindex_status():
+    """Report a running background reload, or its outcome once per session"""
+    status = shared_reindexer.status()
+    state = status["state"]
+    
+    if state == "running":
+        elapsed = time.time() - status["started_at"]
+        st.info(f"♻️ Reloading policies... ({elapsed:.0f}s)")
+    elif state in ("succeeded", "failed") and st.session_state.reindex_seen != status["started_at"]:
+        st.session_state.reindex_seen = status["started_at"]
+        if state == "succeeded":
+            for notice in status["notices"]:
+                st.info(notice)
+            st.success(f"✅ Policies reloaded in {status['duration']:.1f}s")
+        else:
+            st.error(f"❌ Policy reload failed: {status['error']}. Still serving the previous policies.")
 
 
 def show_health_check():
@@ -216,7 +289,7 @@ def show_health_check():
     
     try:
         # Get health status
-        health_data = check_system_health(st.session_state.vectorstore)
+        health_data = check_system_health(getattr(shared_index.peek(), "vectorstore", None))
         
         # Overall status
         status = health_data.get("status", "unknown")
@@ -278,7 +351,9 @@ def show_health_check():
             health_data["timestamp"] = datetime.now().isoformat()
             health_data["policies_loaded"] = 8
             health_data["streamlit_version"] = st.__version__
-            health_data["collection_version"] = st.session_state.collection_version
+            health_data["collection_version"] = get_collection_version(
+                getattr(shared_index.peek(), "manifest", None)
+            )
             
             st.json(health_data)
         
@@ -325,7 +400,7 @@ def main():
         
         # System status
         st.markdown("### System Status")
-        if st.session_state.vectorstore_loaded:
+        if shared_index.is_loaded:
             st.success("🟢 Ready")
             st.info("📚 8 policy documents loaded")
         else:
@@ -338,10 +413,11 @@ def main():
             initialize_vectorstore()
             st.rerun()
         
-        # Reload button - PRODUCTION READY
+        # Reload button - rebuilds in the background
         if st.button("♻️ Reload Policies", use_container_width=True):
-            if reload_policies():
-                st.rerun()
+            reload_policies()
+        
+        show_reindex_status()
         
         with st.expander("ℹ️ About Reloading"):
             st.markdown("""
@@ -350,9 +426,9 @@ def main():
             - To refresh with latest content
             
             **How it works:**
-            - Automatically detects policy changes
-            - Creates new vector database
-            - Works on all operating systems
+            - Builds a new collection in the background
+            - Validates it, then swaps it in atomically
+            - Answers keep coming from the current policies meanwhile
             - No manual deletion needed ✅
             """)
         
@@ -398,7 +474,7 @@ def main():
                 unsafe_allow_html=True)
     
     # Check if system is ready
-    if not st.session_state.vectorstore_loaded:
+    if not shared_index.is_loaded:
         st.warning("⚠️ System not initialized. Click 'Initialize System' in the sidebar.")
         
         # Auto-initialize on first run
@@ -429,43 +505,62 @@ def main():
         with st.chat_message("user"):
             st.markdown(prompt)
         
-        # Generate response
+        # Generate response, rendering tokens as they arrive
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                try:
-                    result = rag_answer(
-                        st.session_state.vectorstore,
-                        prompt,
-                        k=4
+            try:
+                result = {}
+                
+                # One read, so store, keyword index and version match
+                index = shared_index.peek()
+                
+                def answer_tokens():
+                    # Users asking the same question at once share one answer
+                    events = shared_flights.stream(
+                        flight_key(prompt, index.version, k=4),
+                        lambda: rag_answer_stream(
+                            index.vectorstore,
+                            prompt,
+                            k=4,
+                            llm=get_shared_chat_model(),
+                            cache=shared_answer_cache,
+                            index_version=index.version,
+                            keyword_index=index.keyword_index
+                        ),
+                        prompt
                     )
-                    
-                    answer = result["answer"]
-                    sources = result["sources"]
-                    
-                    # Display answer
-                    st.markdown(answer)
-                    
-                    # Display sources
-                    if sources:
-                        with st.expander("📄 View Sources"):
-                            for src in sources:
-                                st.markdown(f"- **{src['policy']}** ({src['file']})")
-                    
-                    # Add to chat history
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": answer,
-                        "sources": sources
-                    })
-                    
-                except Exception as e:
-                    error_msg = f"Error: {str(e)}"
-                    st.error(error_msg)
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": error_msg,
-                        "sources": []
-                    })
+                    for event in events:
+                        if event["type"] == "token":
+                            yield event["content"]
+                        else:
+                            result.update(event["result"])
+                
+                # Display answer
+                st.write_stream(answer_tokens())
+                
+                answer = result["answer"]
+                sources = result["sources"]
+                
+                # Display sources
+                if sources:
+                    with st.expander("📄 View Sources"):
+                        for src in sources:
+                            st.markdown(f"- **{src['policy']}** ({src['file']})")
+                
+                # Add to chat history
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": answer,
+                    "sources": sources
+                })
+                
+            except Exception as e:
+                error_msg = f"Error: {str(e)}"
+                st.error(error_msg)
+                st.session_state.messages.append({
+                    "role": "assistant",
+                    "content": error_msg,
+                    "sources": []
+                })
     
     # Example questions
     if not st.session_state.messages:
@@ -0,0 +1,3 @@
+"""
+Benchmarks and load-testing tools for RAG Policy Assistant
+"""
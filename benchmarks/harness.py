@@ -0,0 +1,194 @@
+"""
+Benchmark harness for RAG Policy Assistant
+Timing, memory measurement and JSON reports shared by the benchmark scripts
+"""
+
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.metrics import percentile
+
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def summarize(samples: List[float]) -> Dict:
+    """
+    Latency statistics of a list of durations in seconds
+
+    Returns:
+        Dictionary with count, mean, min, max, p50, p95 and p99 (seconds)
+    """
+    values = sorted(samples)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values),
+        "min": values[0],
+        "max": values[-1],
+        "p50": percentile(values, 0.5),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99)
+    }
+
+
+def peak_memory(fn: Callable[[], Any]) -> int:
+    """Peak Python heap allocation of one call, in bytes (tracemalloc)"""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        fn()
+        return max(0, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def measure(
+    fn: Callable[[], Any],
+    repeat: int = 20,
+    warmup: int = 2,
+    items: Optional[int] = None,
+    memory: bool = True
+) -> Dict:
+    """
+    Time repeated calls of fn and measure its peak memory
+
+    Timed calls run without tracemalloc, which would slow them down; the
+    memory peak comes from one extra traced call.
+
+    Args:
+        fn: Benchmarked call
+        repeat: Timed calls
+        warmup: Untimed calls first (caches, lazy imports)
+        items: Items processed per call, to report items_per_second
+        memory: Measure the peak heap allocation
+
+    Returns:
+        Summary (see summarize) plus items_per_second and peak_bytes
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    result = summarize(samples)
+    if items is not None and result.get("p50"):
+        result["items"] = items
+        result["items_per_second"] = round(items / result["p50"], 1)
+    if memory:
+        result["peak_bytes"] = peak_memory(fn)
+    return result
+
+
+def environment() -> Dict:
+    """Machine and code version a report was produced on"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=10,
+            cwd=Path(__file__).parent.parent
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def max_rss_bytes() -> int:
+    """Peak resident set size of this process so far"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process now (peak RSS where /proc is missing)"""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return max_rss_bytes()
+
+
+def directory_bytes(path: str) -> int:
+    """Total size of the files under a directory"""
+    return sum(p.stat().st_size for p in Path(path).rglob("*") if p.is_file())
+
+
+def write_report(report: Dict, output: Optional[str], name: str) -> Path:
+    """
+    Write a JSON report
+
+    Args:
+        report: Report dictionary
+        output: Target file (defaults to benchmarks/results/<name>-<timestamp>.json)
+        name: Report kind, used in the default file name
+
+    Returns:
+        Path written
+    """
+    path = Path(output) if output else RESULTS_DIR / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def format_ms(seconds: Optional[float]) -> str:
+    return f"{seconds * 1000:.2f}ms" if seconds is not None else "-"
+
+
+def latency_entries(report: Dict, prefix: str = "") -> Dict[str, Dict]:
+    """Flatten a report to {"path/to/benchmark": stats} for every entry with percentiles"""
+    entries = {}
+    for key, value in report.items():
+        if not isinstance(value, dict):
+            continue
+        path = f"{prefix}/{key}" if prefix else key
+        if "p95" in value:
+            entries[path] = value
+        # Stats may nest per-stage breakdowns
+        entries.update(latency_entries(value, path))
+    return entries
+
+
+def compare_reports(baseline: Dict, current: Dict, metric: str = "p95") -> List[Dict]:
+    """
+    Change of one percentile between two reports, per benchmark in both
+
+    Returns:
+        List of {"benchmark", "baseline", "current", "ratio"}, worst first
+    """
+    old = latency_entries(baseline)
+    new = latency_entries(current)
+    rows = []
+    for path in sorted(old.keys() & new.keys()):
+        before, after = old[path].get(metric), new[path].get(metric)
+        if not before or after is None:
+            continue
+        rows.append({"benchmark": path, "baseline": before, "current": after, "ratio": after / before})
+    return sorted(rows, key=lambda row: -row["ratio"])
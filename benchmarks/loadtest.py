@@ -0,0 +1,454 @@
+"""
+Load test for RAG Policy Assistant
+Replays a question log against the pipeline or the HTTP API under concurrent load
+
+Load is either open-loop (--rate requests per second, Poisson or constant
+arrivals, or the log's own timing with --replay) or closed-loop
+(--concurrency users asking back to back). The report has throughput,
+error rate and latency percentiles overall and per time window, per-stage
+percentiles from the pipeline's timings, and can fail the run when p95
+latency regresses past a saved baseline. Run from the project root:
+    python -m benchmarks.loadtest --target pipeline --llm mock-server --concurrency 16 --duration 30
+    python -m benchmarks.loadtest --target http --url http://127.0.0.1:8000 --rate 20 --duration 60
+    python -m benchmarks.loadtest --quick --baseline loadtest-baseline.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.harness import compare_reports, environment, format_ms, summarize, write_report
+from benchmarks.suite import EVAL_QUESTIONS, benchmark_llm, policy_store
+
+
+# Sends one question and returns its record (see _pipeline_sender)
+Sender = Callable[[str, int], Awaitable[Dict]]
+
+DEFAULT_WINDOW = 5.0
+
+# Baseline gate defaults: p95 may grow by 25%, and differences below
+# 5ms are ignored as noise
+DEFAULT_MAX_REGRESSION = 1.25
+DEFAULT_MIN_DELTA_MS = 5.0
+
+
+def load_question_log(path: Optional[str] = None) -> List[Dict]:
+    """
+    Questions to replay, in order
+
+    Accepts JSON Lines with one {"question", "k"?, "offset"?} object per
+    line (offset: seconds since the start of the log), the evaluation
+    questions file, or plain text with one question per line. Defaults
+    to every evaluation question, in- and out-of-scope.
+
+    Returns:
+        List of {"question", "k", "offset"} dictionaries
+    """
+    path = Path(path) if path else EVAL_QUESTIONS
+    text = path.read_text(encoding="utf-8")
+
+    if path.suffix == ".json":
+        data = json.loads(text)
+        entries = [{"question": item["question"]} for item in data.get("in_scope", [])]
+        entries.extend({"question": question} for question in data.get("out_of_scope", []))
+    elif path.suffix == ".jsonl":
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        entries = [{"question": line.strip()} for line in text.splitlines() if line.strip()]
+
+    if not entries:
+        raise ValueError(f"No questions found in {path}")
+    return [
+        {"question": e["question"], "k": e.get("k", 4), "offset": e.get("offset")}
+        for e in entries
+    ]
+
+
+# =============================================================================
+# Targets
+# =============================================================================
+
+def _request_record(start: float, latency: float, result: Optional[Dict], error: Optional[str] = None, status: int = 200) -> Dict:
+    outcome = (result or {}).get("outcome", "error" if error else "answered")
+    return {
+        "start": start,
+        "latency": latency,
+        "status": status,
+        "ok": error is None and outcome != "error",
+        "outcome": "error" if error else outcome,
+        "error": error,
+        "coalesced": bool((result or {}).get("coalesced")),
+        "timings": (result or {}).get("timings", {})
+    }
+
+
+async def _pipeline_sender(args: argparse.Namespace) -> Tuple[Sender, Callable[[], None]]:
+    """Calls rag_answer_async in process, on a built or in-memory index"""
+    from src.rag_pipeline import rag_answer_async
+
+    if args.index:
+        from src.vector_store import load_indexed_vector_store, load_keyword_index
+        vectorstore, manifest = load_indexed_vector_store(args.index)
+        keyword_index = load_keyword_index(args.index, manifest)
+    else:
+        from src.document_processor import process_policies
+        from benchmarks.suite import POLICIES_DIR
+        vectorstore, keyword_index = policy_store(process_policies(str(POLICIES_DIR)))
+
+    if args.llm == "openai":
+        from src.clients import get_chat_model
+        llm, stop = get_chat_model(), lambda: None
+    else:
+        llm, stop = benchmark_llm(args.llm, args.mock_ttft)
+
+    async def send(question: str, k: int) -> Dict:
+        start = time.perf_counter()
+        try:
+            result = await rag_answer_async(
+                vectorstore, question, k=k, llm=llm, keyword_index=keyword_index
+            )
+        except Exception as e:
+            return _request_record(start, time.perf_counter() - start, None, type(e).__name__, 0)
+        return _request_record(start, time.perf_counter() - start, result)
+
+    return send, stop
+
+
+async def _http_sender(args: argparse.Namespace) -> Tuple[Sender, Callable[[], Awaitable[None]]]:
+    """POSTs to /ask on a running API"""
+    import httpx
+
+    client = httpx.AsyncClient(
+        base_url=args.url,
+        timeout=args.timeout,
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    )
+
+    async def send(question: str, k: int) -> Dict:
+        start = time.perf_counter()
+        try:
+            response = await client.post("/ask", json={"question": question, "k": k})
+        except httpx.HTTPError as e:
+            return _request_record(start, time.perf_counter() - start, None, type(e).__name__, 0)
+        latency = time.perf_counter() - start
+        if response.status_code != 200:
+            return _request_record(start, latency, None, f"HTTP {response.status_code}", response.status_code)
+        return _request_record(start, latency, response.json())
+
+    return send, client.aclose
+
+
+# =============================================================================
+# Load generation
+# =============================================================================
+
+def arrival_times(
+    questions: List[Dict],
+    rate: Optional[float],
+    arrivals: str,
+    count: int,
+    seed: int,
+    speedup: float = 1.0
+) -> List[float]:
+    """
+    Send times in seconds from the start for open-loop load
+
+    Args:
+        questions: Question log (offsets used by the "replay" arrivals)
+        rate: Mean requests per second ("poisson" and "constant")
+        arrivals: "poisson", "constant" or "replay"
+        count: Number of requests
+        seed: Random seed for Poisson gaps
+        speedup: Replay the log this many times faster
+    """
+    if arrivals == "replay":
+        offsets = [q["offset"] for q in questions]
+        if any(offset is None for offset in offsets):
+            raise ValueError("--replay needs an offset on every logged question")
+        span = max(offsets) + 1.0 / (rate or 1.0)
+        # Repeat the log end to end until count requests are scheduled
+        return [(span * (i // len(offsets)) + offsets[i % len(offsets)]) / speedup for i in range(count)]
+
+    if not rate:
+        raise ValueError("Open-loop load needs a rate")
+    if arrivals == "constant":
+        return [i / rate for i in range(count)]
+
+    rng = random.Random(seed)
+    times, now = [], 0.0
+    for _ in range(count):
+        times.append(now)
+        now += rng.expovariate(rate)
+    return times
+
+
+async def run_open_loop(send: Sender, questions: List[Dict], schedule: List[float], duration: Optional[float]) -> Tuple[List[Dict], float]:
+    """
+    Send each question at its scheduled time, however many are in flight
+
+    Returns:
+        Tuple of (records, max scheduling lag in seconds)
+    """
+    base = time.perf_counter()
+    tasks = []
+    max_lag = 0.0
+    for entry, at in zip(itertools.cycle(questions), schedule):
+        if duration is not None and at >= duration:
+            break
+        delay = base + at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        max_lag = max(max_lag, time.perf_counter() - base - at)
+        tasks.append(asyncio.create_task(send(entry["question"], entry["k"])))
+    return list(await asyncio.gather(*tasks)), max_lag
+
+
+async def run_closed_loop(send: Sender, questions: List[Dict], concurrency: int, duration: Optional[float], count: Optional[int]) -> List[Dict]:
+    """Keep `concurrency` users asking back to back until duration or count runs out"""
+    entries = itertools.cycle(questions)
+    issued = itertools.count()
+    deadline = time.perf_counter() + duration if duration is not None else None
+    records = []
+
+    async def user() -> None:
+        while True:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            if count is not None and next(issued) >= count:
+                return
+            entry = next(entries)
+            records.append(await send(entry["question"], entry["k"]))
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return records
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def _error_rate(records: List[Dict]) -> float:
+    return round(sum(1 for r in records if not r["ok"]) / len(records), 4) if records else 0.0
+
+
+def _stage_summaries(records: List[Dict]) -> Dict:
+    stages: Dict[str, List[float]] = {}
+    for record in records:
+        for stage, seconds in record["timings"].items():
+            stages.setdefault(stage, []).append(seconds)
+    return {stage: summarize(samples) for stage, samples in sorted(stages.items())}
+
+
+def summarize_run(records: List[Dict], base: float, window: float) -> Dict:
+    """
+    Overall and per-window statistics of a run
+
+    Requests are assigned to the window they completed in; a window's
+    throughput is over the part of it the run covered.
+
+    Returns:
+        Dictionary with "overall" and "windows" (list, one per window)
+    """
+    if not records:
+        return {"overall": {"requests": 0}, "windows": []}
+
+    finished = [r["start"] + r["latency"] - base for r in records]
+    elapsed = max(finished)
+    outcomes: Dict[str, int] = {}
+    for record in records:
+        outcomes[record["outcome"]] = outcomes.get(record["outcome"], 0) + 1
+
+    overall = {
+        "requests": len(records),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput": round(len(records) / elapsed, 2) if elapsed else None,
+        "error_rate": _error_rate(records),
+        "outcomes": outcomes,
+        "coalesced": sum(1 for r in records if r["coalesced"]),
+        "latency": summarize([r["latency"] for r in records]),
+        "stages": _stage_summaries(records)
+    }
+
+    # Requests finishing exactly at the end of the run close the last window
+    count = max(1, math.ceil(elapsed / window))
+    window_of = [min(int(t // window), count - 1) for t in finished]
+
+    windows = []
+    for index in range(count):
+        in_window = [r for r, w in zip(records, window_of) if w == index]
+        if not in_window:
+            continue
+        # The last window ends with the run, usually before a full window
+        seconds = min(window, elapsed - index * window)
+        windows.append({
+            "start": index * window,
+            "requests": len(in_window),
+            "throughput": round(len(in_window) / seconds, 2) if seconds else None,
+            "error_rate": _error_rate(in_window),
+            "latency": summarize([r["latency"] for r in in_window]),
+            "stages": {stage: {"p50": s["p50"], "p95": s["p95"]} for stage, s in _stage_summaries(in_window).items()}
+        })
+    return {"overall": overall, "windows": windows}
+
+
+def print_windows(summary: Dict) -> None:
+    print(f"\n{'window':>8} {'req':>6} {'req/s':>8} {'errors':>7} {'p50':>10} {'p95':>10} {'p99':>10}")
+    for w in summary["windows"]:
+        latency = w["latency"]
+        print(
+            f"{w['start']:>7.0f}s {w['requests']:>6} {w['throughput']:>8.1f} {w['error_rate']:>7.1%} "
+            f"{format_ms(latency['p50']):>10} {format_ms(latency['p95']):>10} {format_ms(latency['p99']):>10}"
+        )
+
+    overall = summary["overall"]
+    print(
+        f"\nTotal: {overall['requests']} requests in {overall['elapsed_seconds']}s "
+        f"({overall['throughput']} req/s), {overall['error_rate']:.1%} errors, "
+        f"p50 {format_ms(overall['latency']['p50'])}, p95 {format_ms(overall['latency']['p95'])}, "
+        f"p99 {format_ms(overall['latency']['p99'])}"
+    )
+    print("Outcomes: " + ", ".join(f"{k}={v}" for k, v in sorted(overall["outcomes"].items())))
+    for stage, stats in overall["stages"].items():
+        print(f"  {stage:<10} p50 {format_ms(stats['p50']):>10}  p95 {format_ms(stats['p95']):>10}")
+
+
+def regressions(
+    baseline: Dict,
+    report: Dict,
+    max_ratio: float = DEFAULT_MAX_REGRESSION,
+    min_delta: float = DEFAULT_MIN_DELTA_MS / 1000
+) -> List[Dict]:
+    """
+    Overall and per-stage p95 latencies that grew past the allowed ratio
+
+    Per-window percentiles are not compared; windows differ between runs.
+    """
+    return [
+        row for row in compare_reports(baseline["overall"], report["overall"])
+        if row["ratio"] > max_ratio and row["current"] - row["baseline"] > min_delta
+    ]
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+async def run(args: argparse.Namespace) -> Dict:
+    questions = load_question_log(args.log)
+    if args.shuffle:
+        random.Random(args.seed).shuffle(questions)
+
+    if args.target == "http":
+        send, close = await _http_sender(args)
+    else:
+        send, stop = await _pipeline_sender(args)
+
+        async def close() -> None:
+            stop()
+
+    try:
+        # Warm caches, lazy imports and connections outside the measurement
+        for entry in questions[:args.warmup]:
+            await send(entry["question"], entry["k"])
+
+        base = time.perf_counter()
+        lag = None
+        if args.concurrency:
+            records = await run_closed_loop(send, questions, args.concurrency, args.duration, args.requests)
+        else:
+            count = args.requests or int((args.duration or 0) * (args.rate or 0) * 2) + len(questions)
+            schedule = arrival_times(questions, args.rate, args.arrivals, count, args.seed, args.speedup)
+            records, lag = await run_open_loop(send, questions, schedule, args.duration)
+    finally:
+        await close()
+
+    summary = summarize_run(records, base, args.window)
+    if lag is not None:
+        summary["overall"]["max_schedule_lag_seconds"] = round(lag, 4)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Load test the RAG pipeline or HTTP API")
+    parser.add_argument("--target", choices=["pipeline", "http"], default="pipeline")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL (--target http)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="HTTP request timeout in seconds")
+    parser.add_argument("--index", help="Persisted index directory (--target pipeline; default: in-memory local index)")
+    parser.add_argument("--llm", choices=["stub", "mock-server", "openai"], default="stub")
+    parser.add_argument("--mock-ttft", default="lognormal:300:0.4", help="Mock server latency (see benchmarks.mock_openai)")
+    parser.add_argument("--log", help="Question log (.jsonl, eval questions .json or one question per line)")
+    parser.add_argument("--shuffle", action="store_true")
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, help="Closed loop: simultaneous users")
+    load.add_argument("--rate", type=float, help="Open loop: requests per second")
+    parser.add_argument("--arrivals", choices=["poisson", "constant", "replay"], default="poisson")
+    parser.add_argument("--speedup", type=float, default=1.0, help="Replay the log's timing this much faster")
+    parser.add_argument("--duration", type=float, help="Seconds of load")
+    parser.add_argument("--requests", type=int, help="Number of requests")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed requests first")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW, help="Reporting window in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="8 users for 10 seconds (CI)")
+    parser.add_argument("--output", help="Report path (default: benchmarks/results/)")
+    parser.add_argument("--baseline", help="Saved report to gate p95 latency against")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="Largest allowed p95 ratio against the baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="Ignore p95 increases smaller than this")
+    parser.add_argument("--max-error-rate", type=float, help="Fail when the error rate exceeds this")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.concurrency = args.concurrency or (None if args.rate else 8)
+        args.duration = args.duration or 10.0
+    if not args.concurrency and not args.rate and args.arrivals != "replay":
+        parser.error("give --concurrency, --rate or --arrivals replay")
+    if args.duration is None and args.requests is None:
+        parser.error("give --duration or --requests")
+
+    summary = asyncio.run(run(args))
+    report = {
+        "environment": environment(),
+        "settings": {
+            key: value for key, value in vars(args).items()
+            if key not in ("output", "baseline")
+        },
+        **summary
+    }
+
+    print_windows(summary)
+    path = write_report(report, args.output, "loadtest")
+    print(f"\nReport written to {path}")
+
+    failures = []
+    if args.max_error_rate is not None and summary["overall"].get("error_rate", 0) > args.max_error_rate:
+        failures.append(f"error rate {summary['overall']['error_rate']:.1%} > {args.max_error_rate:.1%}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        for row in regressions(baseline, report, args.max_regression, args.min_delta_ms / 1000):
+            failures.append(
+                f"{row['benchmark']} p95 {format_ms(row['baseline'])} -> "
+                f"{format_ms(row['current'])} ({row['ratio']:.2f}x)"
+            )
+        if not failures:
+            print(f"p95 latencies within {args.max_regression:.2f}x of {args.baseline}")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+"""
+Local OpenAI stand-in for RAG Policy Assistant
+OpenAI-compatible chat and embeddings server with controllable latency and failures
+
+Endpoints:
+    POST /v1/chat/completions   streaming (SSE) and non-streaming answers
+    POST /v1/embeddings         deterministic hashed-TF vectors (float or base64)
+    GET  /v1/models             model list
+    GET  /mock/stats            requests served and errors injected
+
+Answers quote the first source in the prompt, so citations still work,
+and vectors come from src.local_embeddings, so retrieval still finds the
+right chunks. Point the pipeline at it, with an index of its own:
+    python -m benchmarks.mock_openai --port 8100 --ttft lognormal:300:0.4
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=mock VECTOR_STORE_PATH=chroma_db_mock streamlit run app/app.py
+
+Latency distributions are given as "fixed:MS", "uniform:LOW_MS:HIGH_MS",
+"normal:MEAN_MS:STD_MS" or "lognormal:MEDIAN_MS:SIGMA".
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from src.local_embeddings import HashedEmbeddings
+
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+# text-embedding-3-small's dimension, used when a request names none
+DEFAULT_EMBEDDING_DIM = 1536
+
+_SOURCE_PATTERN = re.compile(r"\[Source \d+: ([^\]]+)\]\n(.*?)(?=\n\n\[Source \d+:|\n\nQUESTION:|\Z)", re.S)
+
+
+def sample_ms(spec: str, rng: random.Random) -> float:
+    """
+    Draw one latency in milliseconds from a distribution spec
+
+    Args:
+        spec: "fixed:MS", "uniform:LOW:HIGH", "normal:MEAN:STD" or
+            "lognormal:MEDIAN:SIGMA"
+        rng: Random source (seeded for reproducible runs)
+
+    Returns:
+        Non-negative latency in milliseconds
+    """
+    kind, *args = spec.split(":")
+    values = [float(a) for a in args]
+    if kind == "fixed":
+        value = values[0]
+    elif kind == "uniform":
+        value = rng.uniform(values[0], values[1])
+    elif kind == "normal":
+        value = rng.gauss(values[0], values[1])
+    elif kind == "lognormal":
+        value = values[0] * math.exp(rng.gauss(0.0, values[1]))
+    else:
+        raise ValueError(f"Unknown latency distribution '{spec}'")
+    return max(0.0, value)
+
+
+class MockSettings:
+    """Behaviour of the stand-in server"""
+
+    def __init__(
+        self,
+        ttft: str = "fixed:0",
+        tokens_per_second: float = 0.0,
+        completion_tokens: int = 60,
+        embedding_latency: str = "fixed:0",
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        stream_error_rate: float = 0.0,
+        seed: Optional[int] = 0
+    ):
+        """
+        Args:
+            ttft: Latency before the first answer token
+            tokens_per_second: Streaming speed after the first token (0 = instant)
+            completion_tokens: Answer length in tokens (words)
+            embedding_latency: Latency of each embeddings request
+            error_rate: Share of requests answered with error_status
+            error_status: HTTP status of injected errors (429, 500, 503, ...)
+            stream_error_rate: Share of streams cut off halfway
+            seed: Seed for latency and error sampling (None: random)
+        """
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.embedding_latency = embedding_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stream_error_rate = stream_error_rate
+        self.seed = seed
+
+        # Fail on a bad spec at startup rather than on the first request
+        sample_ms(ttft, random.Random(0))
+        sample_ms(embedding_latency, random.Random(0))
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, -(-len(text) // 4))
+
+
+def mock_answer(prompt: str, completion_tokens: int) -> List[str]:
+    """
+    Deterministic answer to a RAG prompt, split into streaming tokens
+
+    Quotes the first context source and names it, like a grounded answer
+    would; prompts without sources get a fixed filler answer.
+    """
+    match = _SOURCE_PATTERN.search(prompt)
+    if match:
+        label, text = match.group(1), match.group(2)
+        words = f"According to {label}: {' '.join(text.split())}".split()
+    else:
+        words = "This is a mock answer from the local OpenAI stand-in server.".split()
+
+    words = words[:completion_tokens]
+    return [words[0]] + [" " + word for word in words[1:]] if words else []
+
+
+class MockOpenAI:
+    """ASGI application serving the OpenAI endpoints the pipeline uses"""
+
+    def __init__(self, settings: Optional[MockSettings] = None):
+        self.settings = settings or MockSettings()
+        self._rng = random.Random(self.settings.seed)
+        self._rng_lock = threading.Lock()
+        self._embedders: Dict[int, HashedEmbeddings] = {}
+        self.stats = {
+            "chat_requests": 0,
+            "stream_requests": 0,
+            "embedding_requests": 0,
+            "embedded_inputs": 0,
+            "tokens_streamed": 0,
+            "errors_injected": 0,
+            "streams_cut": 0
+        }
+
+    # -------------------------------------------------------------------------
+    # Sampling
+    # -------------------------------------------------------------------------
+
+    def _sample(self, spec: str) -> float:
+        with self._rng_lock:
+            return sample_ms(spec, self._rng) / 1000.0
+
+    def _chance(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._rng_lock:
+            return self._rng.random() < rate
+
+    # -------------------------------------------------------------------------
+    # ASGI helpers
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    async def _send_json(send, status: int, payload: Dict, headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii"))
+            ] + (headers or [])
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _read_json(receive) -> Dict:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if len(body) > MAX_BODY_BYTES:
+                raise ValueError("Request body too large")
+            if not message.get("more_body"):
+                return json.loads(body or b"{}")
+
+    async def _inject_error(self, send) -> bool:
+        """Answer with the configured error status at the configured rate"""
+        if not self._chance(self.settings.error_rate):
+            return False
+        self.stats["errors_injected"] += 1
+        status = self.settings.error_status
+        headers = [(b"retry-after", b"1")] if status == 429 else []
+        await self._send_json(send, status, {
+            "error": {"message": "Injected error", "type": "mock_error", "code": str(status)}
+        }, headers)
+        return True
+
+    # -------------------------------------------------------------------------
+    # Endpoints
+    # -------------------------------------------------------------------------
+
+    async def chat_completions(self, request: Dict, send) -> None:
+        self.stats["chat_requests"] += 1
+        if await self._inject_error(send):
+            return
+
+        messages = request.get("messages") or []
+        prompt = "\n".join(
+            m["content"] if isinstance(m.get("content"), str) else json.dumps(m.get("content"))
+            for m in messages
+        )
+        model = request.get("model", "gpt-3.5-turbo")
+        tokens = mock_answer(prompt, self.settings.completion_tokens)
+        usage = {
+            "prompt_tokens": _estimate_tokens(prompt),
+            "completion_tokens": len(tokens),
+            "total_tokens": _estimate_tokens(prompt) + len(tokens)
+        }
+        completion_id = f"chatcmpl-mock{self.stats['chat_requests']}"
+        created = int(time.time())
+        interval = 1.0 / self.settings.tokens_per_second if self.settings.tokens_per_second > 0 else 0.0
+
+        await asyncio.sleep(self._sample(self.settings.ttft))
+
+        if not request.get("stream"):
+            await asyncio.sleep(interval * max(0, len(tokens) - 1))
+            await self._send_json(send, 200, {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            })
+            return
+
+        self.stats["stream_requests"] += 1
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache")]
+        })
+
+        async def event(payload) -> None:
+            data = payload if isinstance(payload, str) else json.dumps(payload)
+            await send({"type": "http.response.body", "body": f"data: {data}\n\n".encode("utf-8"), "more_body": True})
+
+        def chunk(delta: Dict, finish_reason: Optional[str] = None) -> Dict:
+            return {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+
+        cut_at = len(tokens) // 2 if self._chance(self.settings.stream_error_rate) else None
+
+        await event(chunk({"role": "assistant", "content": ""}))
+        for i, token in enumerate(tokens):
+            if i == cut_at:
+                self.stats["streams_cut"] += 1
+                # Dropping the connection mid-body is what clients see on a provider failure
+                raise ConnectionAbortedError("Injected stream failure")
+            if i and interval:
+                await asyncio.sleep(interval)
+            await event(chunk({"content": token}))
+            self.stats["tokens_streamed"] += 1
+
+        await event(chunk({}, "stop"))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            await event({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [],
+                "usage": usage
+            })
+        await event("[DONE]")
+        await send({"type": "http.response.body", "body": b""})
+
+    async def embeddings(self, request: Dict, send) -> None:
+        self.stats["embedding_requests"] += 1
+        if await self._inject_error(send):
+            return
+
+        inputs = request.get("input")
+        if isinstance(inputs, str) or (isinstance(inputs, list) and inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        # Pre-tokenized inputs (lists of token IDs) are embedded by their IDs
+        texts = [text if isinstance(text, str) else " ".join(f"t{t}" for t in text) for text in inputs or []]
+        self.stats["embedded_inputs"] += len(texts)
+
+        dim = int(request.get("dimensions") or DEFAULT_EMBEDDING_DIM)
+        embedder = self._embedders.get(dim)
+        if embedder is None:
+            embedder = self._embedders[dim] = HashedEmbeddings(dim)
+
+        await asyncio.sleep(self._sample(self.settings.embedding_latency))
+        matrix = embedder.embed_matrix(texts) if texts else np.zeros((0, dim), dtype=np.float32)
+
+        base64_format = request.get("encoding_format") == "base64"
+        data = [
+            {
+                "object": "embedding",
+                "index": i,
+                "embedding": (
+                    base64.b64encode(row.astype("<f4").tobytes()).decode("ascii")
+                    if base64_format else row.tolist()
+                )
+            }
+            for i, row in enumerate(matrix)
+        ]
+        tokens = sum(_estimate_tokens(text) for text in texts)
+        await self._send_json(send, 200, {
+            "object": "list",
+            "data": data,
+            "model": request.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+        })
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        path = scope["path"].rstrip("/")
+        method = scope["method"]
+
+        if method == "GET" and path == "/v1/models":
+            await self._send_json(send, 200, {"object": "list", "data": [
+                {"id": "gpt-3.5-turbo", "object": "model", "owned_by": "mock"},
+                {"id": "text-embedding-3-small", "object": "model", "owned_by": "mock"}
+            ]})
+            return
+        if method == "GET" and path == "/mock/stats":
+            await self._send_json(send, 200, self.stats)
+            return
+
+        handler = {
+            "/v1/chat/completions": self.chat_completions,
+            "/v1/embeddings": self.embeddings
+        }.get(path)
+        if method != "POST" or handler is None:
+            await self._send_json(send, 404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+            return
+
+        try:
+            request = await self._read_json(receive)
+        except ValueError as e:
+            await self._send_json(send, 400, {"error": {"message": str(e), "type": "invalid_request_error"}})
+            return
+        await handler(request, send)
+
+
+def start_server(
+    settings: Optional[MockSettings] = None,
+    host: str = "127.0.0.1",
+    port: int = 8100
+):
+    """
+    Run the stand-in server on a background thread (for benchmarks)
+
+    Returns:
+        Tuple of (uvicorn Server, thread); set server.should_exit = True
+        and join the thread to stop it
+    """
+    import uvicorn
+
+    app = MockOpenAI(settings)
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on"))
+    thread = threading.Thread(target=server.run, name="mock-openai", daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"Mock OpenAI server failed to start on {host}:{port}")
+        time.sleep(0.01)
+    return server, thread
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the local OpenAI stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--ttft", default="fixed:0", help="Latency before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Streaming speed (0 = instant)")
+    parser.add_argument("--completion-tokens", type=int, default=60)
+    parser.add_argument("--embedding-latency", default="fixed:0")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=429)
+    parser.add_argument("--stream-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        ttft=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        embedding_latency=args.embedding_latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        stream_error_rate=args.stream_error_rate,
+        seed=args.seed
+    )
+    print(f"Mock OpenAI API on http://{args.host}:{args.port}/v1")
+    uvicorn.run(MockOpenAI(settings), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Scaling benchmark for RAG Policy Assistant
+Index build time, query latency, recall and memory against corpus size
+
+For each corpus size a synthetic corpus is generated (see
+benchmarks/synthetic_corpus.py) and indexed with the production build
+path, then queried with its planted questions and partly revised to time
+an incremental reload. Embeddings are local, so no API key is needed.
+Run from the project root:
+    python -m benchmarks.scaling --sizes 100,1000,10000
+    python -m benchmarks.scaling --sizes 100,1000 --backends numpy --compare baseline.json
+"""
+
+import argparse
+import itertools
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.harness import (
+    current_rss_bytes,
+    directory_bytes,
+    environment,
+    format_ms,
+    max_rss_bytes,
+    measure,
+    write_report
+)
+from benchmarks.suite import EMBEDDING_DIM, print_comparison
+from benchmarks.synthetic_corpus import generate_corpus, load_planted_qa, revise_documents
+from src.document_processor import process_policies
+from src.local_embeddings import HashedEmbeddings
+from src.vector_store import (
+    BACKENDS,
+    build_indexed_vector_store,
+    load_indexed_vector_store,
+    load_keyword_index,
+    similarity_search_with_scores,
+    sync_vector_store
+)
+
+
+DEFAULT_SIZES = (100, 1000, 10000)
+QUICK_SIZES = (50, 200)
+
+# Share of documents revised before timing an incremental reload
+REVISED_FRACTION = 0.01
+
+
+def _is_hit(hits, qa: Dict) -> bool:
+    """True if a retrieved chunk is from the planted document and holds the answer"""
+    return any(
+        doc.metadata.get("source") == qa["source"] and qa["answer"] in doc.page_content
+        for doc in hits
+    )
+
+
+def bench_size(corpus_dir: str, workdir: Path, backend: str, queries: int, k: int, seed: int) -> Dict:
+    """Build, query and incrementally reload one backend over one corpus"""
+    embeddings = HashedEmbeddings(EMBEDDING_DIM)
+    persist_dir = str(workdir / f"index-{backend}")
+    result = {}
+
+    start = time.perf_counter()
+    chunks = process_policies(corpus_dir)
+    result["chunk_seconds"] = round(time.perf_counter() - start, 3)
+    result["chunks"] = len(chunks)
+    del chunks
+
+    rss_before = current_rss_bytes()
+    start = time.perf_counter()
+    build_indexed_vector_store(
+        corpus_dir, persist_dir, embeddings=embeddings, backend=backend, calibrate_scope=False
+    )
+    result["build_seconds"] = round(time.perf_counter() - start, 3)
+    result["build_rss_growth_bytes"] = max(0, current_rss_bytes() - rss_before)
+    result["index_bytes"] = directory_bytes(persist_dir)
+
+    start = time.perf_counter()
+    vectorstore, manifest = load_indexed_vector_store(persist_dir, embeddings)
+    keyword_index = load_keyword_index(persist_dir, manifest)
+    result["load_seconds"] = round(time.perf_counter() - start, 3)
+
+    planted = load_planted_qa(corpus_dir)
+    sample = random.Random(seed).sample(planted, min(queries, len(planted)))
+    vectors = embeddings.embed_documents([qa["question"] for qa in sample])
+
+    query_cycle = itertools.cycle(vectors)
+    result["query"] = measure(
+        lambda: similarity_search_with_scores(vectorstore, next(query_cycle), k),
+        repeat=len(sample), warmup=3, memory=False
+    )
+    result["recall_at_k"] = round(
+        sum(_is_hit([doc for doc, _ in similarity_search_with_scores(vectorstore, vector, k)], qa)
+            for qa, vector in zip(sample, vectors)) / len(sample), 3
+    )
+    if keyword_index is not None:
+        result["keyword_recall_at_k"] = round(
+            sum(_is_hit([doc for doc, _ in keyword_index.search(qa["question"], k)], qa)
+                for qa in sample) / len(sample), 3
+        )
+
+    documents = len(list(Path(corpus_dir).glob("*.md")))
+    revised = revise_documents(corpus_dir, max(1, round(documents * REVISED_FRACTION)), seed)
+    start = time.perf_counter()
+    sync = sync_vector_store(vectorstore, corpus_dir, persist_dir)
+    result["sync_seconds"] = round(time.perf_counter() - start, 3)
+    result["sync_files"] = len(revised)
+    result["sync_chunks_upserted"] = sync["chunks_upserted"]
+
+    del vectorstore, keyword_index
+    return result
+
+
+def print_curves(report: Dict) -> None:
+    print(
+        f"\n{'backend':<8} {'docs':>7} {'chunks':>8} {'build':>9} {'sync':>8} "
+        f"{'p50':>10} {'p95':>10} {'recall':>7} {'bm25':>6} {'rss+':>8} {'disk':>8}"
+    )
+    for backend, sizes in report["benchmarks"].items():
+        for documents, row in sizes.items():
+            print(
+                f"{backend:<8} {documents:>7} {row['chunks']:>8} {row['build_seconds']:>8.2f}s "
+                f"{row['sync_seconds']:>7.2f}s {format_ms(row['query']['p50']):>10} "
+                f"{format_ms(row['query']['p95']):>10} {row['recall_at_k']:>7.2f} "
+                f"{row.get('keyword_recall_at_k', 0):>6.2f} "
+                f"{row['build_rss_growth_bytes'] / 2**20:>6.0f}MB {row['index_bytes'] / 2**20:>6.0f}MB"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Measure how indexing and search scale with corpus size")
+    parser.add_argument("--quick", action="store_true", help="Small corpora (CI)")
+    parser.add_argument("--sizes", help="Comma-separated corpus sizes in documents")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--queries", type=int, default=200, help="Planted questions asked per size")
+    parser.add_argument("-k", type=int, default=4, help="Chunks retrieved per question")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", help="Keep generated corpora and indexes in this directory")
+    parser.add_argument("--output", help="Report path (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="Earlier report to compare p95 latencies with")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else list(QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    backends = args.backends.split(",")
+
+    report = {
+        "environment": environment(),
+        "settings": {
+            "sizes": sizes,
+            "backends": backends,
+            "queries": args.queries,
+            "k": args.k,
+            "seed": args.seed,
+            "embedding_dim": EMBEDDING_DIM
+        },
+        "corpora": {},
+        "benchmarks": {backend: {} for backend in backends}
+    }
+
+    root = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="rag-scaling-"))
+    try:
+        for size in sizes:
+            workdir = root / str(size)
+            if workdir.exists():
+                shutil.rmtree(workdir)
+            start = time.perf_counter()
+            corpus = generate_corpus(str(workdir / "policies"), size, seed=args.seed)
+            corpus["generate_seconds"] = round(time.perf_counter() - start, 3)
+            report["corpora"][str(size)] = corpus
+            print(f"Generated {size} documents ({corpus['characters']:,} characters)")
+
+            for backend in backends:
+                print(f"Benchmarking {backend} at {size} documents...")
+                # Each backend starts from the unrevised corpus
+                corpus_dir = workdir / f"policies-{backend}"
+                shutil.copytree(workdir / "policies", corpus_dir)
+                report["benchmarks"][backend][str(size)] = bench_size(
+                    str(corpus_dir), workdir, backend, args.queries, args.k, args.seed
+                )
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    report["max_rss_bytes"] = max_rss_bytes()
+    print_curves(report)
+    path = write_report(report, args.output, "scaling")
+    print(f"\nReport written to {path}")
+
+    if args.compare:
+        print_comparison(args.compare, report)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Benchmark suite for RAG Policy Assistant
+Repeatable ingestion, retrieval and end-to-end answering benchmarks with JSON output
+
+Runs fully offline: embeddings come from the local hashed-TF provider and
+the LLM is an in-process stub, or the local OpenAI stand-in server with
+--llm mock-server. Run from the project root:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --quick --output bench.json --compare baseline.json
+"""
+
+import argparse
+import itertools
+import json
+import shutil
+import socket
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from benchmarks.harness import (
+    compare_reports,
+    environment,
+    format_ms,
+    max_rss_bytes,
+    measure,
+    summarize,
+    write_report
+)
+from src.bm25 import BM25Index
+from src.document_processor import CHUNK_STRATEGIES, chunk_documents, load_policy_documents
+from src.local_embeddings import HashedEmbeddings
+from src.numpy_store import NumpyVectorStore
+from src.quantized_index import QuantizedVectorStore, write_quantized_index
+from src.rag_pipeline import rag_answer
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+POLICIES_DIR = PROJECT_ROOT / "data" / "policies"
+EVAL_QUESTIONS = PROJECT_ROOT / "evaluation" / "eval_questions.json"
+
+# Same width as text-embedding-3-small, so search costs match production
+EMBEDDING_DIM = 1536
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+QUICK_SIZES = (500, 2000)
+
+# Chroma rejects larger add() batches
+CHROMA_BATCH = 5000
+
+STUB_ANSWER = (
+    "According to the Paid Time Off (PTO) & Leave Policy (pto-leave.md), employees "
+    "accrue vacation days based on tenure and must submit requests in advance."
+)
+
+
+def load_questions() -> List[str]:
+    """In-scope evaluation questions used as benchmark queries"""
+    with open(EVAL_QUESTIONS, 'r', encoding='utf-8') as f:
+        return [item["question"] for item in json.load(f)["in_scope"]]
+
+
+def synthetic_chunks(chunks: List[Document], size: int) -> List[Document]:
+    """
+    A corpus of `size` chunks made by cycling the policy chunks
+
+    Each copy gets a distinct ID and a numbered suffix, so vectors and
+    BM25 statistics differ slightly between copies.
+    """
+    corpus = []
+    for i, chunk in zip(range(size), itertools.cycle(chunks)):
+        metadata = dict(chunk.metadata)
+        metadata["chunk_id"] = f"{metadata.get('chunk_id', 'chunk')}#{i}"
+        corpus.append(Document(page_content=f"{chunk.page_content}\n[copy {i}]", metadata=metadata))
+    return corpus
+
+
+# =============================================================================
+# Ingestion
+# =============================================================================
+
+def bench_ingestion(repeat: int) -> Dict:
+    results = {}
+
+    print("Benchmarking load_policy_documents...")
+    results["load_policy_documents"] = measure(
+        lambda: load_policy_documents(str(POLICIES_DIR)), repeat=repeat
+    )
+
+    documents = load_policy_documents(str(POLICIES_DIR))
+    for strategy in CHUNK_STRATEGIES:
+        print(f"Benchmarking chunk_documents ({strategy})...")
+        results[f"chunk_documents_{strategy}"] = measure(
+            lambda: chunk_documents(documents, 1000, 200, strategy),
+            repeat=repeat,
+            items=len(documents)
+        )
+        results[f"chunk_documents_{strategy}"]["chunks"] = len(chunk_documents(documents, 1000, 200, strategy))
+
+    return results
+
+
+def bench_embeddings(chunks: List[Document], repeat: int) -> Dict:
+    print("Benchmarking embedding throughput...")
+    embedder = HashedEmbeddings(EMBEDDING_DIM)
+    texts = [chunk.page_content for chunk in chunks]
+    questions = load_questions()
+    return {
+        "embed_documents": measure(lambda: embedder.embed_documents(texts), repeat=repeat, items=len(texts)),
+        "embed_query": measure(
+            lambda: embedder.embed_query(questions[0]), repeat=repeat * 10
+        )
+    }
+
+
+# =============================================================================
+# Retrieval
+# =============================================================================
+
+def _query_cycle(embedder: HashedEmbeddings):
+    questions = load_questions()
+    vectors = embedder.embed_matrix(questions)
+    return itertools.cycle(list(zip(questions, vectors.tolist())))
+
+
+def bench_search(chunks: List[Document], sizes: List[int], queries: int, backends: List[str]) -> Dict:
+    """Build each backend at each corpus size, then time k=4 queries"""
+    embedder = HashedEmbeddings(EMBEDDING_DIM)
+    results = {}
+
+    for size in sizes:
+        corpus = synthetic_chunks(chunks, size)
+        texts = [c.page_content for c in corpus]
+        metadatas = [c.metadata for c in corpus]
+        ids = [c.metadata["chunk_id"] for c in corpus]
+        vectors = embedder.embed_matrix(texts)
+        per_size = results[str(size)] = {}
+        workdir = Path(tempfile.mkdtemp(prefix="rag-bench-"))
+
+        try:
+            for backend in backends:
+                print(f"Benchmarking {backend} search over {size} chunks...")
+                build_start = time.perf_counter()
+
+                if backend == "numpy":
+                    store = NumpyVectorStore(embedder)
+                    store.add_vectors(vectors, texts, metadatas, ids)
+                    search = lambda q: store.similarity_search_by_vector(q[1], k=4)
+                elif backend == "quantized":
+                    batches = [(ids, texts, metadatas, vectors)]
+                    write_quantized_index(str(workdir / "bench.qindex"), batches, size, "int8")
+                    store = QuantizedVectorStore(str(workdir / "bench.qindex"), embedder)
+                    search = lambda q: store.similarity_search_by_vector(q[1], k=4)
+                elif backend == "chroma":
+                    from langchain_community.vectorstores import Chroma
+                    store = Chroma(
+                        collection_name="bench",
+                        embedding_function=embedder,
+                        persist_directory=str(workdir / "chroma")
+                    )
+                    for start in range(0, size, CHROMA_BATCH):
+                        end = start + CHROMA_BATCH
+                        store._collection.add(
+                            ids=ids[start:end],
+                            embeddings=vectors[start:end].tolist(),
+                            documents=texts[start:end],
+                            metadatas=metadatas[start:end]
+                        )
+                    search = lambda q: store.similarity_search_by_vector(q[1], k=4)
+                elif backend == "bm25":
+                    store = BM25Index.from_documents(corpus)
+                    search = lambda q: store.search(q[0], 4)
+                else:
+                    raise ValueError(f"Unknown backend '{backend}'")
+
+                build_seconds = time.perf_counter() - build_start
+                query_cycle = _query_cycle(embedder)
+                stats = measure(lambda: search(next(query_cycle)), repeat=queries, warmup=5)
+                stats["build_seconds"] = round(build_seconds, 3)
+                per_size[backend] = stats
+                del store
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return results
+
+
+# =============================================================================
+# End to end
+# =============================================================================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def policy_store(chunks: List[Document]) -> Tuple[NumpyVectorStore, BM25Index]:
+    """In-memory vector and keyword indexes over chunks, with local embeddings"""
+    embedder = HashedEmbeddings(EMBEDDING_DIM)
+    texts = [c.page_content for c in chunks]
+    store = NumpyVectorStore(embedder)
+    store.add_vectors(
+        embedder.embed_matrix(texts),
+        texts,
+        [c.metadata for c in chunks],
+        [c.metadata["chunk_id"] for c in chunks]
+    )
+    return store, BM25Index.from_documents(chunks)
+
+
+def benchmark_llm(mode: str, mock_ttft: str = "fixed:0") -> Tuple[BaseChatModel, Callable[[], None]]:
+    """
+    Chat model that makes no paid API calls
+
+    Args:
+        mode: "stub" (in-process canned answer) or "mock-server" (the local
+            OpenAI stand-in on a free port, over HTTP)
+        mock_ttft: Mock server latency spec
+
+    Returns:
+        Tuple of (chat model, function that stops the mock server)
+    """
+    if mode == "stub":
+        return FakeListChatModel(responses=[STUB_ANSWER]), lambda: None
+
+    from langchain_openai import ChatOpenAI
+    from benchmarks.mock_openai import MockSettings, start_server
+    port = _free_port()
+    server, thread = start_server(MockSettings(ttft=mock_ttft), port=port)
+
+    def stop() -> None:
+        server.should_exit = True
+        thread.join()
+
+    llm = ChatOpenAI(
+        model="gpt-3.5-turbo", base_url=f"http://127.0.0.1:{port}/v1", api_key="mock", max_retries=0
+    )
+    return llm, stop
+
+
+def bench_rag_answer(chunks: List[Document], queries: int, llm_mode: str, mock_ttft: str) -> Dict:
+    """rag_answer over the real policies, with a stubbed LLM"""
+    print(f"Benchmarking rag_answer ({llm_mode} LLM)...")
+    store, keyword_index = policy_store(chunks)
+    llm, stop_llm = benchmark_llm(llm_mode, mock_ttft)
+
+    try:
+        questions = itertools.cycle(load_questions())
+        stages: Dict[str, List[float]] = {}
+
+        def answer_one():
+            result = rag_answer(store, next(questions), k=4, llm=llm, keyword_index=keyword_index)
+            for stage, seconds in result["timings"].items():
+                stages.setdefault(stage, []).append(seconds)
+
+        stats = measure(answer_one, repeat=queries, warmup=3)
+        stats["stages"] = {stage: summarize(samples) for stage, samples in stages.items()}
+        return stats
+    finally:
+        stop_llm()
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def print_comparison(baseline_path: str, report: Dict) -> None:
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\np95 vs {baseline_path}:")
+    for row in compare_reports(baseline, report):
+        print(
+            f"  {row['benchmark']:<60} {format_ms(row['baseline']):>12} -> "
+            f"{format_ms(row['current']):>12}  ({row['ratio']:.2f}x)"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    parser = argparse.ArgumentParser(description="Run the RAG benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="Small corpus sizes and few repeats (CI)")
+    parser.add_argument("--sizes", help="Comma-separated corpus sizes in chunks")
+    parser.add_argument("--backends", default="numpy,quantized,chroma,bm25")
+    parser.add_argument("--repeat", type=int, help="Timed runs per micro-benchmark")
+    parser.add_argument("--queries", type=int, help="Timed queries per search/answer benchmark")
+    parser.add_argument("--llm", choices=["stub", "mock-server"], default="stub")
+    parser.add_argument("--mock-ttft", default="fixed:0", help="Mock server latency (see benchmarks.mock_openai)")
+    parser.add_argument("--skip", default="", help="Comma-separated groups to skip: ingestion,embeddings,search,rag")
+    parser.add_argument("--output", help="Report path (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="Earlier report to compare p95 latencies with")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else list(QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    repeat = args.repeat or (5 if args.quick else 20)
+    queries = args.queries or (50 if args.quick else 200)
+    skip = set(filter(None, args.skip.split(",")))
+
+    documents = load_policy_documents(str(POLICIES_DIR))
+    chunks = chunk_documents(documents, 1000, 200)
+
+    report = {
+        "environment": environment(),
+        "settings": {
+            "sizes": sizes,
+            "repeat": repeat,
+            "queries": queries,
+            "embedding_dim": EMBEDDING_DIM,
+            "llm": args.llm,
+            "mock_ttft": args.mock_ttft if args.llm == "mock-server" else None
+        },
+        "benchmarks": {}
+    }
+    benchmarks = report["benchmarks"]
+
+    if "ingestion" not in skip:
+        benchmarks["ingestion"] = bench_ingestion(repeat)
+    if "embeddings" not in skip:
+        benchmarks["embeddings"] = bench_embeddings(chunks, repeat)
+    if "search" not in skip:
+        benchmarks["search"] = bench_search(chunks, sizes, queries, args.backends.split(","))
+    if "rag" not in skip:
+        benchmarks["rag_answer"] = bench_rag_answer(chunks, queries, args.llm, args.mock_ttft)
+
+    report["max_rss_bytes"] = max_rss_bytes()
+    path = write_report(report, args.output, "benchmark")
+    print(f"\nReport written to {path}")
+
+    if args.compare:
+        print_comparison(args.compare, report)
+    return report
+
+
+if __name__ == "__main__":
+    main()
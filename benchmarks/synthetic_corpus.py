@@ -0,0 +1,343 @@
+"""
+Synthetic policy corpus generator for RAG Policy Assistant
+Builds large Markdown policy corpora from data/policies for scaling tests
+
+Every generated document reuses the sections of one real policy, with its
+numbers perturbed, and is scoped to a team (city, department and cost
+center). Planted facts give each document answers that exist nowhere else
+in the corpus; their questions are written to planted_qa.json so retrieval
+quality can be checked at any scale. Run from the project root:
+    python -m benchmarks.synthetic_corpus --documents 10000 --output /tmp/policies-10k
+"""
+
+import argparse
+import json
+import random
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+POLICIES_DIR = PROJECT_ROOT / "data" / "policies"
+QA_FILE = "planted_qa.json"
+
+CITIES = [
+    "Amsterdam", "Austin", "Bangalore", "Berlin", "Boston", "Cairo", "Dublin", "Dubai",
+    "Lagos", "Lisbon", "London", "Madrid", "Melbourne", "Mexico City", "Nairobi",
+    "Paris", "Sao Paulo", "Seoul", "Singapore", "Stockholm", "Tokyo", "Toronto",
+    "Warsaw", "Zurich"
+]
+DEPARTMENTS = [
+    "Customer Success", "Data Platform", "Design", "Engineering", "Facilities",
+    "Finance", "Infrastructure", "Legal", "Marketing", "People Operations",
+    "Product", "Quality Assurance", "Research", "Sales", "Security", "Support"
+]
+MONTHS = [
+    "January", "February", "March", "April", "May", "June", "July", "August",
+    "September", "October", "November", "December"
+]
+
+# Facts planted in generated documents. {code} is the document's cost
+# center, which makes every question answerable from one document only.
+FACT_TEMPLATES = [
+    {
+        "heading": "Home-Office Stipend",
+        "sentence": "Employees in cost center {code} receive a home-office stipend of **{value} USD per month**.",
+        "question": "What is the monthly home-office stipend for employees in cost center {code}?",
+        "answer": "{value} USD per month",
+        "range": (40, 400)
+    },
+    {
+        "heading": "Training Budget",
+        "sentence": "Each employee in cost center {code} has an annual training budget of **{value} USD**.",
+        "question": "How large is the annual training budget in cost center {code}?",
+        "answer": "{value} USD",
+        "range": (500, 6000)
+    },
+    {
+        "heading": "Additional Leave",
+        "sentence": "Staff in cost center {code} are granted **{value} additional leave days** per calendar year.",
+        "question": "How many additional leave days per year do staff in cost center {code} get?",
+        "answer": "{value} additional leave days",
+        "range": (1, 12)
+    },
+    {
+        "heading": "On-Call Allowance",
+        "sentence": "On-call shifts in cost center {code} are compensated with **{value} USD per week**.",
+        "question": "What is the weekly on-call allowance in cost center {code}?",
+        "answer": "{value} USD per week",
+        "range": (75, 900)
+    },
+    {
+        "heading": "Approval Threshold",
+        "sentence": "In cost center {code}, expenses above **{value} USD** require director approval.",
+        "question": "Above what amount do expenses in cost center {code} need director approval?",
+        "answer": "{value} USD",
+        "range": (250, 10000)
+    },
+    {
+        "heading": "Hardware Refresh",
+        "sentence": "Laptops issued in cost center {code} are replaced every **{value} months**.",
+        "question": "How often are laptops replaced in cost center {code}?",
+        "answer": "{value} months",
+        "range": (18, 60)
+    },
+    {
+        "heading": "Remote Work Days",
+        "sentence": "Employees in cost center {code} may work remotely up to **{value} days per month**.",
+        "question": "How many remote work days per month are allowed in cost center {code}?",
+        "answer": "{value} days per month",
+        "range": (2, 20)
+    },
+    {
+        "heading": "Incident Reporting Window",
+        "sentence": "Security incidents in cost center {code} must be reported within **{value} hours**.",
+        "question": "Within how many hours must security incidents be reported in cost center {code}?",
+        "answer": "{value} hours",
+        "range": (1, 72)
+    }
+]
+
+_HEADING = re.compile(r"^##\s+(?:\d+\.\s*)?(?P<title>.+)$")
+_SUBHEADING = re.compile(r"^###\s+\d+\.(?P<sub>\d+)\s+")
+_NUMBER = re.compile(r"(?<![\w.])\d+(?:\.\d+)?(?![\w.])")
+_HEADER_FIELD = re.compile(r"^\*\*(Effective Date|Applies To):\*\*")
+
+
+def parse_policy(text: str) -> Dict:
+    """
+    Split a policy file into its title, header lines and numbered sections
+
+    Returns:
+        Dictionary with title, header (metadata lines under the title)
+        and sections, a list of {"title", "lines"} for each ## heading
+    """
+    title = ""
+    header: List[str] = []
+    sections: List[Dict] = []
+    for line in text.splitlines():
+        if line.startswith("# ") and not title:
+            title = line[2:].strip()
+            continue
+        match = _HEADING.match(line)
+        if match:
+            sections.append({"title": match.group("title").strip(), "lines": []})
+        elif sections:
+            sections[-1]["lines"].append(line)
+        elif line.strip():
+            header.append(line)
+
+    for section in sections:
+        while section["lines"] and not section["lines"][-1].strip():
+            section["lines"].pop()
+    return {"title": title, "header": header, "sections": sections}
+
+
+def load_templates(templates_dir: str = str(POLICIES_DIR)) -> List[Dict]:
+    """Parsed policies used as document templates, in file name order"""
+    templates = []
+    for md_file in sorted(Path(templates_dir).glob("*.md")):
+        template = parse_policy(md_file.read_text(encoding="utf-8"))
+        template["slug"] = md_file.stem
+        if template["sections"]:
+            templates.append(template)
+    if not templates:
+        raise ValueError(f"No policy templates found in {templates_dir}")
+    return templates
+
+
+def perturb_numbers(line: str, rng: random.Random, spread: float) -> str:
+    """
+    Scale every number in a line by a random factor within ±spread
+
+    Years are left alone, and integers stay integers, so "10 paid sick
+    days" becomes e.g. "13 paid sick days".
+    """
+    def replace(match: re.Match) -> str:
+        text = match.group(0)
+        value = float(text)
+        if "." not in text and 1900 <= value <= 2100:
+            return text
+        scaled = value * rng.uniform(1 - spread, 1 + spread)
+        if "." in text:
+            return f"{scaled:.{len(text.split('.')[1])}f}"
+        return str(max(1, round(scaled)))
+
+    return _NUMBER.sub(replace, line)
+
+
+def generate_document(
+    template: Dict,
+    index: int,
+    rng: random.Random,
+    sections: Tuple[int, int] = (4, 10),
+    facts: int = 2,
+    spread: float = 0.3
+) -> Tuple[str, List[Dict]]:
+    """
+    Render one synthetic policy document
+
+    Args:
+        template: Parsed policy (see parse_policy)
+        index: Document number, used for the cost center code
+        rng: Random source
+        sections: Inclusive range of sections kept from the template
+        facts: Planted facts (at most one per fact template)
+        spread: Relative perturbation of the template's numbers
+
+    Returns:
+        Tuple of (Markdown text, planted facts as {"question", "answer",
+        "section"} dictionaries)
+    """
+    city = rng.choice(CITIES)
+    department = rng.choice(DEPARTMENTS)
+    code = f"CC-{index:05d}"
+
+    count = min(len(template["sections"]), rng.randint(*sections))
+    kept = sorted(rng.sample(range(len(template["sections"])), count))
+    chosen = [template["sections"][i] for i in kept]
+
+    planted: Dict[int, List[Tuple[Dict, int]]] = {}
+    for fact in rng.sample(FACT_TEMPLATES, min(facts, len(FACT_TEMPLATES))):
+        value = rng.randint(*fact["range"])
+        planted.setdefault(rng.randrange(len(chosen)), []).append((fact, value))
+
+    lines = [
+        f"# {template['title']}: {city} {department}",
+        f"**Effective Date:** {rng.randint(1, 28)} {rng.choice(MONTHS)} {rng.randint(2024, 2026)}",
+        f"**Applies To:** {department} employees in {city} (cost center {code})"
+    ]
+    lines.extend(line for line in template["header"] if not _HEADER_FIELD.match(line))
+
+    qa_pairs = []
+    for number, section in enumerate(chosen, start=1):
+        heading = f"{number}. {section['title']}"
+        lines.extend(["", f"## {heading}"])
+        subsections = 0
+        for line in section["lines"]:
+            match = _SUBHEADING.match(line)
+            if match:
+                subsections = int(match.group("sub"))
+                lines.append(_SUBHEADING.sub(f"### {number}.{subsections} ", line))
+            else:
+                lines.append(perturb_numbers(line, rng, spread))
+
+        for fact, value in planted.get(number - 1, []):
+            subsections += 1
+            fields = {"code": code, "value": value}
+            lines.append(f"### {number}.{subsections} {fact['heading']}")
+            lines.append(fact["sentence"].format(**fields))
+            qa_pairs.append({
+                "question": fact["question"].format(**fields),
+                "answer": fact["answer"].format(**fields),
+                "section": heading
+            })
+
+    return "\n".join(lines) + "\n", qa_pairs
+
+
+def generate_corpus(
+    output_dir: str,
+    documents: int,
+    seed: int = 0,
+    sections: Tuple[int, int] = (4, 10),
+    facts: int = 2,
+    spread: float = 0.3,
+    templates_dir: str = str(POLICIES_DIR)
+) -> Dict:
+    """
+    Write a synthetic policy corpus and its planted questions
+
+    Documents are written one at a time, so corpora of any size fit in
+    memory. The same seed always produces the same corpus.
+
+    Args:
+        output_dir: Directory for the .md files and planted_qa.json
+        documents: Number of documents
+        seed: Random seed
+        sections: Inclusive range of sections per document
+        facts: Planted facts per document
+        spread: Relative perturbation of the template numbers
+        templates_dir: Directory of real policies to imitate
+
+    Returns:
+        Dictionary with documents, characters, qa_pairs and path
+    """
+    rng = random.Random(seed)
+    templates = load_templates(templates_dir)
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    characters = 0
+    qa_pairs = []
+    for index in range(documents):
+        template = templates[index % len(templates)]
+        text, planted = generate_document(template, index, rng, sections, facts, spread)
+        name = f"{template['slug']}-{index:05d}.md"
+        (output / name).write_text(text, encoding="utf-8")
+        characters += len(text)
+        qa_pairs.extend(dict(pair, source=name) for pair in planted)
+
+    with open(output / QA_FILE, 'w', encoding='utf-8') as f:
+        json.dump(qa_pairs, f, indent=2)
+
+    return {
+        "documents": documents,
+        "characters": characters,
+        "qa_pairs": len(qa_pairs),
+        "path": str(output)
+    }
+
+
+def load_planted_qa(corpus_dir: str) -> List[Dict]:
+    """Planted questions of a generated corpus"""
+    with open(Path(corpus_dir) / QA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def revise_documents(corpus_dir: str, count: int, seed: int = 0) -> List[str]:
+    """
+    Append a revision note to `count` random documents, as a policy edit would
+
+    Returns:
+        Names of the revised files
+    """
+    rng = random.Random(seed)
+    files = sorted(Path(corpus_dir).glob("*.md"))
+    revised = rng.sample(files, min(count, len(files)))
+    for path in revised:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(f"\n_Revised on {rng.randint(1, 28)} {rng.choice(MONTHS)} 2026._\n")
+    return [path.name for path in revised]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic policy corpus")
+    parser.add_argument("--documents", type=int, required=True)
+    parser.add_argument("--output", required=True, help="Directory to write the corpus to")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-sections", type=int, default=4)
+    parser.add_argument("--max-sections", type=int, default=10)
+    parser.add_argument("--facts", type=int, default=2, help="Planted facts per document")
+    parser.add_argument("--spread", type=float, default=0.3, help="Relative perturbation of numbers")
+    parser.add_argument("--templates", default=str(POLICIES_DIR))
+    args = parser.parse_args(argv)
+
+    summary = generate_corpus(
+        args.output,
+        args.documents,
+        args.seed,
+        (args.min_sections, args.max_sections),
+        args.facts,
+        args.spread,
+        args.templates
+    )
+    print(
+        f"Wrote {summary['documents']} documents ({summary['characters']:,} characters) "
+        f"and {summary['qa_pairs']} planted questions to {summary['path']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
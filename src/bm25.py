@@ -0,0 +1,193 @@
+"""
+Keyword retrieval for RAG Policy Assistant
+In-process BM25 inverted index and reciprocal-rank fusion with vector results
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+
+
+# Keeps "401k", "gdpr", "1000" and "2.5" as single terms; "$1,000" -> "1000"
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i if in is it of on or "
+    "our the their this to we what when where which who will with you your".split()
+)
+
+# Constant added to each rank in reciprocal-rank fusion
+RRF_K = 60
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms of a text with thousands separators and stopwords removed"""
+    text = re.sub(r"(?<=\d),(?=\d{3}\b)", "", text.lower())
+    return [t for t in _TOKEN_PATTERN.findall(text) if t not in STOPWORDS]
+
+
+def _doc_key(doc: Document) -> str:
+    return doc.metadata.get("chunk_id") or f"{doc.metadata.get('source', 'Unknown')}:{hash(doc.page_content)}"
+
+
+class BM25Index:
+    """
+    Okapi BM25 over policy chunks, keyed by chunk_id
+
+    Postings map each term to {chunk_id: term frequency}, so chunks can be
+    added and removed per file alongside the vector collection. Chunk text
+    and metadata are kept so hits come back as Documents.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            k1: Term-frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+
+        self._docs: Dict[str, Dict] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _index(self, chunk_id: str, text: str, metadata: Dict, terms: Dict[str, int]) -> None:
+        length = sum(terms.values())
+        self._docs[chunk_id] = {"text": text, "metadata": metadata, "terms": terms, "length": length}
+        self._total_length += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[chunk_id] = tf
+
+    def add_documents(self, chunks: List[Document]) -> None:
+        """Index chunks; a chunk_id that is already indexed is replaced"""
+        for chunk in chunks:
+            chunk_id = _doc_key(chunk)
+            self.delete([chunk_id])
+            self._index(chunk_id, chunk.page_content, dict(chunk.metadata), dict(Counter(tokenize(chunk.page_content))))
+
+    def delete(self, ids: List[str]) -> None:
+        """Remove chunks by chunk_id; unknown IDs are ignored"""
+        for chunk_id in ids:
+            doc = self._docs.pop(chunk_id, None)
+            if doc is None:
+                continue
+            self._total_length -= doc["length"]
+            for term in doc["terms"]:
+                postings = self._postings[term]
+                del postings[chunk_id]
+                if not postings:
+                    del self._postings[term]
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        """
+        Rank chunks by BM25 score for a query
+
+        Args:
+            query: Question text
+            k: Number of chunks to return
+
+        Returns:
+            Up to k (chunk, score) pairs, best first; chunks sharing no
+            term with the query are never returned
+        """
+        n = len(self._docs)
+        if n == 0 or k <= 0:
+            return []
+
+        avg_length = self._total_length / n
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._docs[chunk_id]["length"] / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [
+            (
+                Document(
+                    id=chunk_id,
+                    page_content=self._docs[chunk_id]["text"],
+                    metadata=dict(self._docs[chunk_id]["metadata"])
+                ),
+                score
+            )
+            for chunk_id, score in ranked
+        ]
+
+    def save(self, path: str) -> None:
+        """Write the index as JSON (atomically)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "k1": self.k1,
+                "b": self.b,
+                "docs": {
+                    chunk_id: {"text": doc["text"], "metadata": doc["metadata"], "terms": doc["terms"]}
+                    for chunk_id, doc in self._docs.items()
+                }
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Load an index written by save()"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        index = cls(k1=data["k1"], b=data["b"])
+        for chunk_id, doc in data["docs"].items():
+            index._index(chunk_id, doc["text"], doc["metadata"], doc["terms"])
+        return index
+
+    @classmethod
+    def from_documents(cls, chunks: List[Document], **kwargs) -> "BM25Index":
+        """Build an index over chunks"""
+        index = cls(**kwargs)
+        index.add_documents(chunks)
+        return index
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Document]],
+    k: Optional[int] = None,
+    rrf_k: int = RRF_K
+) -> List[Document]:
+    """
+    Merge ranked chunk lists by reciprocal-rank fusion
+
+    Each chunk scores sum(1 / (rrf_k + rank)) over the lists it appears in,
+    so only ranks matter and BM25 and cosine scores need no calibration.
+
+    Args:
+        rankings: Ranked chunk lists, best first
+        k: Number of chunks to return (all if None)
+        rrf_k: Rank offset damping the weight of top positions
+
+    Returns:
+        Fused chunk list, best first (ties keep first-seen order)
+    """
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            key = _doc_key(doc)
+            docs.setdefault(key, doc)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+
+    order = sorted(docs, key=lambda key: -scores[key])
+    return [docs[key] for key in order[:k]]
@@ -0,0 +1,212 @@
+"""
+Client registry for RAG Policy Assistant
+Builds OpenAI chat and embeddings clients once and shares pooled HTTP connections
+"""
+
+import hashlib
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+import httpx
+from langchain_core.embeddings import Embeddings
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from src.local_embeddings import HashedEmbeddings
+
+
+CHAT_MODEL = "gpt-3.5-turbo"
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# OpenAI-compatible endpoint to use instead of api.openai.com, e.g. the
+# local stand-in server (benchmarks/mock_openai.py) for load tests
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+# "openai" (EMBEDDING_MODEL over the API) or "local" (hashed TF on the CPU)
+EMBEDDING_PROVIDERS = ("openai", "local")
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "openai")
+LOCAL_EMBEDDING_DIM = int(os.getenv("LOCAL_EMBEDDING_DIM", "1024"))
+
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0
+)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+_lock = threading.Lock()
+_clients: Dict[Tuple, Any] = {}
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _resolve_api_key(api_key: Optional[str]) -> str:
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found in environment variables")
+    return api_key
+
+
+def _registry_key(kind: str, model: str, api_key: str, params: Dict) -> Tuple:
+    # Hash the key so it never sits in plain text in the registry
+    key_digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    return (kind, model, key_digest, tuple(sorted(params.items())))
+
+
+def get_http_client() -> httpx.Client:
+    """Keep-alive HTTP connection pool shared by all sync OpenAI clients"""
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Keep-alive HTTP connection pool shared by all async OpenAI clients"""
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None or _async_http_client.is_closed:
+            _async_http_client = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        return _async_http_client
+
+
+def _get_or_build(key: Tuple, build) -> Any:
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    # Build outside the registry lock: the pools take it themselves
+    candidate = build()
+    with _lock:
+        return _clients.setdefault(key, candidate)
+
+
+def get_chat_model(
+    model: str = CHAT_MODEL,
+    temperature: float = 0,
+    api_key: Optional[str] = None,
+    **params
+) -> ChatOpenAI:
+    """
+    Shared chat client for the given model and settings
+
+    Args:
+        model: OpenAI chat model name
+        temperature: Sampling temperature
+        api_key: API key (defaults to OPENAI_API_KEY)
+        **params: Extra ChatOpenAI settings, part of the registry key
+
+    Returns:
+        ChatOpenAI instance reused by every caller with the same arguments
+    """
+    api_key = _resolve_api_key(api_key)
+    # Report token usage on streamed responses too
+    params.setdefault("stream_usage", True)
+    if OPENAI_BASE_URL:
+        params.setdefault("base_url", OPENAI_BASE_URL)
+    key = _registry_key("chat", model, api_key, {"temperature": temperature, **params})
+
+    return _get_or_build(key, lambda: ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        openai_api_key=api_key,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        **params
+    ))
+
+
+def get_embeddings(
+    model: str = EMBEDDING_MODEL,
+    api_key: Optional[str] = None,
+    **params
+) -> OpenAIEmbeddings:
+    """
+    Shared embeddings client for the given model and settings
+
+    Args:
+        model: OpenAI embedding model name
+        api_key: API key (defaults to OPENAI_API_KEY)
+        **params: Extra OpenAIEmbeddings settings, part of the registry key
+
+    Returns:
+        OpenAIEmbeddings instance reused by every caller with the same arguments
+    """
+    api_key = _resolve_api_key(api_key)
+    if OPENAI_BASE_URL:
+        params.setdefault("base_url", OPENAI_BASE_URL)
+        # Send raw text: the length check needs a tiktoken download, and
+        # policy chunks are far below the model's input limit
+        params.setdefault("check_embedding_ctx_length", False)
+    key = _registry_key("embeddings", model, api_key, params)
+
+    return _get_or_build(key, lambda: OpenAIEmbeddings(
+        model=model,
+        openai_api_key=api_key,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        **params
+    ))
+
+
+def get_local_embeddings(dim: int = LOCAL_EMBEDDING_DIM) -> HashedEmbeddings:
+    """Shared CPU-only embeddings client; needs no API key or network"""
+    return _get_or_build(("embeddings", "local", dim), lambda: HashedEmbeddings(dim))
+
+
+def _resolve_provider(provider: Optional[str]) -> str:
+    provider = provider or EMBEDDING_PROVIDER
+    if provider not in EMBEDDING_PROVIDERS:
+        raise ValueError(f"Unknown embedding provider '{provider}'; expected one of {EMBEDDING_PROVIDERS}")
+    return provider
+
+
+def get_embedding_client(provider: Optional[str] = None) -> Embeddings:
+    """
+    Shared embeddings client of the configured provider
+
+    Args:
+        provider: "openai" or "local" (defaults to EMBEDDING_PROVIDER)
+
+    Returns:
+        Embeddings instance reused by every caller
+    """
+    if _resolve_provider(provider) == "local":
+        return get_local_embeddings()
+    return get_embeddings(EMBEDDING_MODEL)
+
+
+def embedding_model_name(embeddings: Optional[Embeddings] = None) -> str:
+    """
+    Name of the model behind an embeddings client
+
+    Vectors from different models are not comparable, so indexes and
+    calibrations record this name. OpenAI models served from another
+    endpoint (OPENAI_BASE_URL) are named "<model>@<base URL>", so vectors
+    from a stand-in server never pass for the real model's.
+
+    Args:
+        embeddings: Client to name (defaults to the configured provider's,
+            without creating it)
+    """
+    if embeddings is None:
+        if _resolve_provider(None) == "local":
+            return HashedEmbeddings(LOCAL_EMBEDDING_DIM).model
+        model, base_url = EMBEDDING_MODEL, OPENAI_BASE_URL
+    else:
+        model = getattr(embeddings, "model", type(embeddings).__name__)
+        base_url = getattr(embeddings, "openai_api_base", None)
+    return f"{model}@{base_url}" if base_url else model
+
+
+def close_clients() -> None:
+    """Drop all registered clients and close the shared connection pools"""
+    global _http_client, _async_http_client
+    with _lock:
+        _clients.clear()
+        http_client, _http_client = _http_client, None
+        # Closing the async pool needs an event loop, so it is left to the GC
+        _async_http_client = None
+
+    if http_client is not None:
+        http_client.close()
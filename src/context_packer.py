@@ -0,0 +1,180 @@
+"""
+Context packing for RAG Policy Assistant
+Merges overlapping chunks and fits retrieved context into a token budget
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+
+from src.clients import CHAT_MODEL
+
+
+# Context tokens sent to the LLM per question
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+
+# Rough size of a token when no tokenizer is available
+_CHARS_PER_TOKEN = 4
+
+# Overlap lengths searched for between adjacent chunks (chunk_overlap is
+# 200); shorter matches are treated as coincidence ("|", ".")
+MIN_OVERLAP_CHARS = 16
+MAX_OVERLAP_CHARS = 1000
+
+
+@lru_cache(maxsize=8)
+def get_encoding(model: str = CHAT_MODEL):
+    """
+    Tokenizer for a chat model, loaded once per process
+
+    Returns:
+        tiktoken Encoding, or None when it cannot be loaded (tiktoken
+        downloads encodings on first use), in which case counts are estimated
+    """
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"Tokenizer unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = CHAT_MODEL) -> int:
+    """Number of tokens in a text for the given model"""
+    encoding = get_encoding(model)
+    if encoding is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = CHAT_MODEL) -> str:
+    """Longest prefix of a text that fits in max_tokens"""
+    encoding = get_encoding(model)
+    if encoding is None:
+        return text[:max_tokens * _CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    return encoding.decode(tokens[:max_tokens])
+
+
+def _overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of left that is also a prefix of right"""
+    for size in range(min(len(left), len(right), MAX_OVERLAP_CHARS), MIN_OVERLAP_CHARS - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def merge_adjacent_chunks(docs: List[Document]) -> Tuple[List[Document], int]:
+    """
+    Merge retrieved chunks that are consecutive pieces of the same file
+
+    Chunks are consecutive when they share a source and their chunk_index
+    values differ by one; the text they share through the splitter overlap
+    is kept only once. Each merged chunk takes the rank of its best member.
+
+    Args:
+        docs: Retrieved chunks, most relevant first
+
+    Returns:
+        Tuple of (merged chunks in relevance order, overlap characters removed)
+    """
+    # Runs of consecutive chunks per source, keyed by their first chunk
+    by_position = {}
+    for rank, doc in enumerate(docs):
+        index = doc.metadata.get("chunk_index")
+        if index is not None:
+            by_position[(doc.metadata.get("source"), index)] = rank
+
+    merged = []
+    removed_chars = 0
+    consumed = set()
+
+    for rank, doc in enumerate(docs):
+        if rank in consumed:
+            continue
+        source = doc.metadata.get("source")
+        index = doc.metadata.get("chunk_index")
+        if index is None:
+            merged.append(doc)
+            continue
+
+        # Walk back to the first chunk of the run, then forward to its end
+        start = index
+        while (source, start - 1) in by_position and by_position[(source, start - 1)] not in consumed:
+            start -= 1
+
+        text = ""
+        position = start
+        members = []
+        while (source, position) in by_position and by_position[(source, position)] not in consumed:
+            member_rank = by_position[(source, position)]
+            piece = docs[member_rank].page_content
+            if text:
+                shared = _overlap(text, piece)
+                removed_chars += shared
+                text += piece[shared:] if shared else "\n\n" + piece
+            else:
+                text = piece
+            members.append(member_rank)
+            position += 1
+
+        consumed.update(members)
+        if len(members) == 1:
+            merged.append(doc)
+            continue
+
+        metadata = dict(docs[members[0]].metadata)
+        metadata["merged_chunks"] = len(members)
+        merged.append(Document(page_content=text, metadata=metadata))
+
+    return merged, removed_chars
+
+
+def pack_context(
+    docs: List[Document],
+    max_tokens: Optional[int] = None,
+    model: str = CHAT_MODEL
+) -> Tuple[List[Document], Dict]:
+    """
+    Merge overlapping chunks and keep the most relevant ones within a budget
+
+    Chunks are taken in relevance order; one that does not fit is skipped
+    so a smaller, less relevant chunk can still use the remaining budget.
+    The most relevant chunk is truncated rather than dropped if it alone
+    exceeds the budget.
+
+    Args:
+        docs: Retrieved chunks, most relevant first
+        max_tokens: Token budget for chunk text (defaults to CONTEXT_TOKEN_BUDGET)
+        model: Model whose tokenizer is used for counting
+
+    Returns:
+        Tuple of (packed chunks, stats with chunks_in, chunks_packed,
+        chunks_dropped, overlap_chars_removed and chunk_tokens)
+    """
+    max_tokens = CONTEXT_TOKEN_BUDGET if max_tokens is None else max_tokens
+    merged, removed_chars = merge_adjacent_chunks(docs)
+
+    packed = []
+    used = 0
+    for doc in merged:
+        tokens = count_tokens(doc.page_content, model)
+        if used + tokens <= max_tokens:
+            packed.append(doc)
+            used += tokens
+        elif not packed and max_tokens > 0:
+            text = truncate_to_tokens(doc.page_content, max_tokens, model)
+            packed.append(Document(page_content=text, metadata=dict(doc.metadata)))
+            used += count_tokens(text, model)
+
+    return packed, {
+        "chunks_in": len(docs),
+        "chunks_packed": len(packed),
+        "chunks_dropped": len(merged) - len(packed),
+        "overlap_chars_removed": removed_chars,
+        "chunk_tokens": used
+    }
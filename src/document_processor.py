@@ -3,10 +3,21 @@ Document processing module for RAG Policy Assistant
 Handles loading and chunking of policy documents
 """
 
+import os
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_text_splitters import MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter
+
+
+# "recursive" splits on characters only; "markdown" splits on headings first
+CHUNK_STRATEGIES = ("recursive", "markdown")
+DEFAULT_CHUNK_STRATEGY = os.getenv("CHUNK_STRATEGY", "recursive")
+
+# Sections are cut at these headings; deeper headings are preferred
+# split points when a section is too long for one chunk
+SECTION_HEADINGS = [("#", "h1"), ("##", "h2")]
+SUBSECTION_PREFIX = "### "
 
 
 def load_policy_documents(policies_dir: str) -> List[Document]:
@@ -19,7 +30,22 @@ def load_policy_documents(policies_dir: str) -> List[Document]:
     Returns:
         List of LangChain Document objects with metadata
     """
-    documents = []
+    return list(iter_policy_documents(policies_dir))
+
+
+def iter_policy_documents(policies_dir: str) -> Iterator[Document]:
+    """
+    Lazily load markdown policy files from directory, in name order
+    
+    Only one file's content is held at a time; the directory is checked
+    when iteration starts.
+    
+    Args:
+        policies_dir: Path to directory containing .md files
+        
+    Yields:
+        LangChain Document objects with metadata
+    """
     policies_path = Path(policies_dir)
     
     if not policies_path.exists():
@@ -31,27 +57,52 @@ def load_policy_documents(policies_dir: str) -> List[Document]:
         raise ValueError(f"No .md files found in {policies_dir}")
     
     for md_file in md_files:
-        with open(md_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        yield load_policy_file(md_file)
+
+
+def load_policy_file(md_file: Path) -> Document:
+    """
+    Load a single markdown policy file
+    
+    Args:
+        md_file: Path to the .md file
         
-        # Create Document with metadata
-        doc = Document(
-            page_content=content,
-            metadata={
-                "source": md_file.name,
-                "policy_name": md_file.stem.replace('-', ' ').title(),
-                "file_path": str(md_file)
-            }
-        )
-        documents.append(doc)
+    Returns:
+        LangChain Document with metadata
+    """
+    md_file = Path(md_file)
+    with open(md_file, 'r', encoding='utf-8') as f:
+        content = f.read()
     
-    return documents
+    # Create Document with metadata
+    return Document(
+        page_content=content,
+        metadata={
+            "source": md_file.name,
+            "policy_name": md_file.stem.replace('-', ' ').title(),
+            "file_path": str(md_file)
+        }
+    )
+
+
+def resolve_chunk_strategy(strategy: Optional[str]) -> str:
+    """Validate a chunking strategy name, defaulting to CHUNK_STRATEGY"""
+    strategy = strategy or DEFAULT_CHUNK_STRATEGY
+    if strategy not in CHUNK_STRATEGIES:
+        raise ValueError(f"Unknown chunk strategy '{strategy}'; expected one of {CHUNK_STRATEGIES}")
+    return strategy
+
+
+def chunk_id(source: str, index: int) -> str:
+    """Stable ID of the index-th chunk of a policy file"""
+    return f"{source}::{index}"
 
 
 def chunk_documents(
     documents: List[Document],
     chunk_size: int = 1000,
-    chunk_overlap: int = 200
+    chunk_overlap: int = 200,
+    strategy: Optional[str] = None
 ) -> List[Document]:
     """
     Split documents into chunks for embedding
@@ -60,26 +111,118 @@ def chunk_documents(
         documents: List of documents to chunk
         chunk_size: Target size of each chunk in characters
         chunk_overlap: Overlap between consecutive chunks
+        strategy: "recursive" or "markdown" (defaults to CHUNK_STRATEGY)
         
     Returns:
-        List of chunked documents
+        List of chunked documents, each with chunk_index and chunk_id metadata
     """
-    text_splitter = RecursiveCharacterTextSplitter(
+    return list(iter_chunks(documents, chunk_size, chunk_overlap, strategy))
+
+
+def split_markdown_sections(
+    document: Document,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200
+) -> List[Document]:
+    """
+    Split a markdown document along its heading hierarchy
+    
+    The document is cut into "#"/"##" sections first, so no chunk straddles
+    two sections. A section longer than chunk_size is sub-split, preferring
+    "###" subsection boundaries. Each chunk records its heading path in the
+    "section" metadata (e.g. "PTO & Leave Policy > 4. Sick Leave > 4.2 Usage").
+    
+    Args:
+        document: Markdown document
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between sub-split pieces of one section
+        
+    Returns:
+        Chunks in document order
+    """
+    header_splitter = MarkdownHeaderTextSplitter(
+        headers_to_split_on=SECTION_HEADINGS,
+        strip_headers=False
+    )
+    section_splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
         length_function=len,
-        separators=["\n\n", "\n", ". ", " ", ""]
+        separators=["\n" + SUBSECTION_PREFIX, "\n\n", "\n", ". ", " ", ""]
     )
     
-    chunks = text_splitter.split_documents(documents)
+    chunks = []
+    for section in header_splitter.split_text(document.page_content):
+        path = [section.metadata[key] for _, key in SECTION_HEADINGS if key in section.metadata]
+        subsection = None
+        
+        for piece in section_splitter.split_text(section.page_content):
+            if piece.startswith(SUBSECTION_PREFIX):
+                subsection = piece.split("\n", 1)[0][len(SUBSECTION_PREFIX):].strip()
+            
+            metadata = dict(document.metadata)
+            metadata["section"] = " > ".join(path + ([subsection] if subsection else []))
+            chunks.append(Document(page_content=piece, metadata=metadata))
+            
+            # A later piece without its own heading continues the last subsection
+            for line in piece.splitlines():
+                if line.startswith(SUBSECTION_PREFIX):
+                    subsection = line[len(SUBSECTION_PREFIX):].strip()
     
     return chunks
 
 
+def iter_chunks(
+    documents: Iterable[Document],
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    strategy: Optional[str] = None
+) -> Iterator[Document]:
+    """
+    Lazily split documents into chunks for embedding
+    
+    Each document is split when it is reached, so chaining this onto
+    iter_policy_documents keeps a single file and its chunks in memory.
+    
+    Args:
+        documents: Documents to chunk (any iterable, e.g. a generator)
+        chunk_size: Target size of each chunk in characters
+        chunk_overlap: Overlap between consecutive chunks
+        strategy: "recursive" or "markdown" (defaults to CHUNK_STRATEGY)
+        
+    Yields:
+        Chunked documents, each with chunk_index and chunk_id metadata
+    """
+    strategy = resolve_chunk_strategy(strategy)
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=["\n\n", "\n", ". ", " ", ""]
+    )
+    
+    # Number chunks per source so each file's chunks can be replaced on their own
+    counters = {}
+    for document in documents:
+        if strategy == "markdown":
+            pieces = split_markdown_sections(document, chunk_size, chunk_overlap)
+        else:
+            pieces = text_splitter.split_documents([document])
+        
+        for chunk in pieces:
+            source = chunk.metadata.get("source", "unknown")
+            index = counters.get(source, 0)
+            counters[source] = index + 1
+            chunk.metadata["chunk_index"] = index
+            chunk.metadata["chunk_id"] = chunk_id(source, index)
+            yield chunk
+
+
 def process_policies(
     policies_dir: str,
     chunk_size: int = 1000,
-    chunk_overlap: int = 200
+    chunk_overlap: int = 200,
+    strategy: Optional[str] = None
 ) -> List[Document]:
     """
     Complete pipeline: load and chunk policy documents
@@ -88,11 +231,11 @@ def process_policies(
         policies_dir: Path to policy directory
         chunk_size: Chunk size in characters
         chunk_overlap: Overlap size in characters
+        strategy: "recursive" or "markdown" (defaults to CHUNK_STRATEGY)
         
     Returns:
         List of chunked documents ready for embedding
     """
-    documents = load_policy_documents(policies_dir)
-    chunks = chunk_documents(documents, chunk_size, chunk_overlap)
-    
-    return chunks
\ No newline at end of file
+    return list(iter_chunks(
+        iter_policy_documents(policies_dir), chunk_size, chunk_overlap, strategy
+    ))
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Persistent embedding cache for RAG Policy Assistant
+Content-addressed SQLite store wrapped around an embeddings client
+"""
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List
+from langchain_core.embeddings import Embeddings
+
+
+# SQLite caps the number of host parameters per statement
+_LOOKUP_BATCH = 500
+
+
+def text_hash(text: str) -> str:
+    """Return the sha256 hex digest used as the cache key for a text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves previously embedded texts from disk
+
+    Vectors are keyed by (model, sha256 of text), so an unchanged chunk is
+    only sent to the API once, whichever file or collection it belongs to.
+    Query embeddings are passed straight through to the wrapped client.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        cache_path: str,
+        model: str = None
+    ):
+        """
+        Args:
+            embeddings: Embeddings client used for cache misses
+            cache_path: Path of the SQLite cache file
+            model: Model name used in the cache key (defaults to embeddings.model)
+        """
+        self.embeddings = embeddings
+        self.model = model or getattr(embeddings, "model", type(embeddings).__name__)
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+
+        # Serializes every use of the connection, which is shared by threads
+        self._lock = threading.Lock()
+        self._conn = None
+        with self._lock:
+            self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open connection, reopened after close() (caller holds the lock)"""
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                )"""
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _lookup(self, hashes: List[str]) -> Dict[str, List[float]]:
+        """Fetch cached vectors for the given hashes"""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+
+        with self._lock:
+            for start in range(0, len(unique), _LOOKUP_BATCH):
+                batch = unique[start:start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection().execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [self.model, *batch]
+                ).fetchall()
+                for h, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[h] = vector.tolist()
+
+        return found
+
+    def _store(self, items: Dict[str, List[float]]) -> None:
+        """Persist newly computed vectors"""
+        rows = [
+            (self.model, h, array("f", vector).tobytes())
+            for h, vector in items.items()
+        ]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) "
+                "VALUES (?, ?, ?)",
+                rows
+            )
+            conn.commit()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, calling the wrapped client only for unseen content
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per input text, in input order
+        """
+        hashes = [text_hash(t) for t in texts]
+        cached = self._lookup(hashes)
+
+        # Deduplicate misses so repeated text in one batch is embedded once
+        missing = {}
+        for h, text in zip(hashes, texts):
+            if h not in cached and h not in missing:
+                missing[h] = text
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._store(computed)
+            cached.update(computed)
+
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+
+        return [cached[h] for h in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a search query (not cached)"""
+        return self.embeddings.embed_query(text)
+
+    def stats(self) -> Dict:
+        """
+        Cache statistics since this wrapper was created
+
+        Returns:
+            Dictionary with hits, misses and hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+    def close(self) -> None:
+        """
+        Close the SQLite connection and release the cache file
+
+        The wrapper stays usable: the next embed_documents call reopens it.
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> "CachedEmbeddings":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,202 @@
+"""
+Per-file index manifest for RAG Policy Assistant
+Tracks content hash, mtime and chunk IDs of every indexed policy file
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+from langchain_core.documents import Document
+
+
+MANIFEST_FILE = ".policies_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_hash(path: Path) -> str:
+    """Return the sha256 hex digest of a file's contents"""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def scan_policy_files(
+    policies_dir: str,
+    previous: Optional[Dict] = None
+) -> Dict[str, Dict]:
+    """
+    Fingerprint every markdown file in the policy directory
+
+    Files whose mtime and size match the previous manifest reuse the stored
+    hash instead of being read again.
+
+    Args:
+        policies_dir: Path to directory containing .md files
+        previous: Files section of the last saved manifest
+
+    Returns:
+        Mapping of file name to {"hash", "mtime", "size"}
+    """
+    previous = previous or {}
+    files = {}
+
+    for md_file in sorted(Path(policies_dir).glob("*.md")):
+        stat = md_file.stat()
+        old = previous.get(md_file.name)
+
+        if old and old.get("mtime") == stat.st_mtime and old.get("size") == stat.st_size:
+            digest = old["hash"]
+        else:
+            digest = file_hash(md_file)
+
+        files[md_file.name] = {
+            "hash": digest,
+            "mtime": stat.st_mtime,
+            "size": stat.st_size
+        }
+
+    return files
+
+
+def diff_files(old_files: Dict[str, Dict], new_files: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """
+    Compare two file fingerprints
+
+    Args:
+        old_files: Files section of the stored manifest
+        new_files: Result of scan_policy_files
+
+    Returns:
+        Dictionary with added, changed, removed and unchanged file names
+    """
+    added = sorted(name for name in new_files if name not in old_files)
+    removed = sorted(name for name in old_files if name not in new_files)
+    changed = sorted(
+        name for name in new_files
+        if name in old_files and new_files[name]["hash"] != old_files[name]["hash"]
+    )
+    unchanged = sorted(
+        name for name in new_files
+        if name in old_files and new_files[name]["hash"] == old_files[name]["hash"]
+    )
+
+    return {
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+        "unchanged": unchanged
+    }
+
+
+def chunk_ids_by_source(chunks: List[Document]) -> Dict[str, List[str]]:
+    """Group chunk IDs by the file they came from"""
+    grouped = {}
+    for chunk in chunks:
+        source = chunk.metadata.get("source", "unknown")
+        grouped.setdefault(source, []).append(chunk.metadata["chunk_id"])
+    return grouped
+
+
+def build_manifest(
+    policies_dir: str,
+    chunk_ids: Dict[str, List[str]],
+    collection_name: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    backend: str = "chroma",
+    chunk_strategy: str = "recursive",
+    embedding_model: Optional[str] = None
+) -> Dict:
+    """
+    Build a manifest describing a freshly indexed collection
+
+    Args:
+        policies_dir: Path to policy directory
+        chunk_ids: IDs of the chunks written to the collection, per source
+            file (see chunk_ids_by_source)
+        collection_name: Name of the collection
+        chunk_size: Chunk size used to split the files
+        chunk_overlap: Chunk overlap used to split the files
+        backend: Vector store backend holding the collection
+        chunk_strategy: Chunking strategy used to split the files
+        embedding_model: Model the chunks were embedded with
+
+    Returns:
+        Manifest dictionary
+    """
+    files = scan_policy_files(policies_dir)
+
+    for name, entry in files.items():
+        entry["chunk_ids"] = chunk_ids.get(name, [])
+
+    return {
+        "version": MANIFEST_VERSION,
+        "collection_name": collection_name,
+        "backend": backend,
+        "chunk_size": chunk_size,
+        "chunk_overlap": chunk_overlap,
+        "chunk_strategy": chunk_strategy,
+        "embedding_model": embedding_model,
+        "files": files
+    }
+
+
+def index_version(manifest: Optional[Dict]) -> Optional[str]:
+    """
+    Short digest identifying the indexed content
+
+    Changes whenever a file is added, edited or removed, or the collection
+    is rebuilt under a new name.
+
+    Args:
+        manifest: Manifest dictionary (or None)
+
+    Returns:
+        16-character hex digest, or None without a manifest
+    """
+    if not manifest:
+        return None
+
+    hasher = hashlib.sha256(manifest.get("collection_name", "").encode("utf-8"))
+    for name, entry in sorted(manifest.get("files", {}).items()):
+        hasher.update(f"{name}:{entry['hash']}".encode("utf-8"))
+    return hasher.hexdigest()[:16]
+
+
+def load_manifest(persist_directory: str) -> Optional[Dict]:
+    """
+    Load the manifest stored next to the vector store
+
+    Returns:
+        Manifest dictionary, or None if missing, unreadable or outdated
+    """
+    path = Path(persist_directory) / MANIFEST_FILE
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+
+    return manifest
+
+
+def save_manifest(persist_directory: str, manifest: Dict) -> None:
+    """Atomically write the manifest next to the vector store"""
+    directory = Path(persist_directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    path = directory / MANIFEST_FILE
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
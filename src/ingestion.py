@@ -0,0 +1,189 @@
+"""
+Parallel ingestion pipeline for RAG Policy Assistant
+Loads and chunks policy files on a process pool and streams chunks to the embedder
+"""
+
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+from src.document_processor import chunk_documents, load_policy_file, resolve_chunk_strategy
+
+
+# Chunks sent to the vector store per add_documents call
+EMBED_BATCH_SIZE = 256
+
+# Worker processes used to parse and chunk policy files; a pool only pays
+# off for large corpora, so chunking runs inline unless this is raised
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS") or 1)
+
+
+def load_and_chunk(
+    path: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    strategy: Optional[str] = None
+) -> Tuple[List[Document], float]:
+    """
+    Read, parse and chunk one policy file (runs in a worker process)
+
+    Args:
+        path: Path to the .md file
+        chunk_size: Chunk size in characters
+        chunk_overlap: Overlap size in characters
+        strategy: "recursive" or "markdown" chunking
+
+    Returns:
+        Tuple of (chunks, seconds spent)
+    """
+    start = time.perf_counter()
+    chunks = chunk_documents([load_policy_file(Path(path))], chunk_size, chunk_overlap, strategy)
+    return chunks, time.perf_counter() - start
+
+
+class _InlineExecutor:
+    """Runs submitted work immediately; used for a single worker"""
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def ingest_policies(
+    policies_dir: str,
+    vectorstore: VectorStore,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    strategy: Optional[str] = None,
+    workers: Optional[int] = None,
+    batch_size: int = EMBED_BATCH_SIZE,
+    max_pending: Optional[int] = None,
+    on_batch: Optional[Callable[[List[Document]], None]] = None
+) -> Dict:
+    """
+    Chunk every policy file in parallel and add the chunks to a vector store
+
+    Files are parsed and chunked on a process pool. At most `max_pending`
+    files are in flight and at most `batch_size` chunks are buffered, so
+    while a batch is being embedded no further files are read: memory use
+    is bounded by those limits, not by corpus size. Files are consumed in
+    name order, so chunk IDs and insertion order are deterministic.
+
+    Args:
+        policies_dir: Path to policy directory
+        vectorstore: Store that embeds and keeps the chunks
+        chunk_size: Chunk size in characters
+        chunk_overlap: Overlap size in characters
+        strategy: "recursive" or "markdown" chunking (defaults to CHUNK_STRATEGY)
+        workers: Worker processes (defaults to INGEST_WORKERS; 1 runs inline)
+        batch_size: Chunks per add_documents call
+        max_pending: Files read ahead of the embedder (defaults to 2 * workers)
+        on_batch: Called with each batch after it was added (e.g. keyword indexing)
+
+    Returns:
+        Dictionary with documents, chunks, chunk_ids per source file,
+        seconds and documents/chunks per second overall and per stage
+    """
+    policies_path = Path(policies_dir)
+    if not policies_path.exists():
+        raise FileNotFoundError(f"Policy directory not found: {policies_dir}")
+
+    paths = sorted(str(p) for p in policies_path.glob("*.md"))
+    if not paths:
+        raise ValueError(f"No .md files found in {policies_dir}")
+
+    strategy = resolve_chunk_strategy(strategy)
+    workers = workers or INGEST_WORKERS
+    max_pending = max_pending or 2 * workers
+
+    chunk_ids: Dict[str, List[str]] = {}
+    batch: List[Document] = []
+    documents = 0
+    chunks = 0
+    parse_seconds = 0.0
+    embed_seconds = 0.0
+    start = time.perf_counter()
+
+    def flush() -> None:
+        nonlocal embed_seconds
+        if not batch:
+            return
+        embed_start = time.perf_counter()
+        vectorstore.add_documents(batch, ids=[c.metadata["chunk_id"] for c in batch])
+        embed_seconds += time.perf_counter() - embed_start
+        if on_batch is not None:
+            on_batch(list(batch))
+        batch.clear()
+
+    # Builds run on the reindexer thread: spawn, since forking a threaded
+    # process can copy a lock another thread holds into the workers
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) if workers > 1 else _InlineExecutor()
+    with executor:
+        pending: Deque[Future] = deque()
+        next_path = 0
+
+        while next_path < len(paths) or pending:
+            # Read ahead only while the embedder keeps up
+            while next_path < len(paths) and len(pending) < max_pending:
+                pending.append(executor.submit(
+                    load_and_chunk, paths[next_path], chunk_size, chunk_overlap, strategy
+                ))
+                next_path += 1
+
+            file_chunks, seconds = pending.popleft().result()
+            documents += 1
+            chunks += len(file_chunks)
+            parse_seconds += seconds
+
+            for chunk in file_chunks:
+                chunk_ids.setdefault(chunk.metadata["source"], []).append(chunk.metadata["chunk_id"])
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    flush()
+
+        flush()
+
+    elapsed = time.perf_counter() - start
+
+    def rate(count: int, seconds: float) -> float:
+        return round(count / seconds, 1) if seconds else 0.0
+
+    return {
+        "documents": documents,
+        "chunks": chunks,
+        "chunk_ids": chunk_ids,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "documents_per_second": rate(documents, elapsed),
+        "chunks_per_second": rate(chunks, elapsed),
+        "stages": {
+            # Parse time is summed over workers, so its rate is per process
+            "parse": {
+                "seconds": round(parse_seconds, 3),
+                "documents_per_second": rate(documents, parse_seconds)
+            },
+            "embed": {
+                "seconds": round(embed_seconds, 3),
+                "chunks_per_second": rate(chunks, embed_seconds)
+            }
+        }
+    }
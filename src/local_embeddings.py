@@ -0,0 +1,81 @@
+"""
+Local embeddings for RAG Policy Assistant
+CPU-only hashed term-frequency vectors for offline indexing, tests and benchmarks
+"""
+
+import math
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import List, Tuple
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.bm25 import tokenize
+
+
+DEFAULT_DIM = 1024
+
+
+@lru_cache(maxsize=200000)
+def _bucket(feature: str, dim: int) -> Tuple[int, float]:
+    """Hash bucket and sign of a feature; stable across processes, unlike hash()"""
+    digest = zlib.crc32(feature.encode("utf-8"))
+    return digest % dim, 1.0 if digest & 0x80000000 else -1.0
+
+
+class HashedEmbeddings(Embeddings):
+    """
+    Embeddings from hashed word and word-pair counts
+
+    Each text's terms (BM25 tokenization: lowercase, thousands separators
+    and stopwords removed) and adjacent term pairs are hashed into `dim`
+    signed buckets with sublinear (1 + log tf) weights, and rows are
+    L2-normalized so dot products are cosine similarities. There is no
+    fitted vocabulary or model file: the same text gives the same vector
+    in every process, with no network access. Retrieval quality is that of
+    lexical matching, well below OpenAI embeddings, so this backend is
+    meant for offline development, CI and benchmarks.
+    """
+
+    def __init__(self, dim: int = DEFAULT_DIM):
+        """
+        Args:
+            dim: Vector dimension (number of hash buckets)
+        """
+        self.dim = dim
+        self.model = f"hashed-tf-{dim}"
+
+    def _features(self, text: str) -> Counter:
+        terms = tokenize(text)
+        features = Counter(terms)
+        features.update(f"{a} {b}" for a, b in zip(terms, terms[1:]))
+        return features
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as a float32 matrix with one normalized row per text"""
+        rows, columns, values = [], [], []
+        for row, text in enumerate(texts):
+            for feature, tf in self._features(text).items():
+                bucket, sign = _bucket(feature, self.dim)
+                rows.append(row)
+                columns.append(bucket)
+                values.append(sign * (1.0 + math.log(tf)))
+
+        # Scatter every (row, bucket) weight into the matrix in one pass
+        flat = np.asarray(rows, dtype=np.int64) * self.dim + np.asarray(columns, dtype=np.int64)
+        matrix = np.bincount(
+            flat, weights=np.asarray(values, dtype=np.float64), minlength=len(texts) * self.dim
+        ).reshape(len(texts), self.dim).astype(np.float32)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self.embed_matrix(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_matrix([text])[0].tolist()
@@ -0,0 +1,194 @@
+"""
+In-process metrics for RAG Policy Assistant
+Latency histograms and counters with percentile summaries and Prometheus export
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Samples kept per series for percentile estimates
+RESERVOIR_SIZE = 10000
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((labels or {}).items()))
+
+
+def percentile(sorted_values, q: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Histogram:
+    """
+    Distribution of observed values
+
+    Count and sum cover every observation; percentiles are computed over
+    the most recent RESERVOIR_SIZE samples.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self._samples = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self._samples.append(value)
+
+    def summary(self) -> Dict:
+        values = sorted(self._samples)
+        summary = {"count": self.count, "sum": self.sum}
+        for q in QUANTILES:
+            summary[f"p{int(q * 100)}"] = percentile(values, q)
+        return summary
+
+
+class MetricsRegistry:
+    """Thread-safe collection of named, labelled histograms and counters"""
+
+    def __init__(self):
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        """Attach a HELP line to a metric"""
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        """Record one observation in a histogram"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def increment(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None) -> None:
+        """Add to a counter"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    @contextmanager
+    def timer(self, name: str, labels: Optional[Dict[str, str]] = None) -> Iterator[None]:
+        """Observe the wall time of a block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def snapshot(self) -> Dict:
+        """
+        Current values of all metrics
+
+        Returns:
+            Dictionary with "histograms" (count, sum, p50/p95/p99 per series)
+            and "counters", each keyed by metric name then label string
+        """
+        with self._lock:
+            histograms = {
+                name: {_format_labels(key): h.summary() for key, h in series.items()}
+                for name, series in self._histograms.items()
+            }
+            counters = {
+                name: {_format_labels(key): value for key, value in series.items()}
+                for name, series in self._counters.items()
+            }
+        return {"histograms": histograms, "counters": counters}
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Histograms are exported as summaries with 0.5/0.95/0.99 quantiles.
+        """
+        lines = []
+        with self._lock:
+            for name in sorted(self._histograms):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} summary")
+                for key, histogram in sorted(self._histograms[name].items()):
+                    summary = histogram.summary()
+                    for q in QUANTILES:
+                        labels = _format_labels(key + (("quantile", str(q)),))
+                        lines.append(f"{name}{labels} {summary[f'p{int(q * 100)}']}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {summary['sum']}")
+                    lines.append(f"{name}_count{_format_labels(key)} {summary['count']}")
+
+            for name in sorted(self._counters):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop all recorded values"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+class StageTimer:
+    """Accumulates wall time per named pipeline stage"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        """Seconds since the timer was created"""
+        return time.perf_counter() - self._start
+
+    def finish(self) -> Dict[str, float]:
+        """Per-stage seconds plus "total" since the timer was created"""
+        timings = {name: round(value, 6) for name, value in self.timings.items()}
+        timings["total"] = round(self.elapsed(), 6)
+        return timings
+
+
+# Registry shared by the whole process
+registry = MetricsRegistry()
@@ -0,0 +1,360 @@
+"""
+Exact in-memory vector store for RAG Policy Assistant
+Brute-force cosine search over a contiguous float32 matrix with NumPy
+"""
+
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+
+MATRIX_FILE = "embeddings.npy"
+SIDECAR_FILE = "store.json"
+# Names the snapshot directory holding the current matrix and sidecar
+POINTER_FILE = "CURRENT"
+SNAPSHOT_PREFIX = "snapshot-"
+
+
+def _current_snapshot(directory: Path) -> Optional[str]:
+    """Snapshot directory named by the CURRENT pointer (None before the first save)"""
+    pointer = directory / POINTER_FILE
+    if not pointer.exists():
+        return None
+    return pointer.read_text(encoding="utf-8").strip()
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Exact nearest-neighbour search over L2-normalized embeddings
+
+    Embeddings live in one contiguous float32 matrix with parallel lists of
+    IDs, texts and metadata. A query is a single matrix-vector product
+    followed by argpartition, so results are exact and deterministic (ties
+    are broken by insertion order). Suited to corpora up to a few hundred
+    thousand chunks.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        persist_path: Optional[str] = None
+    ):
+        """
+        Args:
+            embedding: Embeddings client used for texts and queries
+            persist_path: Directory used by save() and load()
+        """
+        self._embedding = embedding
+        self.persist_path = Path(persist_path) if persist_path else None
+
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[Dict] = []
+        self._rows: Dict[str, int] = {}
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def __len__(self) -> int:
+        return self._size
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _reserve(self, rows: int, dim: int) -> None:
+        """Grow the matrix geometrically so appends stay amortized O(1)"""
+        if self._matrix.shape[1] not in (0, dim):
+            raise ValueError(
+                f"Embedding dimension {dim} does not match store dimension {self._matrix.shape[1]}"
+            )
+        capacity = self._matrix.shape[0]
+        if self._size + rows <= capacity and self._matrix.shape[1] == dim:
+            return
+
+        new_capacity = max(self._size + rows, capacity * 2, 64)
+        matrix = np.zeros((new_capacity, dim), dtype=np.float32)
+        if self._size:
+            matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+
+    def add_vectors(
+        self,
+        vectors: np.ndarray,
+        texts: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Insert precomputed embeddings; existing IDs are overwritten
+
+        Returns:
+            IDs of the inserted rows
+        """
+        vectors = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1))
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+
+        self._reserve(len(texts), vectors.shape[1])
+
+        for vector, text, metadata, doc_id in zip(vectors, texts, metadatas, ids):
+            row = self._rows.get(doc_id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._rows[doc_id] = row
+                self._ids.append(doc_id)
+                self._texts.append(text)
+                self._metadatas.append(dict(metadata or {}))
+            else:
+                self._texts[row] = text
+                self._metadatas[row] = dict(metadata or {})
+            self._matrix[row] = vector
+
+        return list(ids)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any
+    ) -> List[str]:
+        """Embed and insert texts; existing IDs are overwritten"""
+        texts = list(texts)
+        if not texts:
+            return []
+        vectors = np.asarray(self._embedding.embed_documents(texts), dtype=np.float32)
+        return self.add_vectors(vectors, texts, metadatas, ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Remove rows by ID, moving the last row into each freed slot"""
+        if ids is None:
+            return False
+
+        for doc_id in ids:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                continue
+            last = self._size - 1
+            if row != last:
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = self._ids[last]
+                self._texts[row] = self._texts[last]
+                self._metadatas[row] = self._metadatas[last]
+                self._rows[self._ids[row]] = row
+            self._ids.pop()
+            self._texts.pop()
+            self._metadatas.pop()
+            self._size -= 1
+
+        return True
+
+    def delete_collection(self) -> None:
+        """Drop all rows and the persisted files"""
+        self.__init__(self._embedding, self.persist_path)
+        if self.persist_path and self.persist_path.exists():
+            shutil.rmtree(self.persist_path)
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    def _document(self, row: int) -> Document:
+        return Document(
+            id=self._ids[row],
+            page_content=self._texts[row],
+            metadata=dict(self._metadatas[row])
+        )
+
+    def _top_k(self, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        if self._size == 0 or k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        scores = self._matrix[:self._size] @ query
+
+        if k < self._size:
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(self._size)
+
+        # Highest score first, insertion order breaks ties
+        order = np.lexsort((candidates, -scores[candidates]))
+        return [(int(candidates[i]), float(scores[candidates[i]])) for i in order]
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        """k nearest chunks with their cosine similarity (higher is closer)"""
+        return [(self._document(row), score) for row, score in self._top_k(embedding, k)]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(
+            self._embedding.embed_query(query), k
+        )
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Scores are already cosine similarities
+        return lambda score: max(0.0, min(1.0, score))
+
+    def get_by_ids(self, ids: List[str]) -> List[Document]:
+        return [self._document(self._rows[i]) for i in ids if i in self._rows]
+
+    def iter_batches(
+        self,
+        batch_size: int = 1000
+    ) -> Iterator[Tuple[List[str], List[str], List[Dict], np.ndarray]]:
+        """Yield (ids, texts, metadatas, embeddings) in row order"""
+        for start in range(0, self._size, batch_size):
+            end = min(start + batch_size, self._size)
+            yield (
+                self._ids[start:end],
+                self._texts[start:end],
+                self._metadatas[start:end],
+                self._matrix[start:end]
+            )
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Write the matrix as .npy and IDs, texts and metadata as a JSON sidecar
+
+        Both files go into a new snapshot directory, which is then published
+        by atomically rewriting the CURRENT pointer, so a concurrent load()
+        sees either the old pair or the new pair, never a mix. The previous
+        snapshot is kept for readers still opening it; older ones are removed.
+
+        Args:
+            path: Target directory (defaults to persist_path)
+        """
+        directory = Path(path) if path else self.persist_path
+        if directory is None:
+            raise ValueError("No path given and store has no persist_path")
+        directory.mkdir(parents=True, exist_ok=True)
+
+        snapshot = f"{SNAPSHOT_PREFIX}{uuid.uuid4().hex[:12]}"
+        staging = directory / snapshot
+        staging.mkdir()
+
+        with open(staging / MATRIX_FILE, 'wb') as f:
+            np.save(f, self._matrix[:self._size])
+
+        with open(staging / SIDECAR_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                "ids": self._ids,
+                "texts": self._texts,
+                "metadatas": self._metadatas
+            }, f)
+
+        previous = _current_snapshot(directory)
+        pointer_tmp = directory / (POINTER_FILE + ".tmp")
+        pointer_tmp.write_text(snapshot, encoding="utf-8")
+        os.replace(pointer_tmp, directory / POINTER_FILE)
+
+        for entry in directory.iterdir():
+            if entry.name.startswith(SNAPSHOT_PREFIX) and entry.name not in (snapshot, previous):
+                shutil.rmtree(entry, ignore_errors=True)
+        # Files of stores saved before snapshots existed
+        for name in (MATRIX_FILE, SIDECAR_FILE):
+            (directory / name).unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path: str, embedding: Embeddings) -> "NumpyVectorStore":
+        """
+        Load a store written by save()
+
+        Args:
+            path: Directory containing the CURRENT pointer and its snapshot
+            embedding: Embeddings client for queries and new texts
+
+        Returns:
+            Loaded store (persist_path set to path)
+
+        Raises:
+            FileNotFoundError: If no store was saved in path
+            ValueError: If the matrix and sidecar disagree on the row count
+        """
+        directory = Path(path)
+        snapshot = _current_snapshot(directory)
+        files = directory / snapshot if snapshot else directory
+        if not (files / MATRIX_FILE).exists():
+            raise FileNotFoundError(f"No NumPy vector store in {path}")
+
+        with open(files / SIDECAR_FILE, 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+        matrix = np.load(files / MATRIX_FILE)
+
+        rows = {len(sidecar["ids"]), len(sidecar["texts"]), len(sidecar["metadatas"]), matrix.shape[0]}
+        if len(rows) != 1:
+            raise ValueError(
+                f"NumPy vector store in {path} is inconsistent: "
+                f"{matrix.shape[0]} vectors for {len(sidecar['ids'])} IDs"
+            )
+
+        store = cls(embedding, persist_path=str(directory))
+        store._matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        store._size = store._matrix.shape[0]
+        store._ids = sidecar["ids"]
+        store._texts = sidecar["texts"]
+        store._metadatas = sidecar["metadatas"]
+        store._rows = {doc_id: row for row, doc_id in enumerate(store._ids)}
+        return store
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        persist_path: Optional[str] = None,
+        **kwargs: Any
+    ) -> "NumpyVectorStore":
+        """Build a store from texts, saving it when persist_path is given"""
+        store = cls(embedding, persist_path=persist_path)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        if persist_path:
+            store.save()
+        return store
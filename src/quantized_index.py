@@ -0,0 +1,321 @@
+"""
+Memory-mapped quantized vector index for RAG Policy Assistant
+Read-only int8/float16 export of a collection that worker processes open instantly
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+
+FORMAT_VERSION = 1
+DTYPES = ("int8", "float16")
+
+HEADER_FILE = "index.json"
+VECTORS_FILE = "vectors.npy"
+SCALES_FILE = "scales.npy"
+RECORDS_FILE = "records.bin"
+OFFSETS_FILE = "offsets.npy"
+
+# Rows scored per step, so query-time scratch memory is independent of corpus
+# size: each block is upcast to float32, about 12 MB at 1536 dimensions
+BLOCK_ROWS = 2048
+
+# (ids, texts, metadatas, embeddings) for one batch of rows
+RowBatch = Tuple[List[str], List[str], List[Dict], np.ndarray]
+
+
+def quantize(vectors: np.ndarray, dtype: str = "int8") -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    L2-normalize embeddings and quantize them
+
+    Args:
+        vectors: 2-D float array of embeddings
+        dtype: "int8" (symmetric, one scale per row) or "float16"
+
+    Returns:
+        Tuple of (quantized matrix, per-row float32 scales or None for float16)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = vectors / norms
+
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    if dtype != "int8":
+        raise ValueError(f"Unknown dtype '{dtype}'; expected one of {DTYPES}")
+
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def write_quantized_index(
+    path: str,
+    batches: Iterable[RowBatch],
+    count: int,
+    dtype: str = "int8"
+) -> Dict:
+    """
+    Write a quantized index directory from batches of rows
+
+    Rows are streamed straight to disk, so exporting never holds more than
+    one batch in memory. The directory is written next to the target and
+    renamed into place; processes that still map the previous files keep
+    reading them until they reopen.
+
+    Args:
+        path: Target directory
+        batches: Iterable of (ids, texts, metadatas, embeddings) batches
+        count: Total number of rows across all batches
+        dtype: "int8" or "float16"
+
+    Returns:
+        Header dictionary written to index.json
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Unknown dtype '{dtype}'; expected one of {DTYPES}")
+
+    target = Path(path)
+    staging = target.with_name(f"{target.name}.tmp-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    vectors = None
+    scales = np.ones(count, dtype=np.float32)
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    row = 0
+    dim = 0
+
+    with open(staging / RECORDS_FILE, 'wb') as records:
+        for ids, texts, metadatas, embeddings in batches:
+            quantized, batch_scales = quantize(embeddings, dtype)
+            if vectors is None:
+                dim = quantized.shape[1]
+                vectors = np.lib.format.open_memmap(
+                    staging / VECTORS_FILE, mode="w+", dtype=quantized.dtype, shape=(count, dim)
+                )
+
+            end = row + len(ids)
+            if end > count:
+                raise ValueError(f"Received more than the expected {count} rows")
+            vectors[row:end] = quantized
+            if batch_scales is not None:
+                scales[row:end] = batch_scales
+
+            for i, (doc_id, text, metadata) in enumerate(zip(ids, texts, metadatas)):
+                record = json.dumps(
+                    {"id": doc_id, "text": text, "metadata": metadata or {}},
+                    ensure_ascii=False
+                ).encode("utf-8")
+                records.write(record)
+                offsets[row + i + 1] = offsets[row + i] + len(record)
+            row = end
+
+    if row != count:
+        raise ValueError(f"Expected {count} rows, received {row}")
+
+    if vectors is None:
+        np.save(staging / VECTORS_FILE, np.zeros((0, 0), dtype=np.int8 if dtype == "int8" else np.float16))
+    else:
+        vectors.flush()
+        del vectors
+    np.save(staging / OFFSETS_FILE, offsets)
+    if dtype == "int8":
+        np.save(staging / SCALES_FILE, scales)
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "dtype": dtype,
+        "count": count,
+        "dim": dim
+    }
+    with open(staging / HEADER_FILE, 'w', encoding='utf-8') as f:
+        json.dump(header, f, indent=2)
+
+    # Swap the finished directory into place
+    retired = target.with_name(f"{target.name}.old-{os.getpid()}")
+    if target.exists():
+        os.replace(target, retired)
+    os.replace(staging, target)
+    shutil.rmtree(retired, ignore_errors=True)
+
+    return header
+
+
+class QuantizedVectorStore(VectorStore):
+    """
+    Read-only vector store over a memory-mapped quantized index
+
+    Opening maps the files without reading them, so startup cost and
+    private memory do not depend on corpus size, and every worker process
+    on the host shares the same pages through the OS page cache. Search
+    scores BLOCK_ROWS rows at a time; only the top-k records are decoded.
+    Scores are cosine similarities up to quantization error.
+    """
+
+    def __init__(self, path: str, embedding: Embeddings):
+        """
+        Args:
+            path: Directory written by write_quantized_index
+            embedding: Embeddings client used for queries
+        """
+        self.path = Path(path)
+        self._embedding = embedding
+
+        header_path = self.path / HEADER_FILE
+        if not header_path.exists():
+            raise FileNotFoundError(f"No quantized index in {path}")
+        with open(header_path, 'r', encoding='utf-8') as f:
+            self.header = json.load(f)
+        if self.header.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported quantized index format in {path}")
+
+        self._count = self.header["count"]
+        self._vectors = np.load(self.path / VECTORS_FILE, mmap_mode="r")
+        self._offsets = np.load(self.path / OFFSETS_FILE, mmap_mode="r")
+        self._scales = None
+        if self.header["dtype"] == "int8":
+            self._scales = np.load(self.path / SCALES_FILE, mmap_mode="r")
+        self._records = (
+            np.memmap(self.path / RECORDS_FILE, dtype=np.uint8, mode="r")
+            if self._offsets[-1] else np.zeros(0, dtype=np.uint8)
+        )
+        self._id_rows: Optional[Dict[str, int]] = None
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def __len__(self) -> int:
+        return self._count
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    def _record(self, row: int) -> Dict:
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return json.loads(self._records[start:end].tobytes().decode("utf-8"))
+
+    def _document(self, row: int) -> Document:
+        record = self._record(row)
+        return Document(id=record["id"], page_content=record["text"], metadata=record["metadata"])
+
+    def _top_k(self, query: List[float], k: int) -> List[Tuple[int, float]]:
+        if self._count == 0 or k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        if query.shape[0] != self.header["dim"]:
+            raise ValueError(
+                f"Query dimension {query.shape[0]} does not match index dimension {self.header['dim']}"
+            )
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+
+        for start in range(0, self._count, BLOCK_ROWS):
+            end = min(start + BLOCK_ROWS, self._count)
+            scores = self._vectors[start:end].astype(np.float32) @ query
+            if self._scales is not None:
+                scores *= self._scales[start:end]
+
+            if k < len(scores):
+                local = np.argpartition(-scores, k - 1)[:k]
+            else:
+                local = np.arange(len(scores))
+
+            best_rows = np.concatenate([best_rows, local + start])
+            best_scores = np.concatenate([best_scores, scores[local]])
+            if len(best_rows) > k:
+                keep = np.lexsort((best_rows, -best_scores))[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        # Highest score first, row order breaks ties
+        order = np.lexsort((best_rows, -best_scores))
+        return [(int(best_rows[i]), float(best_scores[i])) for i in order]
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        k: int = 4
+    ) -> List[Tuple[Document, float]]:
+        """k nearest chunks with their approximate cosine similarity"""
+        return [(self._document(row), score) for row, score in self._top_k(embedding, k)]
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(
+            self._embedding.embed_query(query), k
+        )
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self):
+        # Scores are already cosine similarities
+        return lambda score: max(0.0, min(1.0, score))
+
+    def get_by_ids(self, ids: List[str]) -> List[Document]:
+        if self._id_rows is None:
+            # Built on first use only; search never needs it
+            self._id_rows = {self._record(row)["id"]: row for row in range(self._count)}
+        return [self._document(self._id_rows[i]) for i in ids if i in self._id_rows]
+
+    # -------------------------------------------------------------------------
+    # Writes (not supported)
+    # -------------------------------------------------------------------------
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[Dict]] = None, **kwargs: Any) -> List[str]:
+        raise NotImplementedError("Quantized index is read-only; re-export the collection instead")
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        raise NotImplementedError("Quantized index is read-only; re-export the collection instead")
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        persist_path: Optional[str] = None,
+        dtype: str = "int8",
+        **kwargs: Any
+    ) -> "QuantizedVectorStore":
+        """Embed texts, write them as a quantized index at persist_path and open it"""
+        if persist_path is None:
+            raise ValueError("persist_path is required for a quantized index")
+
+        texts = list(texts)
+        ids = ids or [str(i) for i in range(len(texts))]
+        metadatas = metadatas or [{} for _ in texts]
+        vectors = np.asarray(embedding.embed_documents(texts), dtype=np.float32)
+
+        batches = [(ids, texts, metadatas, vectors)] if texts else []
+        write_quantized_index(persist_path, batches, len(texts), dtype)
+        return cls(persist_path, embedding)
@@ -3,113 +3,860 @@ RAG pipeline for question answering
 Handles retrieval and generation with citations
 """
 
+import asyncio
 import os
-from typing import Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 from langchain_community.vectorstores import Chroma
-from langchain_openai import ChatOpenAI
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
 
+from src.bm25 import BM25Index, reciprocal_rank_fusion
+from src.clients import CHAT_MODEL, embedding_model_name, get_chat_model
+from src.context_packer import count_tokens, pack_context
+from src.embedding_cache import CachedEmbeddings
+from src.metrics import StageTimer, registry
+from src.scope_gate import (
+    OUT_OF_SCOPE_ANSWER,
+    QUERY_RELEVANCE_KEY,
+    RELEVANCE_KEY,
+    is_out_of_scope,
+    load_scope_threshold
+)
+from src.semantic_cache import SemanticCache
+from src.vector_store import count_vectors, similarity_search_with_scores
 
-def rag_answer(
+
+# Candidates per returned chunk taken from each retriever before fusion
+HYBRID_CANDIDATES = 3
+
+NO_RESULTS_ANSWER = "I couldn't find relevant information in our policy documents to answer this question."
+
+PROMPT_TEMPLATE = """You are a helpful assistant that answers questions about company policies.
+
+Use ONLY the information provided in the context below to answer the question.
+
+IMPORTANT RULES:
+1. If the answer is not in the context, say "{refusal}"
+2. Always cite which policy document(s) your answer comes from using the source names provided
+3. Be concise but complete
+4. Use bullet points for lists when appropriate
+5. Include specific numbers, dates, and details when present in the context
+
+CONTEXT:
+{context}
+
+QUESTION: {question}
+
+ANSWER:"""
+
+registry.describe("rag_stage_seconds", "Wall time of each RAG pipeline stage")
+registry.describe("rag_time_to_first_token_seconds", "Time until the first streamed answer token")
+registry.describe("rag_prompt_tokens", "Prompt tokens sent per LLM call")
+registry.describe("rag_completion_tokens", "Completion tokens received per LLM call")
+registry.describe("rag_context_tokens", "Retrieved-context tokens sent per LLM call after packing")
+registry.describe("rag_tokens_total", "LLM tokens by kind")
+registry.describe("rag_requests_total", "Answered questions by outcome")
+
+
+def _get_llm(llm: Optional[BaseChatModel], temperature: float) -> BaseChatModel:
+    """Return the given chat model or the shared gpt-3.5-turbo client"""
+    if llm is not None:
+        return llm
+    
+    return get_chat_model(CHAT_MODEL, temperature=temperature)
+
+
+def _query_embedder(vectorstore: Chroma) -> Embeddings:
+    """Embeddings client for questions, bypassing the chunk embedding cache"""
+    embeddings = vectorstore.embeddings
+    if isinstance(embeddings, CachedEmbeddings):
+        return embeddings.embeddings
+    return embeddings
+
+
+def _vector_search(vectorstore: Chroma, embedding: List[float], k: int) -> List[Document]:
+    """Vector hits carrying their cosine similarity as relevance_score metadata"""
+    docs = []
+    for doc, score in similarity_search_with_scores(vectorstore, embedding, k):
+        doc.metadata[RELEVANCE_KEY] = score
+        docs.append(doc)
+    return docs
+
+
+def search_chunks(
     vectorstore: Chroma,
+    embedding: List[float],
     question: str,
     k: int = 4,
-    temperature: float = 0
-) -> Dict:
+    keyword_index: Optional[BM25Index] = None
+) -> List[Document]:
     """
-    Answer question using RAG pipeline
+    Find the k best chunks for an embedded question
+    
+    With a keyword index, the top HYBRID_CANDIDATES * k vector and BM25
+    hits are merged by reciprocal-rank fusion, so chunks matching exact
+    terms ("401k", "per diem", dollar limits) make the cut at small k.
     
     Args:
-        vectorstore: ChromaDB vector store
+        vectorstore: Vector store to search
+        embedding: Question embedding
+        question: User question, matched against the keyword index
+        k: Number of chunks to return
+        keyword_index: BM25 index over the same chunks (vector search only if None)
+        
+    Returns:
+        Up to k chunks, best first; vector hits carry relevance_score
+        metadata, and after fusion every chunk carries the best vector
+        score as query_relevance for the out-of-scope gate
+    """
+    if keyword_index is None:
+        return _vector_search(vectorstore, embedding, k)
+    
+    candidates = k * HYBRID_CANDIDATES
+    vector_docs = _vector_search(vectorstore, embedding, candidates)
+    keyword_docs = [doc for doc, _ in keyword_index.search(question, candidates)]
+    fused = reciprocal_rank_fusion([vector_docs, keyword_docs], k=k)
+    
+    # Gate on the raw vector ranking: the best vector hit may not survive fusion
+    if vector_docs:
+        best = vector_docs[0].metadata[RELEVANCE_KEY]
+        for doc in fused:
+            doc.metadata[QUERY_RELEVANCE_KEY] = best
+    return fused
+
+
+def retrieve(
+    vectorstore: Chroma,
+    question: str,
+    k: int = 4,
+    timer: Optional[StageTimer] = None,
+    keyword_index: Optional[BM25Index] = None
+) -> Tuple[List[float], List[Document]]:
+    """
+    Embed the question once and fetch the k best chunks
+    
+    Args:
+        vectorstore: Vector store to search
         question: User question
         k: Number of chunks to retrieve
-        temperature: LLM temperature (0 = deterministic)
+        timer: Records the "embed" and "search" stages when given
+        keyword_index: BM25 index fused with the vector results when given
         
     Returns:
-        Dictionary with answer, sources, and metadata
+        Tuple of (question embedding, retrieved chunks)
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not found in environment variables")
+    timer = timer or StageTimer()
     
-    # Step 1: Retrieve relevant chunks
-    retrieved_docs = vectorstore.similarity_search(question, k=k)
+    with timer.stage("embed"):
+        embedding = _query_embedder(vectorstore).embed_query(question)
     
-    if not retrieved_docs:
-        return {
-            "question": question,
-            "answer": "I couldn't find relevant information in our policy documents to answer this question.",
-            "sources": [],
-            "chunks_retrieved": 0
-        }
-    
-    # Step 2: Build context
+    with timer.stage("search"):
+        retrieved_docs = search_chunks(vectorstore, embedding, question, k, keyword_index)
+    
+    return embedding, retrieved_docs
+
+
+async def aretrieve(
+    vectorstore: Chroma,
+    question: str,
+    k: int = 4,
+    timer: Optional[StageTimer] = None,
+    keyword_index: Optional[BM25Index] = None
+) -> Tuple[List[float], List[Document]]:
+    """Async counterpart of retrieve; the search runs in a worker thread"""
+    timer = timer or StageTimer()
+    
+    with timer.stage("embed"):
+        embedding = await _query_embedder(vectorstore).aembed_query(question)
+    
+    with timer.stage("search"):
+        retrieved_docs = await asyncio.to_thread(
+            search_chunks, vectorstore, embedding, question, k, keyword_index
+        )
+    
+    return embedding, retrieved_docs
+
+
+def chunk_keys(docs: List[Document]) -> List[str]:
+    """Identify retrieved chunks by chunk_id, falling back to source and content"""
+    return [
+        doc.metadata.get("chunk_id")
+        or f"{doc.metadata.get('source', 'Unknown')}:{hash(doc.page_content)}"
+        for doc in docs
+    ]
+
+
+def _cached_result(result: Dict, question: str) -> Dict:
+    """Adapt a cached result to the question being asked"""
+    result["question"] = question
+    result["cached"] = True
+    return result
+
+
+def build_context(docs: List[Document]) -> Tuple[str, List[Dict]]:
+    """
+    Format retrieved chunks as numbered, source-labelled context
+    
+    Args:
+        docs: Retrieved chunks
+        
+    Returns:
+        Tuple of (context text, per-chunk source entries)
+    """
     context_parts = []
     sources = []
     
-    for i, doc in enumerate(retrieved_docs):
+    for i, doc in enumerate(docs):
         source_name = doc.metadata.get('source', 'Unknown')
         policy_name = doc.metadata.get('policy_name', source_name)
         
+        # Heading path of chunks from the markdown chunker
+        label = source_name
+        if doc.metadata.get('section'):
+            label = f"{source_name} - {doc.metadata['section']}"
+        
         context_parts.append(
-            f"[Source {i+1}: {source_name}]\n{doc.page_content}"
+            f"[Source {i+1}: {label}]\n{doc.page_content}"
         )
         sources.append({
             "file": source_name,
             "policy": policy_name
         })
     
-    context = "\n\n".join(context_parts)
-    
-    # Step 3: Create prompt
-    prompt = f"""You are a helpful assistant that answers questions about company policies.
+    return "\n\n".join(context_parts), sources
 
-Use ONLY the information provided in the context below to answer the question.
-
-IMPORTANT RULES:
-1. If the answer is not in the context, say "I can only answer questions about our company policies, and I don't have information about that in our policy documents."
-2. Always cite which policy document(s) your answer comes from using the source names provided
-3. Be concise but complete
-4. Use bullet points for lists when appropriate
-5. Include specific numbers, dates, and details when present in the context
 
-CONTEXT:
-{context}
+def build_prompt(context: str, question: str) -> str:
+    """Fill the policy QA prompt with context and question"""
+    return PROMPT_TEMPLATE.format(context=context, question=question, refusal=OUT_OF_SCOPE_ANSWER)
 
-QUESTION: {question}
 
-ANSWER:"""
-    
-    # Step 4: Generate answer
-    llm = ChatOpenAI(
-        model="gpt-3.5-turbo",
-        temperature=temperature,
-        openai_api_key=api_key
-    )
+def prepare_prompt(question: str, docs: List[Document]) -> Tuple[str, List[Dict], int]:
+    """
+    Pack retrieved chunks into the token budget and build the prompt
     
-    try:
-        response = llm.invoke(prompt).content
-    except Exception as e:
-        return {
-            "question": question,
-            "answer": f"Error generating answer: {str(e)}",
-            "sources": sources,
-            "chunks_retrieved": len(retrieved_docs)
-        }
-    
-    # Extract unique sources
-    unique_sources = []
+    Args:
+        question: User question
+        docs: Retrieved chunks, most relevant first
+        
+    Returns:
+        Tuple of (prompt, per-chunk source entries, context tokens sent)
+    """
+    packed, _ = pack_context(docs)
+    context, sources = build_context(packed)
+    return build_prompt(context, question), sources, count_tokens(context)
+
+
+def unique_sources(sources: List[Dict]) -> List[Dict]:
+    """Drop repeated source files, keeping first-seen order"""
+    unique = []
     seen = set()
     for src in sources:
         if src["file"] not in seen:
-            unique_sources.append(src)
+            unique.append(src)
             seen.add(src["file"])
+    return unique
+
+
+def _no_results(question: str) -> Dict:
+    return {
+        "question": question,
+        "answer": NO_RESULTS_ANSWER,
+        "sources": [],
+        "chunks_retrieved": 0
+    }
+
+
+def _out_of_scope(question: str, chunks: int) -> Dict:
+    return {
+        "question": question,
+        "answer": OUT_OF_SCOPE_ANSWER,
+        "sources": [],
+        "chunks_retrieved": chunks,
+        "out_of_scope": True
+    }
+
+
+def _error_result(question: str, error: Exception, sources: List[Dict], chunks: int) -> Dict:
+    return {
+        "question": question,
+        "answer": f"Error generating answer: {str(error)}",
+        "sources": sources,
+        "chunks_retrieved": chunks
+    }
+
+
+def _lookup_cached(
+    question: str,
+    embedding: List[float],
+    retrieved_docs: List[Document],
+    cache: Optional[SemanticCache],
+    index_version: Optional[str],
+    timer: StageTimer
+) -> Optional[Dict]:
+    """Cached answer for a reworded question that hit the same chunks"""
+    if cache is None:
+        return None
+    with timer.stage("cache"):
+        cached = cache.lookup(embedding, chunk_keys(retrieved_docs), index_version)
+    return _cached_result(cached, question) if cached is not None else None
+
+
+def _early_answer(
+    question: str,
+    embedding: List[float],
+    retrieved_docs: List[Document],
+    cache: Optional[SemanticCache],
+    index_version: Optional[str],
+    timer: StageTimer
+) -> Tuple[Optional[Dict], str]:
+    """
+    Answer that needs no LLM call, if any
     
+    Returns:
+        Tuple of (result or None, outcome): no results, a question no
+        chunk is relevant enough to (out of scope), or a cached answer
+    """
+    if not retrieved_docs:
+        return _no_results(question), "no_results"
+    if is_out_of_scope(retrieved_docs, load_scope_threshold()):
+        return _out_of_scope(question, len(retrieved_docs)), "out_of_scope"
+    return _lookup_cached(question, embedding, retrieved_docs, cache, index_version, timer), "cached"
+
+
+def _usage_tokens(usage: Optional[Dict]) -> Optional[Dict]:
+    """Prompt/completion token counts from LangChain usage metadata"""
+    if not usage:
+        return None
     return {
+        "prompt": usage.get("input_tokens", 0),
+        "completion": usage.get("output_tokens", 0)
+    }
+
+
+def _record(
+    result: Dict,
+    timer: StageTimer,
+    outcome: str,
+    usage: Optional[Dict] = None
+) -> Dict:
+    """Attach outcome, per-stage timings and token counts and feed the metrics registry"""
+    result["outcome"] = outcome
+    result["timings"] = timer.finish()
+    for stage, seconds in result["timings"].items():
+        registry.observe("rag_stage_seconds", seconds, {"stage": stage})
+    
+    tokens = _usage_tokens(usage)
+    if tokens:
+        result["tokens"] = tokens
+        registry.observe("rag_prompt_tokens", tokens["prompt"])
+        registry.observe("rag_completion_tokens", tokens["completion"])
+        registry.increment("rag_tokens_total", tokens["prompt"], {"kind": "prompt"})
+        registry.increment("rag_tokens_total", tokens["completion"], {"kind": "completion"})
+    
+    if "context_tokens" in result:
+        registry.observe("rag_context_tokens", result["context_tokens"])
+    
+    if "time_to_first_token" in result:
+        registry.observe("rag_time_to_first_token_seconds", result["time_to_first_token"])
+    
+    registry.increment("rag_requests_total", labels={"outcome": outcome})
+    return result
+
+
+def _finish(
+    question: str,
+    response: str,
+    sources: List[Dict],
+    embedding: List[float],
+    retrieved_docs: List[Document],
+    cache: Optional[SemanticCache],
+    index_version: Optional[str],
+    context_tokens: Optional[int] = None
+) -> Dict:
+    """Assemble the answer dict and remember it in the cache"""
+    result = {
         "question": question,
         "answer": response,
-        "sources": unique_sources,
+        "sources": unique_sources(sources),
         "chunks_retrieved": len(retrieved_docs)
     }
+    
+    if cache is not None:
+        cache.store(embedding, chunk_keys(retrieved_docs), result, index_version)
+    
+    # Added after caching: a cache hit sends no context
+    if context_tokens is not None:
+        result["context_tokens"] = context_tokens
+    
+    return result
+
+
+class _AnswerRun:
+    """
+    One question's path from retrieved chunks to a recorded result
+    
+    Holds the steps shared by the sync and async, streaming and
+    non-streaming entry points (early answers, prompt packing, caching
+    and metrics), so they differ only in how they call the model.
+    """
+    
+    def __init__(
+        self,
+        question: str,
+        embedding: List[float],
+        retrieved_docs: List[Document],
+        cache: Optional[SemanticCache],
+        index_version: Optional[str],
+        timer: StageTimer
+    ):
+        self.question = question
+        self.embedding = embedding
+        self.retrieved_docs = retrieved_docs
+        self.cache = cache
+        self.index_version = index_version
+        self.timer = timer
+        
+        self.prompt = None
+        self.sources: List[Dict] = []
+        self.context_tokens: Optional[int] = None
+        
+        # Streaming state
+        self.parts: List[str] = []
+        self.failed = False
+        self.first_token_at: Optional[float] = None
+        self.usage: Optional[Dict] = None
+        self.llm_start = 0.0
+    
+    def early(self, streaming: bool = False) -> Optional[Dict]:
+        """
+        Recorded result that needs no LLM call, or None once the prompt is ready
+        
+        Args:
+            streaming: Stamp time_to_first_token on an early result
+        """
+        early, outcome = _early_answer(
+            self.question, self.embedding, self.retrieved_docs,
+            self.cache, self.index_version, self.timer
+        )
+        if early is not None:
+            if streaming:
+                early["time_to_first_token"] = self.timer.elapsed()
+            return _record(early, self.timer, outcome)
+        
+        with self.timer.stage("prompt"):
+            # Steps 2-3: Pack context into the token budget and create prompt
+            self.prompt, self.sources, self.context_tokens = prepare_prompt(
+                self.question, self.retrieved_docs
+            )
+        self.llm_start = time.perf_counter()
+        return None
+    
+    def _result(self, answer: str, cache: Optional[SemanticCache]) -> Dict:
+        return _finish(
+            self.question, answer, self.sources, self.embedding, self.retrieved_docs,
+            cache, self.index_version, self.context_tokens
+        )
+    
+    def answered(self, message) -> Dict:
+        """Recorded result for a complete LLM response"""
+        result = self._result(message.content, self.cache)
+        return _record(result, self.timer, "answered", getattr(message, "usage_metadata", None))
+    
+    def error(self, error: Exception) -> Dict:
+        """Recorded result for a failed LLM call"""
+        result = _error_result(self.question, error, self.sources, len(self.retrieved_docs))
+        return _record(result, self.timer, "error")
+    
+    def token(self, chunk) -> Optional[Dict]:
+        """Token event for a streamed chunk (None if it carries no text)"""
+        # With stream_usage the final chunk carries the token counts
+        self.usage = getattr(chunk, "usage_metadata", None) or self.usage
+        if not chunk.content:
+            return None
+        if self.first_token_at is None:
+            self.first_token_at = self.timer.elapsed()
+        self.parts.append(chunk.content)
+        return {"type": "token", "content": chunk.content}
+    
+    def stream_error(self, error: Exception) -> Dict:
+        """Token event reporting a failure mid-stream"""
+        self.failed = True
+        text = ("\n\n" if self.parts else "") + f"Error generating answer: {str(error)}"
+        if self.first_token_at is None:
+            self.first_token_at = self.timer.elapsed()
+        self.parts.append(text)
+        return {"type": "token", "content": text}
+    
+    def stream_result(self) -> Dict:
+        """Final result event of a stream"""
+        # Includes time the consumer spent handling each token
+        self.timer.add("llm", time.perf_counter() - self.llm_start)
+        
+        # A failed answer is never cached
+        result = self._result("".join(self.parts), None if self.failed else self.cache)
+        result["time_to_first_token"] = (
+            self.first_token_at if self.first_token_at is not None else self.timer.elapsed()
+        )
+        _record(result, self.timer, "error" if self.failed else "answered", self.usage)
+        return {"type": "result", "result": result}
+
+
+def _early_events(result: Dict) -> List[Dict]:
+    """An early answer streamed as one token followed by its result"""
+    return [
+        {"type": "token", "content": result["answer"]},
+        {"type": "result", "result": result}
+    ]
+
+
+def _answer_from_chunks(
+    llm: BaseChatModel,
+    question: str,
+    embedding: List[float],
+    retrieved_docs: List[Document],
+    cache: Optional[SemanticCache] = None,
+    index_version: Optional[str] = None,
+    timer: Optional[StageTimer] = None
+) -> Dict:
+    """Steps 2-4 of the pipeline for already retrieved chunks"""
+    run = _AnswerRun(question, embedding, retrieved_docs, cache, index_version, timer or StageTimer())
+    early = run.early()
+    if early is not None:
+        return early
+    
+    # Step 4: Generate answer
+    try:
+        with run.timer.stage("llm"):
+            message = llm.invoke(run.prompt)
+    except Exception as e:
+        return run.error(e)
+    return run.answered(message)
+
+
+async def _answer_from_chunks_async(
+    llm: BaseChatModel,
+    question: str,
+    embedding: List[float],
+    retrieved_docs: List[Document],
+    cache: Optional[SemanticCache] = None,
+    index_version: Optional[str] = None,
+    timer: Optional[StageTimer] = None
+) -> Dict:
+    """Async counterpart of _answer_from_chunks"""
+    run = _AnswerRun(question, embedding, retrieved_docs, cache, index_version, timer or StageTimer())
+    early = run.early()
+    if early is not None:
+        return early
+    
+    try:
+        with run.timer.stage("llm"):
+            message = await llm.ainvoke(run.prompt)
+    except Exception as e:
+        return run.error(e)
+    return run.answered(message)
+
+
+def rag_answer(
+    vectorstore: Chroma,
+    question: str,
+    k: int = 4,
+    temperature: float = 0,
+    llm: Optional[BaseChatModel] = None,
+    cache: Optional[SemanticCache] = None,
+    index_version: Optional[str] = None,
+    keyword_index: Optional[BM25Index] = None
+) -> Dict:
+    """
+    Answer question using RAG pipeline
+    
+    A question no retrieved chunk is relevant enough to (see
+    src.scope_gate) is refused without calling the LLM.
+    
+    Args:
+        vectorstore: ChromaDB vector store
+        question: User question
+        k: Number of chunks to retrieve
+        temperature: LLM temperature (0 = deterministic), used when no llm is given
+        llm: Chat model to reuse (defaults to the shared gpt-3.5-turbo client)
+        cache: Semantic answer cache consulted before calling the LLM
+        index_version: Version of the index, so cached answers expire on reindex
+        keyword_index: BM25 index fused with vector search (hybrid retrieval)
+        
+    Returns:
+        Dictionary with answer, sources, and metadata, including the
+        "outcome" (answered, cached, no_results, out_of_scope or error),
+        per-stage "timings" in seconds and "tokens" used when the model
+        reports them
+    """
+    timer = StageTimer()
+    llm = _get_llm(llm, temperature)
+    
+    # Step 1: Retrieve relevant chunks
+    embedding, retrieved_docs = retrieve(vectorstore, question, k, timer, keyword_index)
+    
+    return _answer_from_chunks(
+        llm, question, embedding, retrieved_docs, cache, index_version, timer
+    )
+
+
+def rag_answer_stream(
+    vectorstore: Chroma,
+    question: str,
+    k: int = 4,
+    temperature: float = 0,
+    llm: Optional[BaseChatModel] = None,
+    cache: Optional[SemanticCache] = None,
+    index_version: Optional[str] = None,
+    keyword_index: Optional[BM25Index] = None
+) -> Iterator[Dict]:
+    """
+    Answer question using RAG pipeline, streaming tokens as they arrive
+    
+    Yields {"type": "token", "content": str} for each piece of the answer,
+    then a single {"type": "result", "result": dict} whose result has the
+    same shape as rag_answer's (including timings and tokens) plus
+    time_to_first_token in seconds.
+    
+    Args:
+        vectorstore: ChromaDB vector store
+        question: User question
+        k: Number of chunks to retrieve
+        temperature: LLM temperature (0 = deterministic), used when no llm is given
+        llm: Chat model to reuse (defaults to the shared gpt-3.5-turbo client)
+        cache: Semantic answer cache consulted before calling the LLM
+        index_version: Version of the index, so cached answers expire on reindex
+        keyword_index: BM25 index fused with vector search (hybrid retrieval)
+        
+    Yields:
+        Token events followed by one result event
+    """
+    timer = StageTimer()
+    llm = _get_llm(llm, temperature)
+    
+    embedding, retrieved_docs = retrieve(vectorstore, question, k, timer, keyword_index)
+    
+    run = _AnswerRun(question, embedding, retrieved_docs, cache, index_version, timer)
+    early = run.early(streaming=True)
+    if early is not None:
+        yield from _early_events(early)
+        return
+    
+    try:
+        for chunk in llm.stream(run.prompt):
+            event = run.token(chunk)
+            if event is not None:
+                yield event
+    except Exception as e:
+        yield run.stream_error(e)
+    
+    yield run.stream_result()
+
+
+async def rag_answer_async(
+    vectorstore: Chroma,
+    question: str,
+    k: int = 4,
+    temperature: float = 0,
+    llm: Optional[BaseChatModel] = None,
+    cache: Optional[SemanticCache] = None,
+    index_version: Optional[str] = None,
+    keyword_index: Optional[BM25Index] = None
+) -> Dict:
+    """
+    Answer question using RAG pipeline without blocking the event loop
+    
+    The question is embedded and answered through the async OpenAI
+    clients; the vector search runs in a worker thread.
+    
+    Args:
+        vectorstore: ChromaDB vector store
+        question: User question
+        k: Number of chunks to retrieve
+        temperature: LLM temperature (0 = deterministic), used when no llm is given
+        llm: Chat model to reuse (defaults to the shared gpt-3.5-turbo client)
+        cache: Semantic answer cache consulted before calling the LLM
+        index_version: Version of the index, so cached answers expire on reindex
+        keyword_index: BM25 index fused with vector search (hybrid retrieval)
+        
+    Returns:
+        Dictionary with answer, sources, and metadata
+    """
+    timer = StageTimer()
+    llm = _get_llm(llm, temperature)
+    
+    embedding, retrieved_docs = await aretrieve(vectorstore, question, k, timer, keyword_index)
+    
+    return await _answer_from_chunks_async(
+        llm, question, embedding, retrieved_docs, cache, index_version, timer
+    )
+
+
+async def rag_answer_astream(
+    vectorstore: Chroma,
+    question: str,
+    k: int = 4,
+    temperature: float = 0,
+    llm: Optional[BaseChatModel] = None,
+    cache: Optional[SemanticCache] = None,
+    index_version: Optional[str] = None,
+    keyword_index: Optional[BM25Index] = None
+) -> AsyncIterator[Dict]:
+    """
+    Async counterpart of rag_answer_stream
+    
+    Yields the same token and result events without blocking the event
+    loop; the vector search runs in a worker thread.
+    
+    Yields:
+        Token events followed by one result event
+    """
+    timer = StageTimer()
+    llm = _get_llm(llm, temperature)
+    
+    embedding, retrieved_docs = await aretrieve(vectorstore, question, k, timer, keyword_index)
+    
+    run = _AnswerRun(question, embedding, retrieved_docs, cache, index_version, timer)
+    early = run.early(streaming=True)
+    if early is not None:
+        for event in _early_events(early):
+            yield event
+        return
+    
+    try:
+        async for chunk in llm.astream(run.prompt):
+            event = run.token(chunk)
+            if event is not None:
+                yield event
+    except Exception as e:
+        yield run.stream_error(e)
+    
+    yield run.stream_result()
+
+
+async def rag_answer_batch_async(
+    vectorstore: Chroma,
+    questions: List[str],
+    k: int = 4,
+    temperature: float = 0,
+    llm: Optional[BaseChatModel] = None,
+    concurrency: int = 8,
+    cache: Optional[SemanticCache] = None,
+    index_version: Optional[str] = None,
+    keyword_index: Optional[BM25Index] = None
+) -> List[Dict]:
+    """
+    Answer many questions concurrently
+    
+    All questions are embedded in a single embeddings request, vector
+    searches run on a thread pool and at most `concurrency` LLM calls are
+    in flight at once.
+    
+    Args:
+        vectorstore: ChromaDB vector store
+        questions: User questions
+        k: Number of chunks to retrieve per question
+        temperature: LLM temperature (0 = deterministic), used when no llm is given
+        llm: Chat model to reuse (defaults to the shared gpt-3.5-turbo client)
+        concurrency: Maximum simultaneous LLM calls
+        cache: Semantic answer cache consulted before calling the LLM
+        index_version: Version of the index, so cached answers expire on reindex
+        keyword_index: BM25 index fused with vector search (hybrid retrieval)
+        
+    Returns:
+        One result dictionary per question, in input order
+    """
+    if not questions:
+        return []
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    
+    llm = _get_llm(llm, temperature)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    timers = [StageTimer() for _ in questions]
+    
+    embed_start = time.perf_counter()
+    embeddings = await _query_embedder(vectorstore).aembed_documents(list(questions))
+    # Every question waited for the whole shared embeddings request
+    for timer in timers:
+        timer.add("embed", time.perf_counter() - embed_start)
+    
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(questions))) as pool:
+        async def answer_one(question: str, embedding: List[float], timer: StageTimer) -> Dict:
+            try:
+                with timer.stage("search"):
+                    retrieved_docs = await loop.run_in_executor(
+                        pool, search_chunks, vectorstore, embedding, question, k, keyword_index
+                    )
+                async with semaphore:
+                    return await _answer_from_chunks_async(
+                        llm, question, embedding, retrieved_docs, cache, index_version, timer
+                    )
+            except Exception as e:
+                return _record(_error_result(question, e, [], 0), timer, "error")
+        
+        return await asyncio.gather(*(
+            answer_one(question, embedding, timer)
+            for question, embedding, timer in zip(questions, embeddings, timers)
+        ))
+
+
+def rag_answer_batch(
+    vectorstore: Chroma,
+    questions: List[str],
+    k: int = 4,
+    temperature: float = 0,
+    llm: Optional[BaseChatModel] = None,
+    concurrency: int = 8,
+    cache: Optional[SemanticCache] = None,
+    index_version: Optional[str] = None,
+    keyword_index: Optional[BM25Index] = None
+) -> List[Dict]:
+    """
+    Synchronous wrapper around rag_answer_batch_async
+    
+    Runs on a long-lived background event loop, so the shared async HTTP
+    connection pool stays usable across calls. Use rag_answer_batch_async
+    directly from code that already runs inside an event loop.
+    
+    Returns:
+        One result dictionary per question, in input order
+    """
+    return _run_coroutine(rag_answer_batch_async(
+        vectorstore,
+        questions,
+        k=k,
+        temperature=temperature,
+        llm=llm,
+        concurrency=concurrency,
+        cache=cache,
+        index_version=index_version,
+        keyword_index=keyword_index
+    ))
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _run_coroutine(coro):
+    """Run a coroutine to completion on the module's background event loop"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="rag-pipeline-loop",
+                daemon=True
+            ).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
 
 
 def check_system_health(vectorstore: Chroma = None) -> Dict:
@@ -130,11 +877,12 @@ def check_system_health(vectorstore: Chroma = None) -> Dict:
     # Check API key
     api_key = os.getenv("OPENAI_API_KEY")
     status["components"]["openai_api"] = "configured" if api_key else "missing"
+    status["components"]["embeddings"] = embedding_model_name()
     
     # Check vector store
     if vectorstore:
         try:
-            count = vectorstore._collection.count()
+            count = count_vectors(vectorstore)
             status["components"]["vector_store"] = {
                 "status": "loaded",
                 "chunks": count
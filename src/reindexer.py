@@ -0,0 +1,104 @@
+"""
+Background reindexing for RAG Policy Assistant
+Builds a new collection off the request path and swaps it in when ready
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class BackgroundReindexer:
+    """
+    Runs one index build at a time on a background thread
+
+    Queries keep using the current collection while the build runs; the
+    publish callback swaps the new one in only after the build (including
+    its validation) succeeded. A failed build leaves the current
+    collection in place and records the error in status().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._status: Dict = {"state": "idle"}
+
+    @property
+    def is_running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def start(
+        self,
+        build: Callable[[Dict], Any],
+        publish: Callable[[Any], None],
+        cleanup: Optional[Callable[[Dict], None]] = None
+    ) -> bool:
+        """
+        Start a build unless one is already running
+
+        Args:
+            build: Builds and validates the new index; receives the status
+                dictionary and may append messages to status["notices"]
+            publish: Makes the built index live (e.g. SharedResource.swap)
+            cleanup: Runs after a successful publish (e.g. garbage
+                collection); its errors go to status["cleanup_error"]
+                without failing the build
+
+        Returns:
+            True if a build was started, False if one was already running
+        """
+        with self._lock:
+            if self.is_running:
+                return False
+
+            self._status = {
+                "state": "running",
+                "started_at": time.time(),
+                "notices": []
+            }
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(build, publish, cleanup, self._status),
+                name="policy-reindex",
+                daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def _run(self, build, publish, cleanup, status: Dict) -> None:
+        try:
+            publish(build(status))
+        except Exception as e:
+            status["state"] = "failed"
+            status["error"] = str(e)
+        else:
+            if cleanup is not None:
+                try:
+                    cleanup(status)
+                except Exception as e:
+                    status["cleanup_error"] = str(e)
+            status["state"] = "succeeded"
+        finally:
+            status["finished_at"] = time.time()
+            status["duration"] = round(status["finished_at"] - status["started_at"], 3)
+
+    def status(self) -> Dict:
+        """
+        State of the most recent build
+
+        Returns:
+            Dictionary with state ("idle", "running", "succeeded" or
+            "failed"), started_at, finished_at, duration, notices and error
+        """
+        status = dict(self._status)
+        if "notices" in status:
+            status["notices"] = list(status["notices"])
+        return status
+
+    def wait(self, timeout: Optional[float] = None) -> Dict:
+        """Block until the current build finishes and return its status"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.status()
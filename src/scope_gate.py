@@ -0,0 +1,291 @@
+"""
+Out-of-scope gate for RAG Policy Assistant
+Refuses questions that match no policy text before any LLM call is made
+"""
+
+import argparse
+import json
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+from langchain_core.documents import Document
+
+from src.clients import embedding_model_name
+
+
+OUT_OF_SCOPE_ANSWER = (
+    "I can only answer questions about our company policies, and I don't have "
+    "information about that in our policy documents."
+)
+
+# Metadata key holding a retrieved chunk's cosine similarity to the question
+RELEVANCE_KEY = "relevance_score"
+
+# Metadata key holding the question's best vector similarity before any
+# fusion, stamped on every retrieved chunk; the gate prefers it because
+# keyword-only hits carry no relevance and fusion can drop the top vector hit
+QUERY_RELEVANCE_KEY = "query_relevance"
+
+PROJECT_ROOT = Path(__file__).parent.parent
+EVAL_QUESTIONS_PATH = str(PROJECT_ROOT / "evaluation" / "eval_questions.json")
+
+# Calibration file kept next to the index it was scored against
+SCOPE_CALIBRATION_FILE = "scope_calibration.json"
+
+# Similarity margin kept below the least relevant in-scope question when
+# the evaluation set does not separate in-scope from out-of-scope questions
+CALIBRATION_MARGIN = 0.02
+
+
+def scope_calibration_path(persist_directory: Optional[str] = None) -> str:
+    """
+    Calibration file of an index directory
+
+    SCOPE_CALIBRATION_PATH overrides it. Without a directory, the served
+    index (VECTOR_STORE_PATH under the project root, as in the app and
+    API) is assumed.
+    """
+    override = os.getenv("SCOPE_CALIBRATION_PATH")
+    if override:
+        return override
+    if persist_directory is None:
+        persist_directory = PROJECT_ROOT / os.getenv("VECTOR_STORE_PATH", "chroma_db")
+    return str(Path(persist_directory) / SCOPE_CALIBRATION_FILE)
+
+
+def top_relevance(docs: List[Document]) -> Optional[float]:
+    """Best cosine similarity of the question to the index (None if none was scored)"""
+    scores = [doc.metadata[QUERY_RELEVANCE_KEY] for doc in docs if QUERY_RELEVANCE_KEY in doc.metadata]
+    if not scores:
+        scores = [doc.metadata[RELEVANCE_KEY] for doc in docs if RELEVANCE_KEY in doc.metadata]
+    return max(scores) if scores else None
+
+
+def is_out_of_scope(docs: List[Document], threshold: Optional[float]) -> bool:
+    """True if no retrieved chunk reaches the relevance threshold"""
+    if threshold is None:
+        return False
+    score = top_relevance(docs)
+    return score is not None and score < threshold
+
+
+def calibrate_threshold(
+    in_scope_scores: List[float],
+    out_of_scope_scores: List[float],
+    margin: float = CALIBRATION_MARGIN
+) -> Dict:
+    """
+    Choose a relevance threshold from evaluation questions
+
+    The threshold sits halfway between the two groups when they separate,
+    otherwise `margin` below the least relevant in-scope question, so the
+    gate never refuses a question the evaluation set expects answered;
+    out-of-scope questions above it still reach the LLM, which refuses them.
+
+    Args:
+        in_scope_scores: Top relevance of each in-scope question
+        out_of_scope_scores: Top relevance of each out-of-scope question
+        margin: Similarity margin used when the groups overlap
+
+    Returns:
+        Dictionary with threshold, in_scope_min, out_of_scope_max,
+        separable and out_of_scope_refused (share refused by the gate)
+    """
+    if not in_scope_scores:
+        raise ValueError("Calibration needs at least one in-scope question")
+
+    in_scope_min = min(in_scope_scores)
+    out_of_scope_max = max(out_of_scope_scores) if out_of_scope_scores else None
+    separable = out_of_scope_max is not None and out_of_scope_max < in_scope_min
+
+    if separable:
+        threshold = (in_scope_min + out_of_scope_max) / 2
+    else:
+        threshold = in_scope_min - margin
+
+    refused = sum(1 for score in out_of_scope_scores if score < threshold)
+    return {
+        "threshold": round(threshold, 4),
+        "in_scope_min": round(in_scope_min, 4),
+        "out_of_scope_max": round(out_of_scope_max, 4) if out_of_scope_max is not None else None,
+        "separable": separable,
+        "out_of_scope_refused": round(refused / len(out_of_scope_scores), 3) if out_of_scope_scores else 0.0
+    }
+
+
+@lru_cache(maxsize=4)
+def load_scope_threshold(
+    path: Optional[str] = None,
+    embedding_model: Optional[str] = None
+) -> Optional[float]:
+    """
+    Relevance threshold below which questions are refused without an LLM call
+
+    SCOPE_THRESHOLD overrides the calibration file. A calibration made
+    with a different embedding model is ignored, as its scores are not
+    comparable. Read once per process; a calibration made in-process
+    (calibrate_vector_store) is picked up at once, others need a restart.
+
+    Args:
+        path: Calibration file (defaults to scope_calibration_path())
+        embedding_model: Model questions are embedded with (defaults to
+            the configured embedding model)
+
+    Returns:
+        Threshold, or None (gate disabled) when uncalibrated
+    """
+    override = os.getenv("SCOPE_THRESHOLD")
+    if override:
+        return float(override)
+
+    calibration_path = Path(path or scope_calibration_path())
+    if not calibration_path.exists():
+        return None
+
+    with open(calibration_path, 'r', encoding='utf-8') as f:
+        calibration = json.load(f)
+
+    embedding_model = embedding_model or embedding_model_name()
+    if calibration.get("embedding_model") != embedding_model:
+        print(
+            f"Ignoring scope calibration for {calibration.get('embedding_model')}; "
+            f"questions are embedded with {embedding_model}"
+        )
+        return None
+    return calibration["threshold"]
+
+
+def calibrate_vector_store(
+    vectorstore,
+    output_path: str,
+    questions_path: str = EVAL_QUESTIONS_PATH
+) -> Dict:
+    """
+    Score the evaluation questions against a vector store and save a threshold
+
+    Args:
+        vectorstore: Store to score the questions against
+        output_path: Calibration file read by load_scope_threshold
+        questions_path: JSON file with "in_scope" and "out_of_scope" questions
+
+    Returns:
+        Calibration dictionary as written
+    """
+    from src.embedding_cache import CachedEmbeddings
+    from src.vector_store import similarity_search_with_scores
+
+    with open(questions_path, 'r', encoding='utf-8') as f:
+        questions = json.load(f)
+    in_scope = [item["question"] for item in questions["in_scope"]]
+    out_of_scope = list(questions["out_of_scope"])
+
+    embeddings = vectorstore.embeddings
+    # Questions must not end up in the chunk embedding cache
+    if isinstance(embeddings, CachedEmbeddings):
+        embeddings = embeddings.embeddings
+
+    vectors = embeddings.embed_documents(in_scope + out_of_scope)
+    scores = []
+    for vector in vectors:
+        hits = similarity_search_with_scores(vectorstore, vector, k=1)
+        scores.append(hits[0][1] if hits else 0.0)
+
+    calibration = calibrate_threshold(scores[:len(in_scope)], scores[len(in_scope):])
+    calibration.update({
+        "embedding_model": embedding_model_name(embeddings),
+        "questions": {"in_scope": len(in_scope), "out_of_scope": len(out_of_scope)},
+        "calibrated_at": time.strftime("%Y-%m-%d")
+    })
+
+    output = Path(output_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(calibration, f, indent=2)
+
+    # Let this process use the new threshold right away
+    load_scope_threshold.cache_clear()
+    return calibration
+
+
+def calibrate(
+    persist_directory: str,
+    questions_path: str = EVAL_QUESTIONS_PATH,
+    output_path: Optional[str] = None
+) -> Dict:
+    """
+    Score the evaluation questions against the live index and save a threshold
+
+    Args:
+        persist_directory: Directory holding the vector store and manifest
+        questions_path: JSON file with "in_scope" and "out_of_scope" questions
+        output_path: Calibration file read by load_scope_threshold
+            (defaults to the one in persist_directory)
+
+    Returns:
+        Calibration dictionary as written
+    """
+    from src.vector_store import load_indexed_vector_store
+
+    vectorstore, _ = load_indexed_vector_store(persist_directory)
+    output_path = output_path or scope_calibration_path(persist_directory)
+    return calibrate_vector_store(vectorstore, output_path, questions_path)
+
+
+def ensure_calibration(
+    vectorstore,
+    output_path: str,
+    questions_path: str = EVAL_QUESTIONS_PATH
+) -> Optional[Dict]:
+    """
+    Calibrate against a freshly built store unless its embedding model has a calibration
+
+    Without a calibration the gate is disabled, so index builds call this
+    to turn it on by default. An existing calibration for the same model
+    is kept; rerun `python -m src.scope_gate` after changing the policies.
+
+    Args:
+        vectorstore: Store to score the questions against
+        output_path: Calibration file read by load_scope_threshold
+        questions_path: JSON file with "in_scope" and "out_of_scope" questions
+
+    Returns:
+        New calibration dictionary, or None if none was needed or no
+        evaluation questions exist
+    """
+    if not Path(questions_path).exists():
+        return None
+
+    calibration_path = Path(output_path)
+    if calibration_path.exists():
+        with open(calibration_path, 'r', encoding='utf-8') as f:
+            calibration = json.load(f)
+        if calibration.get("embedding_model") == embedding_model_name(vectorstore.embeddings):
+            return None
+
+    return calibrate_vector_store(vectorstore, output_path, questions_path)
+
+
+def main() -> None:
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Calibrate the out-of-scope gate")
+    parser.add_argument("--persist-dir", default=os.getenv("VECTOR_STORE_PATH", "chroma_db"))
+    parser.add_argument("--questions", default=EVAL_QUESTIONS_PATH)
+    parser.add_argument("--output", help="Calibration file (default: inside --persist-dir)")
+    args = parser.parse_args()
+
+    output = args.output or scope_calibration_path(args.persist_dir)
+    calibration = calibrate(args.persist_dir, args.questions, output)
+    print(f"Threshold: {calibration['threshold']} (saved to {output})")
+    print(
+        f"Least relevant in-scope question: {calibration['in_scope_min']}, "
+        f"most relevant out-of-scope question: {calibration['out_of_scope_max']}"
+    )
+    print(f"Out-of-scope questions refused without an LLM call: {calibration['out_of_scope_refused']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Semantic answer cache for RAG Policy Assistant
+Reuses answers for reworded questions that retrieve the same policy chunks
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+
+class SemanticCache:
+    """
+    LRU/TTL cache of answers keyed by question embedding
+
+    A cached answer is returned only when the new question's embedding is
+    at least `threshold` cosine-similar to a cached question AND retrieval
+    returned exactly the same chunk set, so a paraphrase that lands on
+    different policy text is always answered fresh. All entries are dropped
+    when the index version changes.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600
+    ):
+        """
+        Args:
+            threshold: Minimum cosine similarity between questions
+            max_entries: Entries kept before least recently used are evicted
+            ttl_seconds: Age after which an entry is no longer served
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()
+        self._next_id = 0
+        self._index_version = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: Iterable[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _check_version(self, index_version: Optional[str]) -> None:
+        # Caller holds the lock
+        if index_version != self._index_version:
+            self._entries.clear()
+            self._index_version = index_version
+
+    def _expire(self, now: float) -> None:
+        # Caller holds the lock
+        expired = [
+            entry_id for entry_id, entry in self._entries.items()
+            if now - entry["created_at"] > self.ttl_seconds
+        ]
+        for entry_id in expired:
+            del self._entries[entry_id]
+
+    def lookup(
+        self,
+        embedding: List[float],
+        chunk_ids: Iterable[str],
+        index_version: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Find a cached answer for a semantically equivalent question
+
+        Args:
+            embedding: Embedding of the new question
+            chunk_ids: IDs of the chunks retrieved for the new question
+            index_version: Version of the index the chunks came from
+
+        Returns:
+            Copy of the cached result, or None on a miss
+        """
+        query = self._normalize(embedding)
+        chunk_set = frozenset(chunk_ids)
+
+        with self._lock:
+            self._check_version(index_version)
+            self._expire(time.monotonic())
+
+            best_id = None
+            best_score = self.threshold
+            for entry_id, entry in self._entries.items():
+                if entry["chunk_ids"] != chunk_set:
+                    continue
+                score = float(np.dot(entry["embedding"], query))
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            result = dict(self._entries[best_id]["result"])
+
+        result["cache_similarity"] = round(best_score, 4)
+        return result
+
+    def store(
+        self,
+        embedding: List[float],
+        chunk_ids: Iterable[str],
+        result: Dict,
+        index_version: Optional[str] = None
+    ) -> None:
+        """
+        Cache an answer
+
+        Args:
+            embedding: Embedding of the question
+            chunk_ids: IDs of the chunks the answer was generated from
+            result: rag_answer result to serve for equivalent questions
+            index_version: Version of the index the chunks came from
+        """
+        entry = {
+            "embedding": self._normalize(embedding),
+            "chunk_ids": frozenset(chunk_ids),
+            "result": dict(result),
+            "created_at": time.monotonic()
+        }
+
+        with self._lock:
+            self._check_version(index_version)
+            self._entries[self._next_id] = entry
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached answer"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """
+        Cache statistics
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and entries
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": len(self._entries)
+        }
@@ -0,0 +1,125 @@
+"""
+Process-wide shared resources for RAG Policy Assistant
+Vector store, embeddings and chat clients reused across sessions and threads
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from langchain_openai import ChatOpenAI
+
+from src.bm25 import BM25Index
+from src.clients import CHAT_MODEL, get_chat_model, get_embedding_client
+from src.index_manifest import index_version
+from src.reindexer import BackgroundReindexer
+from src.semantic_cache import SemanticCache
+from src.singleflight import SingleFlight
+
+
+class SharedResource:
+    """
+    Lazily created value shared by every thread in the process
+
+    The first caller of get() runs the factory while concurrent callers
+    wait on the lock; afterwards reads are lock-free. swap() replaces the
+    value in a single reference assignment, so readers always see either
+    the old or the new object, never a half-built one.
+    """
+
+    def __init__(self, factory: Optional[Callable[[], Any]] = None):
+        self._factory = factory
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self, factory: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Return the shared value, creating it on first use
+
+        Args:
+            factory: Overrides the default factory for this initialization
+
+        Returns:
+            The shared value
+        """
+        value = self._value
+        if value is not None:
+            return value
+
+        with self._lock:
+            if self._value is None:
+                create = factory or self._factory
+                if create is None:
+                    raise ValueError("Shared resource has no factory")
+                self._value = create()
+            return self._value
+
+    def peek(self) -> Any:
+        """Return the current value without creating it"""
+        return self._value
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._value is not None
+
+    def swap(self, value: Any) -> Any:
+        """
+        Atomically replace the shared value
+
+        Returns:
+            The previous value (None if it was never created)
+        """
+        with self._lock:
+            previous = self._value
+            self._value = value
+        return previous
+
+    def clear(self) -> Any:
+        """Drop the shared value so the next get() recreates it"""
+        return self.swap(None)
+
+
+class ServingIndex(NamedTuple):
+    """
+    Everything a query needs from one published index
+
+    Published in a single swap, so a reader never pairs a store with the
+    keyword index or version of another build.
+    """
+    vectorstore: VectorStore
+    # BM25 index over the store's chunks (None: vector search only)
+    keyword_index: Optional[BM25Index]
+    # Manifest the store was built from
+    manifest: Optional[Dict]
+
+    @property
+    def version(self) -> Optional[str]:
+        """Index version keying cached and coalesced answers"""
+        return index_version(self.manifest)
+
+
+# ServingIndex answering this process's questions
+shared_index = SharedResource()
+
+# Concurrent identical questions from any session share one answer
+shared_flights = SingleFlight()
+
+# At most one background rebuild of the shared store at a time
+shared_reindexer = BackgroundReindexer()
+
+shared_answer_cache = SemanticCache(
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+    max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "512")),
+    ttl_seconds=float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+)
+
+
+def get_shared_embeddings() -> Embeddings:
+    """Embeddings client of the configured provider, shared by the whole process"""
+    return get_embedding_client()
+
+
+def get_shared_chat_model() -> ChatOpenAI:
+    """Deterministic (temperature 0) chat client shared by the whole process"""
+    return get_chat_model(CHAT_MODEL, temperature=0)
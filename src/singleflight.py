@@ -0,0 +1,281 @@
+"""
+Request coalescing for RAG Policy Assistant
+Identical in-flight questions share one embedding, search and LLM call
+"""
+
+import asyncio
+import re
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from src.metrics import registry
+
+
+registry.describe("rag_coalesced_requests_total", "Questions answered by joining an identical in-flight request")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase a question and drop spacing and trailing punctuation differences"""
+    return re.sub(r"\s+", " ", question).strip().rstrip("?!. ").lower()
+
+
+def flight_key(question: str, index_version: Optional[str], k: int = 4) -> Tuple:
+    """Requests with equal keys get the same answer and can share one computation"""
+    return (normalize_question(question), index_version, k)
+
+
+def follower_result(result: Dict, question: str) -> Dict:
+    """Copy of a shared result adapted to the question one follower asked"""
+    result = dict(result)
+    result["question"] = question
+    result["coalesced"] = True
+    return result
+
+
+def _shared_value(value: Any, shared: bool, question: Optional[str]) -> Any:
+    """A flight's value as one caller sees it: followers get their own copy"""
+    if shared and question is not None:
+        return follower_result(value, question)
+    return value
+
+
+def _follower_event(event: Dict, question: str) -> Dict:
+    if event["type"] == "result":
+        return {"type": "result", "result": follower_result(event["result"], question)}
+    return event
+
+
+class _Flight:
+    """One in-flight computation: its events so far, or its final value"""
+
+    def __init__(self):
+        self.events: List[Dict] = []
+        self.task: Optional[asyncio.Future] = None
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+
+
+class SingleFlight:
+    """
+    Thread-level request coalescing
+
+    The first caller for a key (the leader) starts the computation on a
+    background thread; callers arriving with the same key while it runs
+    (followers) wait for it instead of starting their own. The flight is
+    forgotten as soon as it finishes, so later callers compute afresh (and
+    may then hit the semantic cache). do() and stream() flights never
+    join each other, even for equal keys.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable, produce: Callable[[_Flight], None]) -> Tuple[_Flight, bool]:
+        """Return the running flight for key, or start one; True if joined"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                registry.increment("rag_coalesced_requests_total", labels={"mode": "thread"})
+                return flight, True
+
+            flight = self._flights[key] = _Flight()
+            self.leaders += 1
+
+        def run():
+            try:
+                produce(flight)
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    flight.done = True
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
+                    self._changed.notify_all()
+
+        # Runs to completion even if the leader's own caller goes away
+        threading.Thread(target=run, name="singleflight", daemon=True).start()
+        return flight, False
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        question: Optional[str] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Coalescing key (see flight_key)
+            fn: Computation to share
+            question: Question asked by this caller; when given, followers
+                get a copy of the result dict marked "coalesced" carrying it
+
+        Returns:
+            Tuple of (fn's result, True if it was shared from another caller);
+            fn's exception is raised in every caller
+        """
+        def produce(flight: _Flight) -> None:
+            flight.value = fn()
+
+        flight, shared = self._join(("value", key), produce)
+        with self._lock:
+            self._changed.wait_for(lambda: flight.done)
+        if flight.error is not None:
+            raise flight.error
+        return _shared_value(flight.value, shared, question), shared
+
+    def stream(self, key: Hashable, fn: Callable[[], Iterator[Dict]], question: str) -> Iterator[Dict]:
+        """
+        Share one token/result event stream between concurrent callers
+
+        Followers first receive the events the leader already produced,
+        then the rest as they arrive; their result event is a copy marked
+        "coalesced" carrying their own question.
+
+        Args:
+            key: Coalescing key (see flight_key)
+            fn: Starts the event stream (e.g. a rag_answer_stream call)
+            question: Question asked by this caller
+
+        Yields:
+            Token events followed by one result event
+        """
+        def produce(flight: _Flight) -> None:
+            for event in fn():
+                with self._lock:
+                    flight.events.append(event)
+                    self._changed.notify_all()
+
+        flight, shared = self._join(("stream", key), produce)
+        position = 0
+        while True:
+            with self._lock:
+                self._changed.wait_for(lambda: position < len(flight.events) or flight.done)
+                pending = flight.events[position:]
+                finished = flight.done
+            for event in pending:
+                yield _follower_event(event, question) if shared else event
+            position += len(pending)
+            if finished and not pending:
+                if flight.error is not None:
+                    raise flight.error
+                return
+
+
+class AsyncSingleFlight:
+    """
+    Event-loop counterpart of SingleFlight for the async HTTP path
+
+    The leader's computation runs as a task, so it finishes (and serves
+    its followers) even if the leading client disconnects. Use one
+    instance per event loop.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._changed: Optional[asyncio.Condition] = None
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    def _join(self, key: Hashable, produce) -> Tuple[_Flight, bool]:
+        # No await between lookup and insert, so no lock is needed
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            registry.increment("rag_coalesced_requests_total", labels={"mode": "async"})
+            return flight, True
+
+        flight = self._flights[key] = _Flight()
+        self.leaders += 1
+        changed = self._condition()
+
+        async def run():
+            try:
+                await produce(flight)
+            except BaseException as e:
+                flight.error = e
+            finally:
+                flight.done = True
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                async with changed:
+                    changed.notify_all()
+
+        # Referenced by the flight so the task is not garbage collected
+        flight.task = asyncio.ensure_future(run())
+        return flight, False
+
+    async def _wait(self, predicate) -> None:
+        changed = self._condition()
+        async with changed:
+            await changed.wait_for(predicate)
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        question: Optional[str] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Await fn() once for all concurrent callers with the same key
+
+        Args:
+            key: Coalescing key (see flight_key)
+            fn: Returns the awaitable to share (e.g. a rag_answer_async call)
+            question: Question asked by this caller (see SingleFlight.do)
+
+        Returns:
+            Tuple of (result, True if it was shared from another caller)
+        """
+        async def produce(flight: _Flight) -> None:
+            flight.value = await fn()
+
+        flight, shared = self._join(("value", key), produce)
+        await self._wait(lambda: flight.done)
+        if flight.error is not None:
+            raise flight.error
+        return _shared_value(flight.value, shared, question), shared
+
+    async def stream(
+        self,
+        key: Hashable,
+        fn: Callable[[], AsyncIterator[Dict]],
+        question: str
+    ) -> AsyncIterator[Dict]:
+        """Async counterpart of SingleFlight.stream"""
+        changed = self._condition()
+
+        async def produce(flight: _Flight) -> None:
+            async for event in fn():
+                flight.events.append(event)
+                async with changed:
+                    changed.notify_all()
+
+        flight, shared = self._join(("stream", key), produce)
+        position = 0
+        while True:
+            await self._wait(lambda: position < len(flight.events) or flight.done)
+            pending = flight.events[position:]
+            finished = flight.done
+            for event in pending:
+                yield _follower_event(event, question) if shared else event
+            position += len(pending)
+            if finished and not pending:
+                if flight.error is not None:
+                    raise flight.error
+                return
@@ -3,19 +3,195 @@ Vector store management for RAG Policy Assistant
 Handles ChromaDB operations and embeddings
 """
 
+import argparse
 import os
-from typing import List
+import re
+import shutil
+import socket
+import sqlite3
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 from pathlib import Path
+import chromadb
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain_community.vectorstores import Chroma
 
+from src.bm25 import BM25Index
+from src.clients import embedding_model_name, get_embedding_client
+from src.document_processor import (
+    chunk_documents,
+    load_policy_file,
+    process_policies,
+    resolve_chunk_strategy
+)
+from src.embedding_cache import CachedEmbeddings
+from src.numpy_store import NumpyVectorStore
+from src.quantized_index import QuantizedVectorStore, RowBatch, write_quantized_index
+from src.scope_gate import ensure_calibration, scope_calibration_path
+from src.ingestion import ingest_policies
+from src.index_manifest import (
+    build_manifest,
+    chunk_ids_by_source,
+    diff_files,
+    load_manifest,
+    save_manifest,
+    scan_policy_files
+)
+
+
+EMBEDDING_CACHE_FILE = "embedding_cache.sqlite"
+
+# "chroma" (persistent HNSW) or "numpy" (exact in-memory matrix)
+BACKENDS = ("chroma", "numpy")
+DEFAULT_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "chroma")
+
+VectorStoreType = Union[Chroma, NumpyVectorStore, QuantizedVectorStore]
+
+# Rows read per page when exporting a collection
+EXPORT_BATCH_SIZE = 1000
+
+# Collections kept besides the active one (for rollback and for processes
+# still serving the previous version)
+KEEP_PREVIOUS_COLLECTIONS = int(os.getenv("INDEX_KEEP_PREVIOUS", "1"))
+
+# Leases name the collection each serving process has open; garbage
+# collection never deletes a leased collection. Leases from this host are
+# live while their process runs, leases from other hosts (containers
+# sharing the volume) until they go this many seconds without a refresh.
+LEASE_DIR = ".leases"
+LEASE_TTL_SECONDS = float(os.getenv("INDEX_LEASE_TTL", "600"))
+
+# Per-collection files and directories written next to the Chroma database
+_COLLECTION_ARTIFACT = re.compile(r"^(?P<name>.+)\.(numpy|qindex|bm25\.json)$")
+_SEGMENT_DIR = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+_CHROMA_DB_FILE = "chroma.sqlite3"
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown vector store backend '{backend}'; expected one of {BACKENDS}")
+    return backend
+
+
+def numpy_store_path(persist_directory: str, collection_name: str) -> Path:
+    """Directory holding the .npy matrix and sidecar of a NumPy collection"""
+    return Path(persist_directory) / f"{collection_name}.numpy"
+
+
+def quantized_index_path(persist_directory: str, collection_name: str) -> Path:
+    """Directory holding the memory-mapped quantized export of a collection"""
+    return Path(persist_directory) / f"{collection_name}.qindex"
+
+
+def keyword_index_path(persist_directory: str, collection_name: str) -> Path:
+    """JSON file holding the BM25 keyword index of a collection"""
+    return Path(persist_directory) / f"{collection_name}.bm25.json"
+
+
+def load_keyword_index(
+    persist_directory: str = "./chroma_db",
+    manifest: Optional[Dict] = None
+) -> Optional[BM25Index]:
+    """
+    Load the BM25 index built alongside the manifest's collection
+    
+    Args:
+        persist_directory: Directory holding the vector store and manifest
+        manifest: Already loaded manifest (read from disk if None)
+        
+    Returns:
+        Keyword index, or None if the collection was built without one
+    """
+    manifest = manifest or load_manifest(persist_directory)
+    if manifest is None:
+        return None
+    
+    path = keyword_index_path(persist_directory, manifest["collection_name"])
+    if not path.exists():
+        return None
+    return BM25Index.load(str(path))
+
+
+def count_vectors(vectorstore: VectorStoreType) -> int:
+    """Number of chunks stored in a vector store of any backend"""
+    if isinstance(vectorstore, (NumpyVectorStore, QuantizedVectorStore)):
+        return len(vectorstore)
+    return vectorstore._collection.count()
+
+
+def _chroma_space(vectorstore: Chroma) -> str:
+    """Distance function of a Chroma collection ("l2", "cosine" or "ip")"""
+    collection = vectorstore._collection
+    space = (collection.metadata or {}).get("hnsw:space")
+    if space is None:
+        configuration = getattr(collection, "configuration_json", None) or {}
+        space = (configuration.get("hnsw") or {}).get("space")
+    return space or "l2"
+
+
+def similarity_search_with_scores(
+    vectorstore: VectorStoreType,
+    embedding: List[float],
+    k: int = 4
+) -> List[Tuple[Document, float]]:
+    """
+    k nearest chunks with their cosine similarity, for any backend
+    
+    Chroma distances are converted assuming unit-length embeddings (as
+    OpenAI returns them), so scores are comparable across backends.
+    
+    Args:
+        vectorstore: Vector store to search
+        embedding: Query embedding
+        k: Number of chunks to return
+    
+    Returns:
+        Up to k (chunk, cosine similarity) pairs, best first
+    """
+    if isinstance(vectorstore, (NumpyVectorStore, QuantizedVectorStore)):
+        return vectorstore.similarity_search_by_vector_with_score(embedding, k)
+    
+    hits = vectorstore.similarity_search_by_vector_with_relevance_scores(embedding, k=k)
+    space = _chroma_space(vectorstore)
+    if space in ("cosine", "ip"):
+        return [(doc, 1.0 - distance) for doc, distance in hits]
+    # Squared L2 distance between unit vectors is 2 - 2 * cosine
+    return [(doc, 1.0 - distance / 2.0) for doc, distance in hits]
+
+
+def _default_embeddings() -> Embeddings:
+    """Shared embeddings client of the configured provider"""
+    return get_embedding_client()
+
+
+def _store_embeddings(
+    embeddings: Optional[Embeddings],
+    persist_directory: str,
+    use_embedding_cache: bool
+) -> Embeddings:
+    """Embeddings client for writing chunks, behind the on-disk cache if enabled"""
+    if embeddings is None:
+        embeddings = _default_embeddings()
+    
+    if use_embedding_cache:
+        embeddings = CachedEmbeddings(
+            embeddings,
+            cache_path=str(Path(persist_directory) / EMBEDDING_CACHE_FILE),
+            model=embedding_model_name(embeddings)
+        )
+    return embeddings
+
 
 def create_vector_store(
     chunks: List[Document],
     persist_directory: str = "./chroma_db",
-    collection_name: str = "policy_documents"
-) -> Chroma:
+    collection_name: str = "policy_documents",
+    use_embedding_cache: bool = True,
+    embeddings: Optional[Embeddings] = None,
+    backend: Optional[str] = None
+) -> VectorStoreType:
     """
     Create and persist ChromaDB vector store with embeddings
     
@@ -23,53 +199,144 @@ def create_vector_store(
         chunks: List of document chunks
         persist_directory: Directory to save vector store
         collection_name: Name for the collection
+        use_embedding_cache: Serve unchanged chunks from the on-disk
+            embedding cache instead of re-embedding them
+        embeddings: Embeddings client to use (defaults to the shared registry client)
+        backend: "chroma" or "numpy" (defaults to VECTOR_STORE_BACKEND)
         
     Returns:
-        ChromaDB vector store
+        ChromaDB or NumPy vector store
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not found in environment variables")
+    backend = _resolve_backend(backend)
+    embeddings = _store_embeddings(embeddings, persist_directory, use_embedding_cache)
     
-    # Initialize embeddings
-    embeddings = OpenAIEmbeddings(
-        model="text-embedding-3-small",
-        openai_api_key=api_key
-    )
+    # Create vector store, keyed by stable chunk IDs when available
+    ids = [c.metadata["chunk_id"] for c in chunks if "chunk_id" in c.metadata]
+    if backend == "numpy":
+        vectorstore = NumpyVectorStore.from_documents(
+            documents=chunks,
+            embedding=embeddings,
+            ids=ids if len(ids) == len(chunks) else None,
+            persist_path=str(numpy_store_path(persist_directory, collection_name))
+        )
+    else:
+        vectorstore = Chroma.from_documents(
+            documents=chunks,
+            embedding=embeddings,
+            ids=ids if len(ids) == len(chunks) else None,
+            collection_name=collection_name,
+            persist_directory=persist_directory
+        )
     
-    # Create vector store
-    vectorstore = Chroma.from_documents(
-        documents=chunks,
-        embedding=embeddings,
+    cache_stats = get_embedding_cache_stats(vectorstore)
+    if cache_stats:
+        print(
+            f"Embedding cache: {cache_stats['hits']} hits, "
+            f"{cache_stats['misses']} misses"
+        )
+    
+    return vectorstore
+
+
+def new_vector_store(
+    persist_directory: str = "./chroma_db",
+    collection_name: str = "policy_documents",
+    use_embedding_cache: bool = True,
+    embeddings: Optional[Embeddings] = None,
+    backend: Optional[str] = None
+) -> VectorStoreType:
+    """
+    Create an empty collection to be filled with add_documents
+    
+    An existing collection of the same name is dropped first.
+    
+    Args:
+        persist_directory: Directory to save vector store
+        collection_name: Name for the collection
+        use_embedding_cache: Serve unchanged chunks from the on-disk embedding cache
+        embeddings: Embeddings client to use (defaults to the shared registry client)
+        backend: "chroma" or "numpy" (defaults to VECTOR_STORE_BACKEND)
+        
+    Returns:
+        Empty ChromaDB or NumPy vector store (a NumPy store must be save()d)
+    """
+    backend = _resolve_backend(backend)
+    embeddings = _store_embeddings(embeddings, persist_directory, use_embedding_cache)
+    
+    if backend == "numpy":
+        path = numpy_store_path(persist_directory, collection_name)
+        shutil.rmtree(path, ignore_errors=True)
+        return NumpyVectorStore(embeddings, persist_path=str(path))
+    
+    vectorstore = Chroma(
         collection_name=collection_name,
+        embedding_function=embeddings,
         persist_directory=persist_directory
     )
-    
+    if count_vectors(vectorstore):
+        vectorstore.delete_collection()
+        vectorstore = Chroma(
+            collection_name=collection_name,
+            embedding_function=embeddings,
+            persist_directory=persist_directory
+        )
     return vectorstore
 
 
+def get_embedding_cache_stats(vectorstore: VectorStoreType) -> Optional[Dict]:
+    """
+    Embedding cache hit/miss counts for a vector store
+    
+    Args:
+        vectorstore: Vector store returned by create_vector_store
+        
+    Returns:
+        Cache statistics, or None if the store was built without the cache
+    """
+    embeddings = getattr(vectorstore, "embeddings", None)
+    if isinstance(embeddings, CachedEmbeddings):
+        return embeddings.stats()
+    return None
+
+
+def close_embedding_cache(vectorstore: VectorStoreType) -> None:
+    """
+    Release a store's embedding cache connection once a build or sync is done
+    
+    The cache reopens itself if the store embeds more chunks later.
+    """
+    embeddings = getattr(vectorstore, "embeddings", None)
+    if isinstance(embeddings, CachedEmbeddings):
+        embeddings.close()
+
+
 def load_vector_store(
     persist_directory: str = "./chroma_db",
-    collection_name: str = "policy_documents"
-) -> Chroma:
+    collection_name: str = "policy_documents",
+    embeddings: Optional[Embeddings] = None,
+    backend: Optional[str] = None
+) -> VectorStoreType:
     """
     Load existing vector store from disk
     
     Args:
         persist_directory: Directory where vector store is saved
         collection_name: Name of the collection
+        embeddings: Embeddings client to use (defaults to the shared registry client)
+        backend: "chroma" or "numpy" (defaults to VECTOR_STORE_BACKEND)
         
     Returns:
-        Loaded ChromaDB vector store
+        Loaded ChromaDB or NumPy vector store
     """
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not found in environment variables")
+    backend = _resolve_backend(backend)
+    if embeddings is None:
+        embeddings = _default_embeddings()
     
-    embeddings = OpenAIEmbeddings(
-        model="text-embedding-3-small",
-        openai_api_key=api_key
-    )
+    if backend == "numpy":
+        return NumpyVectorStore.load(
+            str(numpy_store_path(persist_directory, collection_name)),
+            embeddings
+        )
     
     vectorstore = Chroma(
         collection_name=collection_name,
@@ -84,8 +351,10 @@ def get_or_create_vector_store(
     chunks: List[Document] = None,
     persist_directory: str = "./chroma_db",
     collection_name: str = "policy_documents",
-    force_recreate: bool = False
-) -> Chroma:
+    force_recreate: bool = False,
+    embeddings: Optional[Embeddings] = None,
+    backend: Optional[str] = None
+) -> VectorStoreType:
     """
     Get existing vector store or create new one
     
@@ -94,49 +363,60 @@ def get_or_create_vector_store(
         persist_directory: Directory for vector store
         collection_name: Collection name
         force_recreate: Force recreation even if exists
+        embeddings: Embeddings client to use (defaults to the shared registry client)
+        backend: "chroma" or "numpy" (defaults to VECTOR_STORE_BACKEND)
         
     Returns:
-        ChromaDB vector store
+        ChromaDB or NumPy vector store
     """
+    backend = _resolve_backend(backend)
     store_path = Path(persist_directory)
+    if backend == "numpy":
+        store_path = numpy_store_path(persist_directory, collection_name)
     
     # If force recreate, delete existing collection and create new
     if force_recreate:
         if chunks is None:
             raise ValueError("chunks required to create new vector store")
         
+        if backend == "numpy":
+            shutil.rmtree(store_path, ignore_errors=True)
+            return create_vector_store(
+                chunks, persist_directory, collection_name,
+                embeddings=embeddings, backend=backend
+            )
+        
         # Try to delete existing collection
         try:
-            api_key = os.getenv("OPENAI_API_KEY")
-            if api_key:
-                embeddings = OpenAIEmbeddings(
-                    model="text-embedding-3-small",
-                    openai_api_key=api_key
-                )
-                
-                # Try to load and delete existing collection
-                if store_path.exists():
-                    try:
-                        existing_vs = Chroma(
-                            collection_name=collection_name,
-                            embedding_function=embeddings,
-                            persist_directory=persist_directory
-                        )
-                        existing_vs.delete_collection()
-                    except:
-                        # Collection doesn't exist or can't be deleted, that's fine
-                        pass
+            if embeddings is None and os.getenv("OPENAI_API_KEY"):
+                embeddings = _default_embeddings()
+            
+            # Try to load and delete existing collection
+            if embeddings is not None and store_path.exists():
+                try:
+                    existing_vs = Chroma(
+                        collection_name=collection_name,
+                        embedding_function=embeddings,
+                        persist_directory=persist_directory
+                    )
+                    existing_vs.delete_collection()
+                except:
+                    # Collection doesn't exist or can't be deleted, that's fine
+                    pass
         except:
             # If anything fails, just continue to create new
             pass
         
         # Create new vector store
-        return create_vector_store(chunks, persist_directory, collection_name)
+        return create_vector_store(
+            chunks, persist_directory, collection_name,
+            embeddings=embeddings, backend=backend
+        )
     
     # Check if vector store exists
     if store_path.exists() and not force_recreate:
         try:
-            return load_vector_store(persist_directory, collection_name)
+            return load_vector_store(persist_directory, collection_name, embeddings, backend)
         except Exception as e:
             print(f"Error loading existing store: {e}")
             print("Creating new vector store...")
@@ -145,4 +425,646 @@ def get_or_create_vector_store(
     if chunks is None:
         raise ValueError("chunks required to create new vector store")
     
-    return create_vector_store(chunks, persist_directory, collection_name)
\ No newline at end of file
+    return create_vector_store(
+        chunks, persist_directory, collection_name,
+        embeddings=embeddings, backend=backend
+    )
+
+
+def build_indexed_vector_store(
+    policies_dir: str,
+    persist_directory: str = "./chroma_db",
+    collection_name: str = "policy_documents",
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    embeddings: Optional[Embeddings] = None,
+    backend: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_strategy: Optional[str] = None,
+    calibrate_scope: bool = True
+) -> VectorStoreType:
+    """
+    Build a collection from scratch and make it the active one
+    
+    The manifest is the active-collection pointer: it is only rewritten,
+    atomically, after the new collection passes validate_vector_store, so
+    readers keep using the previous collection until then. A BM25 keyword
+    index (and the quantized export, if the previous collection had one)
+    is written next to the new collection first.
+    
+    Args:
+        policies_dir: Path to policy directory
+        persist_directory: Directory for vector store
+        collection_name: Collection name
+        chunk_size: Chunk size in characters
+        chunk_overlap: Overlap size in characters
+        embeddings: Embeddings client to use (defaults to the shared registry client)
+        backend: "chroma" or "numpy" (defaults to VECTOR_STORE_BACKEND)
+        workers: Ingest with the parallel pipeline on this many processes
+            (see src/ingestion.py) instead of chunking everything up front
+        chunk_strategy: "recursive" or "markdown" (defaults to CHUNK_STRATEGY)
+        calibrate_scope: Calibrate the out-of-scope gate against the new
+            collection if its embedding model has no calibration yet (the
+            calibration is saved in persist_directory)
+        
+    Returns:
+        ChromaDB or NumPy vector store
+    """
+    backend = _resolve_backend(backend)
+    chunk_strategy = resolve_chunk_strategy(chunk_strategy)
+    
+    if workers is None:
+        chunks = process_policies(policies_dir, chunk_size, chunk_overlap, chunk_strategy)
+        vectorstore = get_or_create_vector_store(
+            chunks=chunks,
+            persist_directory=persist_directory,
+            collection_name=collection_name,
+            force_recreate=True,
+            embeddings=embeddings,
+            backend=backend
+        )
+        keyword_index = BM25Index.from_documents(chunks)
+        chunk_ids = chunk_ids_by_source(chunks)
+        probe = chunks[0].page_content if chunks else None
+    else:
+        vectorstore = new_vector_store(
+            persist_directory, collection_name, embeddings=embeddings, backend=backend
+        )
+        keyword_index = BM25Index()
+        probes = []
+        
+        def index_batch(batch: List[Document]) -> None:
+            keyword_index.add_documents(batch)
+            if not probes:
+                probes.append(batch[0].page_content)
+        
+        report = ingest_policies(
+            policies_dir,
+            vectorstore,
+            chunk_size,
+            chunk_overlap,
+            strategy=chunk_strategy,
+            workers=workers,
+            on_batch=index_batch
+        )
+        if isinstance(vectorstore, NumpyVectorStore):
+            vectorstore.save()
+        chunk_ids = report["chunk_ids"]
+        probe = probes[0] if probes else None
+        print(
+            f"Ingested {report['documents']} documents ({report['documents_per_second']}/s), "
+            f"{report['chunks']} chunks ({report['chunks_per_second']}/s) "
+            f"on {report['workers']} workers"
+        )
+    
+    try:
+        validate_vector_store(vectorstore, sum(len(ids) for ids in chunk_ids.values()), probe)
+    except Exception:
+        vectorstore.delete_collection()
+        raise
+    finally:
+        # Every chunk is embedded by now
+        close_embedding_cache(vectorstore)
+    
+    keyword_index.save(str(keyword_index_path(persist_directory, collection_name)))
+    
+    manifest = build_manifest(
+        policies_dir, chunk_ids, collection_name, chunk_size, chunk_overlap,
+        backend, chunk_strategy, embedding_model_name(vectorstore.embeddings)
+    )
+    previous = load_manifest(persist_directory)
+    if previous and previous.get("quantized"):
+        export_quantized_index(
+            vectorstore,
+            str(quantized_index_path(persist_directory, collection_name)),
+            previous["quantized"]["dtype"]
+        )
+        manifest["quantized"] = previous["quantized"]
+    
+    # Flip the active collection
+    save_manifest(persist_directory, manifest)
+    
+    if calibrate_scope:
+        calibration = ensure_calibration(vectorstore, scope_calibration_path(persist_directory))
+        if calibration:
+            print(
+                f"Calibrated the out-of-scope gate: threshold {calibration['threshold']} "
+                f"({calibration['out_of_scope_refused']:.0%} of out-of-scope questions refused)"
+            )
+    
+    return vectorstore
+
+
+def validate_vector_store(
+    vectorstore: VectorStoreType,
+    expected_chunks: int,
+    probe: Optional[str] = None
+) -> None:
+    """
+    Check that a freshly built store holds every chunk and answers queries
+    
+    Args:
+        vectorstore: Newly built vector store
+        expected_chunks: Number of chunks that were written to it
+        probe: Text of one of those chunks, used as a test query
+        
+    Raises:
+        ValueError: If the chunk count differs or a test query finds nothing
+    """
+    count = count_vectors(vectorstore)
+    if count != expected_chunks:
+        raise ValueError(f"New collection holds {count} chunks, expected {expected_chunks}")
+    
+    if probe and not vectorstore.similarity_search(probe, k=1):
+        raise ValueError("Test query against the new collection returned no results")
+
+
+def _check_embedding_model(manifest: Dict, embeddings: Embeddings) -> None:
+    """Raise ValueError if the collection was embedded with another model"""
+    stored = manifest.get("embedding_model")
+    current = embedding_model_name(embeddings)
+    if stored and stored != current:
+        raise ValueError(
+            f"Collection was embedded with {stored}, not {current}; rebuild the vector store first"
+        )
+
+
+def load_indexed_vector_store(
+    persist_directory: str = "./chroma_db",
+    embeddings: Optional[Embeddings] = None,
+    prefer_quantized: bool = False
+) -> Tuple[VectorStoreType, Dict]:
+    """
+    Load the collection recorded in the index manifest
+    
+    Args:
+        persist_directory: Directory holding the vector store and manifest
+        embeddings: Embeddings client to use (defaults to the shared registry client)
+        prefer_quantized: Open the read-only quantized export when the
+            manifest records one
+        
+    Returns:
+        Tuple of (vector store, manifest)
+    """
+    manifest = load_manifest(persist_directory)
+    if manifest is None:
+        raise FileNotFoundError(
+            f"No index manifest in {persist_directory}; build the vector store first"
+        )
+    
+    if embeddings is None:
+        embeddings = _default_embeddings()
+    _check_embedding_model(manifest, embeddings)
+    
+    if prefer_quantized and manifest.get("quantized"):
+        path = quantized_index_path(persist_directory, manifest["collection_name"])
+        return QuantizedVectorStore(str(path), embeddings), manifest
+    
+    vectorstore = load_vector_store(
+        persist_directory,
+        manifest["collection_name"],
+        embeddings,
+        manifest.get("backend", "chroma")
+    )
+    
+    return vectorstore, manifest
+
+
+def _check_chunk_settings(
+    manifest: Dict,
+    chunk_size: int,
+    chunk_overlap: int,
+    chunk_strategy: str
+) -> None:
+    """Raise ValueError if the collection was chunked with other settings"""
+    stored = (
+        manifest.get("chunk_size"),
+        manifest.get("chunk_overlap"),
+        manifest.get("chunk_strategy", "recursive")
+    )
+    if stored != (chunk_size, chunk_overlap, chunk_strategy):
+        raise ValueError("Chunking settings changed; rebuild the vector store first")
+
+
+def pending_policy_changes(
+    policies_dir: str,
+    manifest: Dict,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    chunk_strategy: Optional[str] = None
+) -> Dict[str, List[str]]:
+    """
+    Policy files added, changed or removed since a collection was built
+    
+    Only reads the policy directory; the collection and manifest are not
+    touched, so a serving process can check for changes and rebuild into
+    a new collection instead of syncing the live one.
+    
+    Args:
+        policies_dir: Path to policy directory
+        manifest: Manifest of the collection being served
+        chunk_size: Chunk size in characters
+        chunk_overlap: Overlap size in characters
+        chunk_strategy: "recursive" or "markdown" (defaults to CHUNK_STRATEGY)
+        
+    Returns:
+        Dictionary with added, changed, removed and unchanged file names
+        
+    Raises:
+        ValueError: If the chunking settings changed since the build
+    """
+    _check_chunk_settings(manifest, chunk_size, chunk_overlap, resolve_chunk_strategy(chunk_strategy))
+    old_files = manifest["files"]
+    return diff_files(old_files, scan_policy_files(policies_dir, previous=old_files))
+
+
+def sync_vector_store(
+    vectorstore: VectorStoreType,
+    policies_dir: str,
+    persist_directory: str = "./chroma_db",
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    chunk_strategy: Optional[str] = None
+) -> Dict:
+    """
+    Bring an existing collection in line with the policy directory
+    
+    Only files that were added, changed or removed since the stored
+    manifest are touched: their old chunks are deleted and new chunks
+    are embedded and upserted under stable per-file chunk IDs.
+    
+    Args:
+        vectorstore: Loaded vector store described by the manifest
+        policies_dir: Path to policy directory
+        persist_directory: Directory holding the vector store and manifest
+        chunk_size: Chunk size in characters
+        chunk_overlap: Overlap size in characters
+        chunk_strategy: "recursive" or "markdown" (defaults to CHUNK_STRATEGY)
+        
+    Returns:
+        Dictionary with added, changed and removed file names and the
+        number of chunks deleted and upserted
+    """
+    manifest = load_manifest(persist_directory)
+    if manifest is None:
+        raise ValueError("No index manifest found; rebuild the vector store first")
+    
+    chunk_strategy = resolve_chunk_strategy(chunk_strategy)
+    _check_chunk_settings(manifest, chunk_size, chunk_overlap, chunk_strategy)
+    _check_embedding_model(manifest, vectorstore.embeddings)
+    
+    old_files = manifest["files"]
+    current = scan_policy_files(policies_dir, previous=old_files)
+    diff = diff_files(old_files, current)
+    
+    # Drop chunks of changed and removed files
+    stale_ids = []
+    for name in diff["changed"] + diff["removed"]:
+        stale_ids.extend(old_files[name].get("chunk_ids", []))
+    if stale_ids:
+        vectorstore.delete(ids=stale_ids)
+    
+    # Re-chunk and upsert added and changed files
+    new_chunks = []
+    for name in diff["added"] + diff["changed"]:
+        document = load_policy_file(Path(policies_dir) / name)
+        file_chunks = chunk_documents([document], chunk_size, chunk_overlap, chunk_strategy)
+        current[name]["chunk_ids"] = [c.metadata["chunk_id"] for c in file_chunks]
+        new_chunks.extend(file_chunks)
+    if new_chunks:
+        vectorstore.add_documents(
+            new_chunks,
+            ids=[c.metadata["chunk_id"] for c in new_chunks]
+        )
+    
+    if stale_ids or new_chunks:
+        keyword_path = keyword_index_path(persist_directory, manifest["collection_name"])
+        if keyword_path.exists():
+            keyword_index = BM25Index.load(str(keyword_path))
+            keyword_index.delete(stale_ids)
+            keyword_index.add_documents(new_chunks)
+            keyword_index.save(str(keyword_path))
+        
+        # Chroma persists on write; the NumPy matrix is saved explicitly
+        if isinstance(vectorstore, NumpyVectorStore):
+            vectorstore.save()
+        # Keep the quantized export in step with the collection
+        if manifest.get("quantized"):
+            export_quantized_index(
+                vectorstore,
+                str(quantized_index_path(persist_directory, manifest["collection_name"])),
+                manifest["quantized"]["dtype"]
+            )
+    
+    for name in diff["unchanged"]:
+        current[name]["chunk_ids"] = old_files[name].get("chunk_ids", [])
+    
+    manifest["files"] = current
+    save_manifest(persist_directory, manifest)
+    close_embedding_cache(vectorstore)
+    
+    return {
+        "added": diff["added"],
+        "changed": diff["changed"],
+        "removed": diff["removed"],
+        "chunks_deleted": len(stale_ids),
+        "chunks_upserted": len(new_chunks)
+    }
+
+
+def _iter_rows(vectorstore: VectorStoreType, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[RowBatch]:
+    """Yield (ids, texts, metadatas, embeddings) batches from a writable store"""
+    if isinstance(vectorstore, NumpyVectorStore):
+        yield from vectorstore.iter_batches(batch_size)
+        return
+    
+    collection = vectorstore._collection
+    total = collection.count()
+    for offset in range(0, total, batch_size):
+        page = collection.get(
+            limit=batch_size,
+            offset=offset,
+            include=["embeddings", "documents", "metadatas"]
+        )
+        yield page["ids"], page["documents"], page["metadatas"], page["embeddings"]
+
+
+def export_quantized_index(
+    vectorstore: VectorStoreType,
+    path: str,
+    dtype: str = "int8"
+) -> Dict:
+    """
+    Write a read-only, memory-mapped quantized copy of a collection
+    
+    Stored embeddings are reused, so exporting makes no embedding calls.
+    
+    Args:
+        vectorstore: Chroma or NumPy vector store to export
+        path: Target directory
+        dtype: "int8" (4x smaller than float32) or "float16" (2x smaller)
+        
+    Returns:
+        Header of the written index
+    """
+    return write_quantized_index(
+        path,
+        _iter_rows(vectorstore),
+        count_vectors(vectorstore),
+        dtype
+    )
+
+
+def export_indexed_vector_store(
+    persist_directory: str = "./chroma_db",
+    dtype: str = "int8",
+    embeddings: Optional[Embeddings] = None
+) -> Dict:
+    """
+    Export the manifest's collection and record the export in the manifest
+    
+    Once recorded, load_indexed_vector_store(prefer_quantized=True) opens
+    the export and sync_vector_store keeps it up to date.
+    
+    Args:
+        persist_directory: Directory holding the vector store and manifest
+        dtype: "int8" or "float16"
+        embeddings: Embeddings client to use (defaults to the shared registry client)
+        
+    Returns:
+        Header of the written index
+    """
+    vectorstore, manifest = load_indexed_vector_store(persist_directory, embeddings)
+    path = quantized_index_path(persist_directory, manifest["collection_name"])
+    header = export_quantized_index(vectorstore, str(path), dtype)
+    
+    manifest["quantized"] = {"dtype": dtype}
+    save_manifest(persist_directory, manifest)
+    
+    return header
+
+
+def _path_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def _remove_path(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def lease_collection(persist_directory: str, collection_name: str) -> None:
+    """
+    Record that this process serves collection_name, replacing its other leases
+    
+    Call again periodically to keep a lease fresh for other hosts.
+    
+    Args:
+        persist_directory: Directory holding the vector store and manifest
+        collection_name: Collection the process now answers from
+    """
+    lease_dir = Path(persist_directory) / LEASE_DIR
+    lease_dir.mkdir(parents=True, exist_ok=True)
+    holder = f"{socket.gethostname()}.{os.getpid()}"
+    lease = lease_dir / f"{collection_name}@{holder}"
+    
+    for path in lease_dir.glob(f"*@{holder}"):
+        if path != lease:
+            path.unlink(missing_ok=True)
+    lease.touch()
+
+
+def leased_collections(persist_directory: str) -> Set[str]:
+    """
+    Collections some live process still serves; stale leases are removed
+    
+    Args:
+        persist_directory: Directory holding the vector store and manifest
+        
+    Returns:
+        Names of leased collections
+    """
+    lease_dir = Path(persist_directory) / LEASE_DIR
+    if not lease_dir.exists():
+        return set()
+    
+    hostname = socket.gethostname()
+    now = time.time()
+    leased = set()
+    for path in lease_dir.iterdir():
+        name, _, holder = path.name.rpartition("@")
+        host, _, pid = holder.rpartition(".")
+        if not name or not pid.isdigit():
+            continue
+        try:
+            if host == hostname:
+                live = _pid_alive(int(pid))
+            else:
+                live = now - path.stat().st_mtime < LEASE_TTL_SECONDS
+        except FileNotFoundError:
+            continue
+        if live:
+            leased.add(name)
+        else:
+            path.unlink(missing_ok=True)
+    return leased
+
+
+def _collection_order(name: str) -> int:
+    """Version number of a policy_documents_v{N} name (0 if unversioned)"""
+    match = re.search(r"_v(\d+)$", name)
+    return int(match.group(1)) if match else 0
+
+
+def collect_garbage(
+    persist_directory: str = "./chroma_db",
+    keep_previous: int = KEEP_PREVIOUS_COLLECTIONS,
+    dry_run: bool = False
+) -> Dict:
+    """
+    Delete collections and files the active manifest no longer references
+    
+    Keeps the active collection, the `keep_previous` newest older
+    versions, any newer version (a blue/green build not yet published)
+    and any collection a serving process holds a lease on (see
+    lease_collection); removes every other Chroma collection, its keyword index,
+    NumPy and quantized files, and then any segment directory that the
+    Chroma database no longer lists. Without a manifest only the orphaned
+    segment directories are removed.
+    
+    Args:
+        persist_directory: Directory holding the vector store and manifest
+        keep_previous: Number of older collections to retain
+        dry_run: Report what would be deleted without deleting it
+            (bytes_reclaimed then excludes space held inside chroma.sqlite3)
+        
+    Returns:
+        Dictionary with the deleted collections, files and segment
+        directories, collections kept because they are in_use, and
+        bytes_reclaimed
+    """
+    root = Path(persist_directory)
+    report = {"collections": [], "files": [], "segments": [], "in_use": [], "bytes_reclaimed": 0}
+    if not root.exists():
+        return report
+    
+    manifest = load_manifest(persist_directory)
+    db_path = root / _CHROMA_DB_FILE
+    bytes_before = _path_size(root)
+    
+    if manifest is not None:
+        active = manifest["collection_name"]
+        
+        client = chromadb.PersistentClient(path=str(root)) if db_path.exists() else None
+        chroma_names = {c.name for c in client.list_collections()} if client else set()
+        
+        names = {active} | chroma_names
+        for path in root.iterdir():
+            match = _COLLECTION_ARTIFACT.match(path.name)
+            if match:
+                names.add(match.group("name"))
+        
+        # Newer versions are builds still in progress, not rollback targets
+        active_order = _collection_order(active)
+        older = sorted(
+            (name for name in names - {active} if _collection_order(name) <= active_order),
+            key=_collection_order,
+            reverse=True
+        )
+        expired = set(older[keep_previous:])
+        in_use = expired & leased_collections(persist_directory)
+        report["in_use"] = sorted(in_use)
+        doomed = expired - in_use
+        
+        for name in sorted(doomed & chroma_names):
+            report["collections"].append(name)
+            if not dry_run:
+                client.delete_collection(name)
+        
+        for path in sorted(root.iterdir()):
+            match = _COLLECTION_ARTIFACT.match(path.name)
+            if match and match.group("name") in doomed:
+                report["files"].append(path.name)
+                if dry_run:
+                    report["bytes_reclaimed"] += _path_size(path)
+                else:
+                    _remove_path(path)
+    
+    # HNSW segment directories are named after their segment ID
+    referenced = set()
+    if db_path.exists():
+        conn = sqlite3.connect(str(db_path))
+        try:
+            referenced = {row[0] for row in conn.execute("SELECT id FROM segments")}
+        finally:
+            conn.close()
+    
+    for path in sorted(root.iterdir()):
+        if path.is_dir() and _SEGMENT_DIR.match(path.name) and path.name not in referenced:
+            report["segments"].append(path.name)
+            if dry_run:
+                report["bytes_reclaimed"] += _path_size(path)
+            else:
+                shutil.rmtree(path)
+    
+    if dry_run:
+        return report
+    
+    if db_path.exists() and report["collections"]:
+        # Hand freed pages back to the file system
+        conn = sqlite3.connect(str(db_path), timeout=30)
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+    
+    report["bytes_reclaimed"] = max(0, bytes_before - _path_size(root))
+    return report
+
+
+def main() -> None:
+    from dotenv import load_dotenv
+    load_dotenv()
+    
+    parser = argparse.ArgumentParser(description="Vector store maintenance")
+    parser.add_argument("--persist-dir", default=os.getenv("VECTOR_STORE_PATH", "chroma_db"))
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    export = commands.add_parser("export", help="Write the memory-mapped quantized index")
+    export.add_argument("--dtype", choices=["int8", "float16"], default="int8")
+    
+    gc = commands.add_parser("gc", help="Delete collections and files no longer in use")
+    gc.add_argument("--keep-previous", type=int, default=KEEP_PREVIOUS_COLLECTIONS)
+    gc.add_argument("--dry-run", action="store_true")
+    
+    args = parser.parse_args()
+    
+    if args.command == "export":
+        header = export_indexed_vector_store(args.persist_dir, args.dtype)
+        print(f"Exported {header['count']} vectors ({header['dtype']}, dim {header['dim']})")
+    elif args.command == "gc":
+        report = collect_garbage(args.persist_dir, args.keep_previous, args.dry_run)
+        verb = "Would delete" if args.dry_run else "Deleted"
+        print(f"{verb} {len(report['collections'])} collection(s): {', '.join(report['collections']) or '-'}")
+        print(f"{verb} {len(report['files'])} file(s) and {len(report['segments'])} segment directories")
+        if report["in_use"]:
+            print(f"Kept {len(report['in_use'])} collection(s) still in use: {', '.join(report['in_use'])}")
+        print(f"Reclaimed {report['bytes_reclaimed'] / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Tests for the headless HTTP API
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import app.api as api
+from src.local_embeddings import HashedEmbeddings
+from src.numpy_store import NumpyVectorStore
+from src.shared_resources import ServingIndex, shared_index
+from src.singleflight import AsyncSingleFlight
+
+
+ANSWER = "Employees receive ten paid sick days."
+
+
+def _request(method, path, body=None):
+    async def send():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+            return await client.request(method, path, content=body)
+    return asyncio.run(send())
+
+
+def _ask(payload, path="/ask"):
+    body = payload if isinstance(payload, (bytes, str)) else json.dumps(payload)
+    return _request("POST", path, body)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    """Each test gets its own flights (bound to its event loop) and no store"""
+    monkeypatch.setattr(api, "_flights", AsyncSingleFlight())
+    monkeypatch.setattr(api, "get_shared_chat_model", lambda: FakeListChatModel(responses=[ANSWER]))
+    shared_index.clear()
+    yield
+    shared_index.clear()
+
+
+@pytest.fixture
+def loaded():
+    store = NumpyVectorStore(HashedEmbeddings(256))
+    store.add_documents(
+        [Document(page_content="Employees receive ten paid sick days per year.",
+                  metadata={"source": "leave.md", "chunk_id": "leave-0"})],
+        ids=["leave-0"]
+    )
+    shared_index.swap(ServingIndex(store, None, {"collection_name": "test", "files": {}}))
+
+
+@pytest.mark.parametrize("payload, message", [
+    (b"not json", "Body must be JSON"),
+    ([], "'question' must be a non-empty string"),
+    ({"question": "   "}, "'question' must be a non-empty string"),
+    ({"question": 42}, "'question' must be a non-empty string"),
+    ({"question": "x" * (api.MAX_QUESTION_CHARS + 1)}, "at most"),
+    ({"question": "Sick days?", "k": 0}, "'k' must be an integer"),
+    ({"question": "Sick days?", "k": api.MAX_K + 1}, "'k' must be an integer"),
+    ({"question": "Sick days?", "k": 2.0}, "'k' must be an integer"),
+    ({"question": "Sick days?", "k": True}, "'k' must be an integer"),
+    ({"question": "Sick days?", "k": False}, "'k' must be an integer"),
+])
+def test_invalid_requests_are_rejected(payload, message):
+    """Malformed bodies get a 400 with a client-facing message"""
+    response = _ask(payload)
+
+    assert response.status_code == 400
+    assert message in response.json()["error"]
+
+
+def test_oversized_body_is_rejected():
+    """Bodies over MAX_BODY_BYTES are refused before parsing"""
+    response = _ask(json.dumps({"question": "x" * (api.MAX_BODY_BYTES + 1)}))
+
+    assert response.status_code == 400
+    assert "too large" in response.json()["error"]
+
+
+def test_ask_before_the_store_is_loaded():
+    """Questions are refused with 503 until a store is loaded"""
+    assert _ask({"question": "Sick days?"}).status_code == 503
+    assert _request("GET", "/readyz").status_code == 503
+    assert _request("GET", "/healthz").json() == {"status": "ok"}
+
+
+def test_ask_returns_the_pipeline_answer(loaded):
+    """/ask answers the trimmed question from the shared store"""
+    response = _ask({"question": "  How many sick days?  ", "k": 1})
+    result = response.json()
+
+    assert response.status_code == 200
+    assert result["question"] == "How many sick days?"
+    assert result["answer"] == ANSWER
+    assert result["sources"] == [{"file": "leave.md", "policy": "leave.md"}]
+
+
+def test_ask_stream_sends_tokens_then_the_result(loaded):
+    """/ask/stream sends token events that add up to the final result"""
+    response = _ask({"question": "How many sick days?", "k": 1}, path="/ask/stream")
+    events = [
+        (block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+        for block in response.text.strip().split("\n\n")
+    ]
+
+    assert response.headers["content-type"] == "text/event-stream"
+    assert events[-1][0] == "result"
+    assert "".join(data for kind, data in events[:-1] if kind == "token") == ANSWER
+    assert events[-1][1]["answer"] == ANSWER
+
+
+def test_ready_and_metrics_once_loaded(loaded):
+    """Readiness flips once loaded and answered requests show up in /metrics"""
+    assert _request("GET", "/readyz").status_code == 200
+    _ask({"question": "How many sick days?"})
+
+    metrics = _request("GET", "/metrics")
+    assert metrics.status_code == 200
+    assert "rag_requests_total" in metrics.text
+
+
+def test_unknown_route():
+    """Unknown paths and methods get a 404"""
+    assert _request("GET", "/nope").status_code == 404
+    assert _request("GET", "/ask").status_code == 404
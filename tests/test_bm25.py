@@ -0,0 +1,68 @@
+"""
+Tests for BM25 keyword search and reciprocal-rank fusion
+"""
+
+from langchain_core.documents import Document
+
+from src.bm25 import BM25Index, RRF_K, reciprocal_rank_fusion
+
+
+def _chunk(chunk_id, text="policy text"):
+    return Document(page_content=text, metadata={"chunk_id": chunk_id, "source": "policy.md"})
+
+
+def _ids(docs):
+    return [doc.metadata["chunk_id"] for doc in docs]
+
+
+def test_rrf_ranks_chunks_found_by_both_retrievers_first():
+    """A chunk in both lists outranks chunks ranked first by only one"""
+    semantic = [_chunk("a"), _chunk("shared"), _chunk("b")]
+    keyword = [_chunk("c"), _chunk("shared"), _chunk("d")]
+
+    fused = reciprocal_rank_fusion([semantic, keyword])
+
+    assert _ids(fused)[0] == "shared"
+    assert set(_ids(fused)) == {"a", "b", "c", "d", "shared"}
+
+
+def test_rrf_scores_depend_only_on_ranks():
+    """Fused order follows the summed 1/(rrf_k + rank) scores"""
+    first = [_chunk("x"), _chunk("y"), _chunk("z")]
+    second = [_chunk("z"), _chunk("y"), _chunk("x")]
+
+    fused = reciprocal_rank_fusion([first, second], rrf_k=RRF_K)
+
+    # x and z both score 1/(k+1) + 1/(k+3), which beats y's 2/(k+2)
+    assert _ids(fused) == ["x", "z", "y"]
+
+
+def test_rrf_ties_keep_first_seen_order():
+    """Equal scores are ordered by first appearance across the lists"""
+    fused = reciprocal_rank_fusion([[_chunk("a"), _chunk("b")], [_chunk("c"), _chunk("d")]])
+
+    assert _ids(fused) == ["a", "c", "b", "d"]
+
+
+def test_rrf_truncates_to_k_and_keeps_the_first_copy():
+    """Only k chunks are returned, each as the first list's Document"""
+    semantic = [_chunk("a", "semantic copy"), _chunk("b")]
+    keyword = [_chunk("a", "keyword copy"), _chunk("c")]
+
+    fused = reciprocal_rank_fusion([semantic, keyword], k=2)
+
+    assert len(fused) == 2
+    assert fused[0].page_content == "semantic copy"
+
+
+def test_bm25_search_prefers_rare_query_terms():
+    """The chunk holding the rarer query term ranks first"""
+    index = BM25Index.from_documents([
+        _chunk("common", "employees receive paid leave every year"),
+        _chunk("rare", "employees receive a sabbatical after five years"),
+        _chunk("other", "expenses need a receipt")
+    ])
+
+    results = index.search("employees sabbatical", k=2)
+
+    assert _ids([doc for doc, _ in results])[0] == "rare"
@@ -0,0 +1,76 @@
+"""
+Tests for merging adjacent retrieved chunks
+"""
+
+from langchain_core.documents import Document
+
+from src.context_packer import MIN_OVERLAP_CHARS, merge_adjacent_chunks
+
+
+TEXT = (
+    "Employees accrue 1.5 vacation days per month of service. Unused days carry "
+    "over up to a maximum of 10 days. Requests must be submitted two weeks ahead "
+    "and approved by the direct manager before travel is booked."
+)
+
+
+def _chunk(text, index, source="leave.md"):
+    return Document(page_content=text, metadata={"source": source, "chunk_index": index})
+
+
+def _split(text, size, overlap):
+    """Cut text the way the splitter does: fixed windows sharing `overlap` characters"""
+    pieces, start = [], 0
+    while True:
+        pieces.append(text[start:start + size])
+        if start + size >= len(text):
+            return pieces
+        start += size - overlap
+
+
+def test_overlapping_neighbours_are_joined_without_repeating_text():
+    """Consecutive chunks become the original text, overlap kept once"""
+    pieces = _split(TEXT, 80, 30)
+    docs = [_chunk(piece, index) for index, piece in enumerate(pieces)]
+
+    merged, removed = merge_adjacent_chunks(docs)
+
+    assert len(merged) == 1
+    assert merged[0].page_content == TEXT
+    assert merged[0].metadata["merged_chunks"] == len(pieces)
+    assert removed == 30 * (len(pieces) - 1)
+
+
+def test_merged_chunk_takes_the_rank_of_its_best_member():
+    """A run is emitted where its most relevant chunk was ranked"""
+    first, second, third = _split(TEXT, 80, 30)[:3]
+    other = _chunk("Expenses over 500 USD need director approval.", 0, source="expenses.md")
+    docs = [_chunk(third, 2), other, _chunk(first, 0), _chunk(second, 1)]
+
+    merged, _ = merge_adjacent_chunks(docs)
+
+    assert [doc.metadata["source"] for doc in merged] == ["leave.md", "expenses.md"]
+    assert merged[0].page_content.startswith(first)
+    assert merged[0].page_content.endswith(third)
+
+
+def test_short_shared_text_is_not_treated_as_overlap():
+    """Neighbours sharing fewer than MIN_OVERLAP_CHARS are joined as paragraphs"""
+    shared = "x" * (MIN_OVERLAP_CHARS - 1)
+    docs = [_chunk("Section one. " + shared, 0), _chunk(shared + " Section two.", 1)]
+
+    merged, removed = merge_adjacent_chunks(docs)
+
+    assert removed == 0
+    assert merged[0].page_content == docs[0].page_content + "\n\n" + docs[1].page_content
+
+
+def test_gaps_and_other_sources_are_left_alone():
+    """Non-consecutive chunks and chunks of other files are not merged"""
+    pieces = _split(TEXT, 80, 30)
+    docs = [_chunk(pieces[0], 0), _chunk(pieces[2], 2), _chunk(pieces[1], 1, source="other.md")]
+
+    merged, removed = merge_adjacent_chunks(docs)
+
+    assert merged == docs
+    assert removed == 0
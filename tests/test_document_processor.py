@@ -0,0 +1,95 @@
+"""
+Tests for policy loading and the markdown-aware chunker
+"""
+
+from pathlib import Path
+
+import pytest
+from langchain_core.documents import Document
+
+from src.document_processor import chunk_documents, process_policies, split_markdown_sections
+
+
+POLICIES_DIR = Path(__file__).parent.parent / "data" / "policies"
+
+POLICY = """# Leave Policy
+
+Intro text for the whole policy.
+
+## 1. Vacation
+
+Employees accrue vacation monthly.
+
+## 2. Sick Leave
+
+### 2.1 Eligibility
+
+All full-time staff are eligible from day one.
+
+### 2.2 Usage
+
+Sick days may be used for illness or medical appointments. """ + "More detail. " * 40
+
+
+def _document(text: str = POLICY) -> Document:
+    return Document(page_content=text, metadata={"source": "leave.md", "policy_name": "Leave"})
+
+
+def test_chunks_never_straddle_sections():
+    """Every "#"/"##" section starts a new chunk"""
+    chunks = split_markdown_sections(_document(), chunk_size=300, chunk_overlap=0)
+
+    for chunk in chunks:
+        assert chunk.page_content.count("\n## ") + chunk.page_content.startswith("## ") <= 1
+    assert chunks[1].page_content.startswith("## 1. Vacation")
+    assert "Sick" not in chunks[1].page_content
+
+
+def test_sections_record_their_heading_path():
+    """Chunks carry the heading path, including the current subsection"""
+    chunks = split_markdown_sections(_document(), chunk_size=300, chunk_overlap=0)
+    sections = [chunk.metadata["section"] for chunk in chunks]
+
+    assert sections[0] == "Leave Policy"
+    assert sections[1] == "Leave Policy > 1. Vacation"
+    assert sections[2] == "Leave Policy > 2. Sick Leave"
+    assert "### 2.1 Eligibility" in chunks[2].page_content
+    # Sub-split pieces without their own heading continue the last subsection
+    assert sections[-1] == "Leave Policy > 2. Sick Leave > 2.2 Usage"
+    assert sections.count("Leave Policy > 2. Sick Leave > 2.2 Usage") > 1
+    assert all(len(chunk.page_content) <= 300 for chunk in chunks)
+    assert all(chunk.metadata["source"] == "leave.md" for chunk in chunks)
+
+
+def test_chunk_ids_are_numbered_per_source():
+    """chunk_documents numbers each file's chunks from zero"""
+    other = Document(page_content=POLICY, metadata={"source": "other.md"})
+
+    chunks = chunk_documents([_document(), other], 300, 0, strategy="markdown")
+
+    leave = [c.metadata["chunk_id"] for c in chunks if c.metadata["source"] == "leave.md"]
+    assert leave == [f"leave.md::{index}" for index in range(len(leave))]
+    assert chunks[len(leave)].metadata["chunk_id"] == "other.md::0"
+
+
+def test_recursive_strategy_has_no_sections():
+    """The default character splitter does not add section metadata"""
+    chunks = chunk_documents([_document()], 300, 0, strategy="recursive")
+
+    assert chunks and all("section" not in chunk.metadata for chunk in chunks)
+
+
+def test_unknown_strategy_is_rejected():
+    """Only the known strategy names are accepted"""
+    with pytest.raises(ValueError):
+        chunk_documents([_document()], strategy="sentences")
+
+
+def test_markdown_chunking_covers_the_policies():
+    """Every policy file yields sectioned chunks within the size limit"""
+    chunks = process_policies(str(POLICIES_DIR), 1000, 200, strategy="markdown")
+
+    sources = {chunk.metadata["source"] for chunk in chunks}
+    assert sources == {path.name for path in POLICIES_DIR.glob("*.md")}
+    assert all(chunk.metadata["section"] for chunk in chunks)
+    assert all(len(chunk.page_content) <= 1000 for chunk in chunks)
@@ -0,0 +1,91 @@
+"""
+Tests for the persistent embedding cache
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.embeddings import Embeddings
+
+from src.embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """Deterministic embeddings that record every text sent to them"""
+
+    model = "counting"
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), float(sum(map(ord, text)) % 97)] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_only_unseen_texts_reach_the_client(tmp_path):
+    """Repeated and previously embedded texts are served from the cache"""
+    client = CountingEmbeddings()
+    with CachedEmbeddings(client, str(tmp_path / "cache.sqlite")) as cache:
+        first = cache.embed_documents(["sick leave", "travel", "sick leave"])
+        second = cache.embed_documents(["travel", "expenses"])
+
+    assert client.embedded == ["sick leave", "travel", "expenses"]
+    assert first[0] == first[2]
+    assert second[0] == first[1]
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_cache_survives_a_new_wrapper(tmp_path):
+    """Vectors written by one build are reused by the next"""
+    path = str(tmp_path / "cache.sqlite")
+    with CachedEmbeddings(CountingEmbeddings(), path) as cache:
+        vectors = cache.embed_documents(["sick leave", "travel"])
+
+    client = CountingEmbeddings()
+    with CachedEmbeddings(client, path) as cache:
+        assert cache.embed_documents(["travel", "sick leave"]) == vectors[::-1]
+
+    assert client.embedded == []
+
+
+def test_entries_are_keyed_by_model(tmp_path):
+    """Vectors of one model are never served for another"""
+    path = str(tmp_path / "cache.sqlite")
+    with CachedEmbeddings(CountingEmbeddings(), path, model="model-a") as cache:
+        cache.embed_documents(["sick leave"])
+
+    client = CountingEmbeddings()
+    with CachedEmbeddings(client, path, model="model-b") as cache:
+        cache.embed_documents(["sick leave"])
+
+    assert client.embedded == ["sick leave"]
+
+
+def test_closed_cache_reopens_on_use(tmp_path):
+    """close() releases the file; a later embed reopens it"""
+    client = CountingEmbeddings()
+    cache = CachedEmbeddings(client, str(tmp_path / "cache.sqlite"))
+    cache.embed_documents(["sick leave"])
+    cache.close()
+    cache.close()
+
+    assert cache._conn is None
+    cache.embed_documents(["sick leave", "travel"])
+    assert client.embedded == ["sick leave", "travel"]
+    cache.close()
+
+
+def test_concurrent_writers_share_one_connection(tmp_path):
+    """Threads embedding at once neither fail nor lose vectors"""
+    texts = [f"policy chunk {i}" for i in range(200)]
+    with CachedEmbeddings(CountingEmbeddings(), str(tmp_path / "cache.sqlite")) as cache:
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda i: cache.embed_documents(texts[i::8]), range(8)))
+
+    client = CountingEmbeddings()
+    with CachedEmbeddings(client, str(tmp_path / "cache.sqlite")) as cache:
+        cache.embed_documents(texts)
+    assert client.embedded == []
@@ -0,0 +1,128 @@
+"""
+Tests for collection garbage collection and serving leases
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.index_manifest import MANIFEST_VERSION, save_manifest
+from src.vector_store import LEASE_DIR, collect_garbage, lease_collection, leased_collections
+
+
+def _collection(root: Path, version: int) -> str:
+    """Create the on-disk files of a NumPy-backed collection"""
+    name = f"policy_documents_v{version}"
+    (root / f"{name}.numpy").mkdir(parents=True)
+    (root / f"{name}.numpy" / "embeddings.npy").write_bytes(b"\0" * 128)
+    (root / f"{name}.bm25.json").write_text("{}", encoding="utf-8")
+    return name
+
+
+def _activate(root: Path, version: int) -> None:
+    save_manifest(str(root), {
+        "version": MANIFEST_VERSION,
+        "collection_name": f"policy_documents_v{version}",
+        "files": {}
+    })
+
+
+def _remaining(root: Path):
+    """Names of the NumPy collection directories left in root"""
+    return sorted(path.name for path in root.iterdir() if path.name.endswith(".numpy"))
+
+
+def test_keeps_active_and_previous_collections(tmp_path):
+    """Only versions older than the keep_previous newest ones are removed"""
+    for version in range(1, 5):
+        _collection(tmp_path, version)
+    _activate(tmp_path, 4)
+
+    report = collect_garbage(str(tmp_path), keep_previous=1)
+
+    assert _remaining(tmp_path) == ["policy_documents_v3.numpy", "policy_documents_v4.numpy"]
+    assert sorted(report["files"]) == [
+        "policy_documents_v1.bm25.json", "policy_documents_v1.numpy",
+        "policy_documents_v2.bm25.json", "policy_documents_v2.numpy"
+    ]
+    assert report["bytes_reclaimed"] > 0
+
+
+def test_build_in_progress_does_not_take_the_rollback_slot(tmp_path):
+    """A newer, unpublished collection is kept and v(N-1) stays the rollback"""
+    for version in range(1, 5):
+        _collection(tmp_path, version)
+    _activate(tmp_path, 3)
+
+    collect_garbage(str(tmp_path), keep_previous=1)
+
+    assert _remaining(tmp_path) == [
+        "policy_documents_v2.numpy", "policy_documents_v3.numpy", "policy_documents_v4.numpy"
+    ]
+
+
+def test_dry_run_deletes_nothing(tmp_path):
+    """dry_run reports the expired files but leaves them on disk"""
+    for version in range(1, 4):
+        _collection(tmp_path, version)
+    _activate(tmp_path, 3)
+
+    report = collect_garbage(str(tmp_path), keep_previous=0, dry_run=True)
+
+    assert len(_remaining(tmp_path)) == 3
+    assert "policy_documents_v1.numpy" in report["files"]
+
+
+def test_leased_collection_survives_until_its_holder_exits(tmp_path):
+    """A collection another live process serves is kept, then collected"""
+    for version in range(1, 4):
+        _collection(tmp_path, version)
+    _activate(tmp_path, 3)
+    holder = subprocess.Popen(
+        [sys.executable, "-c",
+         "import sys, time; from src.vector_store import lease_collection; "
+         "lease_collection(sys.argv[1], 'policy_documents_v1'); print('ready', flush=True); time.sleep(60)",
+         str(tmp_path)],
+        cwd=Path(__file__).parent.parent, stdout=subprocess.PIPE, text=True
+    )
+    try:
+        assert holder.stdout.readline().strip() == "ready"
+        report = collect_garbage(str(tmp_path), keep_previous=0)
+        assert report["in_use"] == ["policy_documents_v1"]
+        assert "policy_documents_v1.numpy" in _remaining(tmp_path)
+        assert "policy_documents_v2.numpy" not in _remaining(tmp_path)
+    finally:
+        holder.kill()
+        holder.wait()
+
+    collect_garbage(str(tmp_path), keep_previous=0)
+    assert _remaining(tmp_path) == ["policy_documents_v3.numpy"]
+    assert not list((tmp_path / LEASE_DIR).iterdir())
+
+
+def test_lease_moves_with_the_served_collection(tmp_path):
+    """A process holds one lease: leasing a new collection drops the old one"""
+    lease_collection(str(tmp_path), "policy_documents_v1")
+    lease_collection(str(tmp_path), "policy_documents_v2")
+
+    assert leased_collections(str(tmp_path)) == {"policy_documents_v2"}
+
+
+def test_other_hosts_leases_expire_after_the_ttl(tmp_path, monkeypatch):
+    """Leases from other hosts count only while recently refreshed"""
+    lease_dir = tmp_path / LEASE_DIR
+    lease_dir.mkdir()
+    fresh = lease_dir / "policy_documents_v1@other-host.123"
+    stale = lease_dir / "policy_documents_v2@other-host.456"
+    fresh.touch()
+    stale.touch()
+    old = time.time() - 3600
+    os.utime(stale, (old, old))
+    monkeypatch.setattr("src.vector_store.LEASE_TTL_SECONDS", 600)
+
+    assert leased_collections(str(tmp_path)) == {"policy_documents_v1"}
+    assert not stale.exists()
@@ -0,0 +1,115 @@
+"""
+Tests for the index manifest and incremental policy syncing
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.index_manifest import diff_files, index_version, load_manifest, scan_policy_files
+from src.local_embeddings import HashedEmbeddings
+from src.vector_store import (
+    build_indexed_vector_store,
+    load_indexed_vector_store,
+    pending_policy_changes,
+    sync_vector_store
+)
+
+
+POLICIES_DIR = Path(__file__).parent.parent / "data" / "policies"
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Copy of the policies indexed into a NumPy collection with local embeddings"""
+    policies = tmp_path / "policies"
+    shutil.copytree(POLICIES_DIR, policies)
+    persist = tmp_path / "index"
+    build_indexed_vector_store(
+        str(policies), str(persist), embeddings=HashedEmbeddings(64),
+        backend="numpy", calibrate_scope=False
+    )
+    return policies, persist
+
+
+def _load(persist):
+    return load_indexed_vector_store(str(persist), HashedEmbeddings(64))
+
+
+def test_diff_files_classifies_every_file():
+    """Files are added, changed, removed or unchanged by name and hash"""
+    old = {"a.md": {"hash": "1"}, "b.md": {"hash": "2"}, "c.md": {"hash": "3"}}
+    new = {"a.md": {"hash": "1"}, "b.md": {"hash": "9"}, "d.md": {"hash": "4"}}
+
+    assert diff_files(old, new) == {
+        "added": ["d.md"], "changed": ["b.md"], "removed": ["c.md"], "unchanged": ["a.md"]
+    }
+
+
+def test_scan_reuses_hashes_of_untouched_files(tmp_path):
+    """A file whose mtime and size match the manifest is not read again"""
+    (tmp_path / "leave.md").write_text("# Leave\n", encoding="utf-8")
+    first = scan_policy_files(str(tmp_path))
+    first["leave.md"]["hash"] = "stored"
+
+    assert scan_policy_files(str(tmp_path), previous=first)["leave.md"]["hash"] == "stored"
+
+
+def test_sync_reembeds_only_changed_files(index):
+    """Editing one file replaces only its chunks and changes the index version"""
+    policies, persist = index
+    vectorstore, manifest = _load(persist)
+    name = sorted(manifest["files"])[0]
+    untouched = {n: entry["chunk_ids"] for n, entry in manifest["files"].items() if n != name}
+    with open(policies / name, "a", encoding="utf-8") as f:
+        f.write("\n## Amendment\nRemote employees receive a 50 USD internet stipend.\n")
+
+    report = sync_vector_store(vectorstore, str(policies), str(persist))
+    synced = load_manifest(str(persist))
+
+    assert report["changed"] == [name]
+    assert report["added"] == report["removed"] == []
+    assert report["chunks_upserted"] == len(synced["files"][name]["chunk_ids"])
+    assert {n: synced["files"][n]["chunk_ids"] for n in untouched} == untouched
+    assert index_version(synced) != index_version(manifest)
+    new_chunks = vectorstore.get_by_ids(synced["files"][name]["chunk_ids"])
+    assert any("internet stipend" in chunk.page_content for chunk in new_chunks)
+
+
+def test_sync_removes_chunks_of_deleted_files(index):
+    """A deleted policy file leaves no chunks behind"""
+    policies, persist = index
+    vectorstore, manifest = _load(persist)
+    name = sorted(manifest["files"])[-1]
+    removed_ids = manifest["files"][name]["chunk_ids"]
+    os.remove(policies / name)
+
+    report = sync_vector_store(vectorstore, str(policies), str(persist))
+
+    assert report["removed"] == [name]
+    assert report["chunks_deleted"] == len(removed_ids)
+    assert vectorstore.get_by_ids(removed_ids) == []
+    assert name not in load_manifest(str(persist))["files"]
+
+
+def test_sync_refuses_changed_chunk_settings(index):
+    """Other chunk settings need a full rebuild"""
+    policies, persist = index
+    vectorstore, _ = _load(persist)
+
+    with pytest.raises(ValueError, match="Chunking settings changed"):
+        sync_vector_store(vectorstore, str(policies), str(persist), chunk_size=500)
+
+
+def test_pending_changes_leave_the_index_untouched(index):
+    """Checking for changes neither modifies the collection nor the manifest"""
+    policies, persist = index
+    _, manifest = _load(persist)
+    (policies / "new-policy.md").write_text("# New Policy\n\nPets are welcome on Fridays.\n", encoding="utf-8")
+
+    changes = pending_policy_changes(str(policies), manifest)
+
+    assert changes["added"] == ["new-policy.md"]
+    assert load_manifest(str(persist)) == manifest
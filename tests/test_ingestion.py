@@ -0,0 +1,76 @@
+"""
+Tests for the parallel ingestion pipeline
+"""
+
+import importlib
+from pathlib import Path
+
+import pytest
+
+from src import ingestion
+from src.ingestion import ingest_policies
+
+
+POLICIES_DIR = Path(__file__).parent.parent / "data" / "policies"
+
+
+class RecordingStore:
+    """Vector store stand-in that records every add_documents call"""
+
+    def __init__(self):
+        self.batches = []
+
+    def add_documents(self, documents, ids=None):
+        self.batches.append(list(ids))
+        return ids
+
+
+def test_chunks_inline_by_default(monkeypatch):
+    """A pool is opt-in: without INGEST_WORKERS chunking runs inline"""
+    monkeypatch.delenv("INGEST_WORKERS", raising=False)
+    importlib.reload(ingestion)
+    store = RecordingStore()
+
+    try:
+        report = ingestion.ingest_policies(str(POLICIES_DIR), store)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(ingestion)
+
+    assert report["workers"] == 1
+    assert report["documents"] == len(list(POLICIES_DIR.glob("*.md")))
+    assert report["chunks"] == sum(len(batch) for batch in store.batches)
+
+
+def test_process_pool_matches_inline_order():
+    """Chunk IDs and insertion order do not depend on the worker count"""
+    inline, pooled = RecordingStore(), RecordingStore()
+
+    inline_report = ingest_policies(str(POLICIES_DIR), inline, workers=1, batch_size=16)
+    pooled_report = ingest_policies(str(POLICIES_DIR), pooled, workers=2, batch_size=16)
+
+    assert pooled.batches == inline.batches
+    assert pooled_report["chunk_ids"] == inline_report["chunk_ids"]
+    assert pooled_report["workers"] == 2
+
+
+def test_batches_are_bounded_and_reported():
+    """No add_documents call exceeds batch_size and on_batch sees each batch"""
+    store = RecordingStore()
+    seen = []
+
+    ingest_policies(
+        str(POLICIES_DIR), store, workers=1, batch_size=5,
+        on_batch=lambda batch: seen.append([c.metadata["chunk_id"] for c in batch])
+    )
+
+    assert all(len(batch) <= 5 for batch in store.batches)
+    assert seen == store.batches
+
+
+def test_rejects_missing_or_empty_directory(tmp_path):
+    """Missing directories and directories without policies are errors"""
+    with pytest.raises(FileNotFoundError):
+        ingest_policies(str(tmp_path / "missing"), RecordingStore())
+    with pytest.raises(ValueError):
+        ingest_policies(str(tmp_path), RecordingStore())
@@ -0,0 +1,41 @@
+"""
+Tests for the load test's run summaries
+"""
+
+from benchmarks.loadtest import _request_record, summarize_run
+
+
+def _records(finish_times, base=0.0):
+    """Requests started at base that finished the given seconds later"""
+    return [_request_record(base, seconds, {"outcome": "answered"}) for seconds in finish_times]
+
+
+def test_partial_last_window_uses_its_covered_length():
+    """A trailing window is divided by the time the run spent in it"""
+    summary = summarize_run(_records([1, 2, 3, 4, 6, 6.5], base=100.0), base=100.0, window=5.0)
+
+    first, last = summary["windows"]
+    assert (first["start"], first["requests"], first["throughput"]) == (0.0, 4, 0.8)
+    # The run ended 1.5s into the second window, so 2 requests there is 1.33 req/s
+    assert (last["start"], last["requests"], last["throughput"]) == (5.0, 2, 1.33)
+    assert summary["overall"]["throughput"] == round(6 / 6.5, 2)
+
+
+def test_requests_finishing_at_the_end_close_the_last_window():
+    """A run ending exactly on a window boundary gets no zero-length window"""
+    summary = summarize_run(_records([2, 5, 10]), base=0.0, window=5.0)
+
+    assert [(w["start"], w["requests"]) for w in summary["windows"]] == [(0.0, 1), (5.0, 2)]
+    assert summary["windows"][-1]["throughput"] == 0.4
+
+
+def test_empty_windows_are_skipped_and_errors_counted():
+    """Windows without completions are left out; failed requests count as errors"""
+    records = _records([1, 12]) + [_request_record(0.0, 13, None, error="timeout", status=0)]
+
+    summary = summarize_run(records, base=0.0, window=5.0)
+
+    assert [w["start"] for w in summary["windows"]] == [0.0, 10.0]
+    assert summary["windows"][-1]["error_rate"] == 0.5
+    assert summary["overall"]["outcomes"] == {"answered": 2, "error": 1}
+    assert summarize_run([], base=0.0, window=5.0) == {"overall": {"requests": 0}, "windows": []}
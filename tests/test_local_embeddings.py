@@ -0,0 +1,78 @@
+"""
+Tests for the local hashed embeddings
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.clients import embedding_model_name, get_embedding_client
+from src.local_embeddings import HashedEmbeddings
+
+
+TEXTS = [
+    "Employees receive ten paid sick days per year.",
+    "Business travel must be booked two weeks in advance.",
+    "Expense claims need an itemized receipt."
+]
+
+
+def test_vectors_are_normalized_with_the_requested_dimension():
+    """Rows have dim entries and unit length, so dot products are cosines"""
+    matrix = HashedEmbeddings(128).embed_matrix(TEXTS)
+
+    assert matrix.shape == (3, 128)
+    assert matrix.dtype == np.float32
+    assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0, atol=1e-6)
+
+
+def test_query_and_document_embeddings_agree():
+    """A query embeds exactly like the same text as a document"""
+    embeddings = HashedEmbeddings(128)
+
+    assert embeddings.embed_query(TEXTS[0]) == embeddings.embed_documents(TEXTS)[0]
+    assert embeddings.embed_documents([]) == []
+
+
+def test_vectors_are_stable_across_processes():
+    """Hashing does not depend on PYTHONHASHSEED, so indexes can be reloaded"""
+    script = (
+        "from src.local_embeddings import HashedEmbeddings; "
+        f"print(HashedEmbeddings(64).embed_query({TEXTS[0]!r}))"
+    )
+    runs = [
+        subprocess.run(
+            [sys.executable, "-c", script], cwd=Path(__file__).parent.parent,
+            env={**os.environ, "PYTHONHASHSEED": seed}, capture_output=True, text=True, check=True
+        ).stdout
+        for seed in ("1", "2")
+    ]
+
+    assert runs[0] == runs[1]
+    assert runs[0].strip() == str(HashedEmbeddings(64).embed_query(TEXTS[0]))
+
+
+def test_shared_terms_score_higher():
+    """Texts sharing terms are more similar than unrelated texts"""
+    embeddings = HashedEmbeddings(1024)
+    query = np.array(embeddings.embed_query("how many sick days do I get"))
+    documents = embeddings.embed_matrix(TEXTS)
+
+    scores = documents @ query
+    assert int(np.argmax(scores)) == 0
+    assert embeddings.embed_query("") == [0.0] * 1024
+
+
+def test_model_name_records_the_dimension(monkeypatch):
+    """Indexes built with another dimension are recognized as another model"""
+    assert embedding_model_name(HashedEmbeddings(64)) == "hashed-tf-64"
+    assert embedding_model_name(HashedEmbeddings(64)) != embedding_model_name(HashedEmbeddings(128))
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    assert isinstance(get_embedding_client("local"), HashedEmbeddings)
+    with pytest.raises(ValueError):
+        get_embedding_client("word2vec")
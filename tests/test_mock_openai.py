@@ -0,0 +1,134 @@
+"""
+Tests for the local OpenAI stand-in server
+"""
+
+import asyncio
+import random
+import socket
+
+import httpx
+import numpy as np
+import pytest
+from openai import OpenAI, RateLimitError
+
+from benchmarks.mock_openai import MockOpenAI, MockSettings, mock_answer, sample_ms, start_server
+from src.local_embeddings import HashedEmbeddings
+
+
+PROMPT = (
+    "CONTEXT:\n[Source 1: pto.md]\nEmployees receive ten paid sick days.\n\n"
+    "[Source 2: travel.md]\nBook travel early.\n\nQUESTION: How many sick days?\n\nANSWER:"
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def client():
+    """OpenAI SDK client talking to a stand-in server on a free port"""
+    port = _free_port()
+    server, thread = start_server(MockSettings(ttft="fixed:0"), port=port)
+    yield OpenAI(base_url=f"http://127.0.0.1:{port}/v1", api_key="mock", max_retries=0)
+    server.should_exit = True
+    thread.join()
+
+
+def _request(app, method, path, payload=None):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://mock") as http:
+            return await http.request(method, path, json=payload)
+    return asyncio.run(send())
+
+
+def test_answers_quote_the_first_source(client):
+    """Chat answers are deterministic and cite the first context source"""
+    messages = [{"role": "user", "content": PROMPT}]
+
+    first = client.chat.completions.create(model="gpt-3.5-turbo", messages=messages)
+    second = client.chat.completions.create(model="gpt-3.5-turbo", messages=messages)
+
+    answer = first.choices[0].message.content
+    assert answer == "According to pto.md: Employees receive ten paid sick days."
+    assert second.choices[0].message.content == answer
+    assert first.usage.completion_tokens == len(answer.split())
+
+
+def test_streamed_answer_matches_the_full_answer(client):
+    """Streaming yields the same text, then usage when asked for"""
+    stream = client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[{"role": "user", "content": PROMPT}],
+        stream=True,
+        stream_options={"include_usage": True}
+    )
+    chunks = list(stream)
+
+    text = "".join(c.choices[0].delta.content or "" for c in chunks if c.choices)
+    assert text == "".join(mock_answer(PROMPT, 60))
+    assert chunks[-1].usage.completion_tokens == len(text.split())
+
+
+def test_embeddings_match_the_local_model(client):
+    """Vectors are the hashed-TF embeddings, in float and base64 encodings"""
+    texts = ["sick days", "travel booking"]
+
+    response = client.embeddings.create(model="text-embedding-3-small", input=texts, dimensions=64)
+    expected = HashedEmbeddings(64).embed_matrix(texts)
+
+    vectors = np.array([item.embedding for item in response.data], dtype=np.float32)
+    assert np.allclose(vectors, expected, atol=1e-6)
+
+    default = client.embeddings.create(model="text-embedding-3-small", input="sick days")
+    assert len(default.data[0].embedding) == 1536
+
+
+def test_injected_errors_use_the_configured_status():
+    """error_rate=1 answers every request with error_status"""
+    app = MockOpenAI(MockSettings(error_rate=1.0, error_status=503))
+
+    response = _request(app, "POST", "/v1/embeddings", {"input": "sick days"})
+
+    assert response.status_code == 503
+    assert _request(app, "GET", "/mock/stats").json()["errors_injected"] == 1
+
+
+def test_rate_limits_reach_the_client_as_openai_errors():
+    """A 429 surfaces through the SDK as RateLimitError"""
+    port = _free_port()
+    server, thread = start_server(MockSettings(error_rate=1.0), port=port)
+    try:
+        client = OpenAI(base_url=f"http://127.0.0.1:{port}/v1", api_key="mock", max_retries=0)
+        with pytest.raises(RateLimitError):
+            client.chat.completions.create(model="gpt-3.5-turbo", messages=[{"role": "user", "content": "hi"}])
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def test_bad_requests_and_routes():
+    """Unknown routes are 404 and unparsable bodies 400"""
+    app = MockOpenAI()
+
+    assert _request(app, "GET", "/v1/unknown").status_code == 404
+    assert _request(app, "GET", "/v1/models").json()["data"][0]["id"] == "gpt-3.5-turbo"
+
+    async def send_garbage():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://mock") as http:
+            return await http.post("/v1/chat/completions", content=b"{not json")
+    assert asyncio.run(send_garbage()).status_code == 400
+
+
+def test_latency_specs():
+    """Latency specs are validated up front and never negative"""
+    rng = random.Random(0)
+    assert sample_ms("fixed:5", rng) == 5
+    assert 1 <= sample_ms("uniform:1:2", rng) <= 2
+    assert sample_ms("normal:-100:1", rng) == 0
+    with pytest.raises(ValueError):
+        MockSettings(ttft="gamma:1")
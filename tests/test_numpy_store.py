@@ -0,0 +1,112 @@
+"""
+Tests for the exact NumPy vector store
+"""
+
+import numpy as np
+import pytest
+
+from src.local_embeddings import HashedEmbeddings
+from src.numpy_store import MATRIX_FILE, POINTER_FILE, SNAPSHOT_PREFIX, NumpyVectorStore
+
+
+DIM = 32
+COUNT = 8
+
+
+def _store(persist_path=None):
+    vectors = np.random.default_rng(0).standard_normal((COUNT, DIM)).astype(np.float32)
+    store = NumpyVectorStore(HashedEmbeddings(DIM), persist_path=persist_path)
+    store.add_vectors(
+        vectors,
+        [f"text {i}" for i in range(COUNT)],
+        [{"row": i} for i in range(COUNT)],
+        [f"id-{i}" for i in range(COUNT)]
+    )
+    return store, vectors
+
+
+def _assert_consistent(store, vectors, expected_ids):
+    """Every remaining ID finds its own text, metadata and vector"""
+    assert len(store) == len(expected_ids)
+    for doc_id in expected_ids:
+        i = int(doc_id.split("-")[1])
+        (doc, score), = store.similarity_search_by_vector_with_score(vectors[i].tolist(), k=1)
+        assert doc.id == doc_id
+        assert doc.page_content == f"text {i}"
+        assert doc.metadata == {"row": i}
+        assert abs(score - 1.0) < 1e-5
+
+
+def test_delete_moves_the_last_row_into_the_freed_slot():
+    """Deleting from the middle keeps IDs, texts, metadata and vectors aligned"""
+    store, vectors = _store()
+
+    store.delete(["id-2"])
+
+    remaining = [f"id-{i}" for i in range(COUNT) if i != 2]
+    _assert_consistent(store, vectors, remaining)
+    assert store.get_by_ids(["id-7"])[0].page_content == "text 7"
+
+
+def test_delete_first_last_and_unknown_ids():
+    """Deleting the last row, the first row and missing IDs leaves the rest intact"""
+    store, vectors = _store()
+
+    store.delete([f"id-{COUNT - 1}", "id-0", "missing", "id-0"])
+
+    remaining = [f"id-{i}" for i in range(1, COUNT - 1)]
+    _assert_consistent(store, vectors, remaining)
+    assert store.get_by_ids(["id-0", f"id-{COUNT - 1}"]) == []
+
+
+def test_deleted_rows_are_never_returned():
+    """A search for a deleted vector does not return it"""
+    store, vectors = _store()
+
+    store.delete(["id-3", "id-5"])
+
+    hits = store.similarity_search_by_vector_with_score(vectors[3].tolist(), k=COUNT)
+    assert len(hits) == COUNT - 2
+    assert {doc.id for doc, _ in hits}.isdisjoint({"id-3", "id-5"})
+
+
+def test_reinserting_after_delete_and_reload(tmp_path):
+    """Deleted IDs can be added again and the store survives save/load"""
+    store, vectors = _store(str(tmp_path / "store"))
+    store.delete(["id-1", "id-4"])
+    store.add_vectors(vectors[[1]], ["text 1"], [{"row": 1}], ["id-1"])
+    store.save()
+
+    loaded = NumpyVectorStore.load(str(tmp_path / "store"), HashedEmbeddings(DIM))
+
+    remaining = [f"id-{i}" for i in range(COUNT) if i != 4]
+    _assert_consistent(loaded, vectors, remaining)
+
+
+def test_save_publishes_matrix_and_sidecar_together(tmp_path):
+    """Each save writes a new snapshot and keeps only it and the previous one"""
+    path = tmp_path / "store"
+    store, vectors = _store(str(path))
+    for i in range(3):
+        store.delete([f"id-{i}"])
+        store.save()
+
+    snapshots = [entry for entry in path.iterdir() if entry.name.startswith(SNAPSHOT_PREFIX)]
+    current = (path / POINTER_FILE).read_text(encoding="utf-8")
+
+    assert len(snapshots) == 2
+    assert current in {entry.name for entry in snapshots}
+    loaded = NumpyVectorStore.load(str(path), HashedEmbeddings(DIM))
+    assert len(loaded) == COUNT - 3
+
+
+def test_load_rejects_mismatched_matrix_and_sidecar(tmp_path):
+    """A matrix and sidecar from different saves are never combined"""
+    path = tmp_path / "store"
+    store, _ = _store(str(path))
+    store.save()
+    snapshot = path / (path / POINTER_FILE).read_text(encoding="utf-8")
+    np.save(snapshot / MATRIX_FILE, np.zeros((COUNT + 1, DIM), dtype=np.float32))
+
+    with pytest.raises(ValueError, match="inconsistent"):
+        NumpyVectorStore.load(str(path), HashedEmbeddings(DIM))
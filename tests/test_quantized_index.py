@@ -0,0 +1,77 @@
+"""
+Tests for the memory-mapped quantized index
+"""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src.local_embeddings import HashedEmbeddings
+from src.numpy_store import NumpyVectorStore
+from src.quantized_index import BLOCK_ROWS, QuantizedVectorStore, write_quantized_index
+
+
+def _write_index(path, vectors, dtype="int8"):
+    count = len(vectors)
+    batch = (
+        [f"id-{i}" for i in range(count)],
+        [f"text {i}" for i in range(count)],
+        [{"row": i} for i in range(count)],
+        vectors
+    )
+    write_quantized_index(str(path), [batch], count, dtype)
+    return QuantizedVectorStore(str(path), HashedEmbeddings(vectors.shape[1]))
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("int8", 0.01), ("float16", 0.001)])
+def test_search_matches_exact_search_within_tolerance(tmp_path, dtype, tolerance):
+    """Quantized results agree with the exact NumPy store across block boundaries"""
+    dim = 128
+    rows = BLOCK_ROWS * 2 + 100
+    k = 10
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((rows, dim)).astype(np.float32)
+    store = _write_index(tmp_path / "index", vectors, dtype)
+
+    exact = NumpyVectorStore(HashedEmbeddings(dim))
+    exact.add_vectors(vectors, [f"text {i}" for i in range(rows)], ids=[f"id-{i}" for i in range(rows)])
+
+    overlap = []
+    # Noisy copies of stored rows, including ones in the last partial block
+    for target in [0, 5, BLOCK_ROWS - 1, BLOCK_ROWS, rows - 1]:
+        query = (vectors[target] + 0.5 * rng.standard_normal(dim)).tolist()
+        approximate = store.similarity_search_by_vector_with_score(query, k)
+        reference = exact.similarity_search_by_vector_with_score(query, k)
+
+        assert approximate[0][0].id == reference[0][0].id == f"id-{target}"
+        assert abs(approximate[0][1] - reference[0][1]) < tolerance
+
+        reference_scores = {doc.id: score for doc, score in reference}
+        for doc, score in approximate:
+            if doc.id in reference_scores:
+                assert abs(score - reference_scores[doc.id]) < tolerance
+        overlap.append(len(reference_scores.keys() & {doc.id for doc, _ in approximate}) / k)
+
+    assert np.mean(overlap) >= 0.8
+
+
+def test_query_scratch_memory_is_bounded_by_block_size(tmp_path):
+    """A query never upcasts more than one block of rows"""
+    dim = 256
+    rows = BLOCK_ROWS * 10
+    vectors = np.random.default_rng(0).standard_normal((rows, dim)).astype(np.float32)
+    store = _write_index(tmp_path / "index", vectors)
+    query = vectors[123].tolist()
+    store.similarity_search_by_vector_with_score(query, k=4)
+
+    tracemalloc.start()
+    try:
+        store.similarity_search_by_vector_with_score(query, k=4)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    block_bytes = BLOCK_ROWS * dim * 4
+    assert peak < 2 * block_bytes + 1024 * 1024
+    assert peak < rows * dim * 4 / 2
@@ -0,0 +1,192 @@
+"""
+Tests for the RAG pipeline's answering paths
+"""
+
+import asyncio
+import re
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.local_embeddings import HashedEmbeddings
+from src.numpy_store import NumpyVectorStore
+from src.rag_pipeline import (
+    rag_answer,
+    rag_answer_astream,
+    rag_answer_batch,
+    rag_answer_batch_async,
+    rag_answer_stream
+)
+from src.semantic_cache import SemanticCache
+
+
+POLICIES = [
+    "Employees receive ten paid sick days per calendar year.",
+    "Business travel must be booked at least two weeks in advance.",
+    "Expense claims need an itemized receipt for every purchase.",
+    "Remote work is allowed up to three days per week."
+]
+
+
+class EchoChatModel(BaseChatModel):
+    """Answers with the prompt's question; async calls finish in a chosen order"""
+
+    delays: dict = {}
+    failing: tuple = ()
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+    def _reply(self, messages: List[BaseMessage]) -> ChatResult:
+        question = re.search(r"QUESTION: (.*)\n", messages[-1].content).group(1)
+        if question in self.failing:
+            raise RuntimeError(f"LLM failed for {question}")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"Answer to {question}"))])
+
+    def _generate(self, messages, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return self._reply(messages)
+
+    async def _agenerate(self, messages, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        question = re.search(r"QUESTION: (.*)\n", messages[-1].content).group(1)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(question, 0))
+            return self._reply(messages)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def vectorstore():
+    store = NumpyVectorStore(HashedEmbeddings(256))
+    store.add_documents(
+        [Document(page_content=text, metadata={"source": f"policy-{i}.md", "chunk_id": f"c{i}"})
+         for i, text in enumerate(POLICIES)],
+        ids=[f"c{i}" for i in range(len(POLICIES))]
+    )
+    return store
+
+
+def test_batch_returns_results_in_input_order(vectorstore):
+    """Later questions finishing first do not reorder the results"""
+    questions = [f"question {i} about sick days" for i in range(6)]
+    llm = EchoChatModel(delays={q: 0.05 * (len(questions) - i) for i, q in enumerate(questions)})
+
+    results = rag_answer_batch(vectorstore, questions, k=2, llm=llm, concurrency=6)
+
+    assert [r["question"] for r in results] == questions
+    assert [r["answer"] for r in results] == [f"Answer to {q}" for q in questions]
+
+
+def test_batch_failure_stays_in_its_slot(vectorstore):
+    """A failed question yields an error result without affecting the others"""
+    questions = ["travel booking", "sick days", "expense receipts"]
+    llm = EchoChatModel(failing=("sick days",))
+
+    results = rag_answer_batch(vectorstore, questions, k=2, llm=llm)
+
+    assert [r["outcome"] for r in results] == ["answered", "error", "answered"]
+    assert results[1]["question"] == "sick days"
+    assert "LLM failed" in results[1]["answer"]
+
+
+def test_batch_limits_concurrent_llm_calls(vectorstore):
+    """At most `concurrency` LLM calls are in flight"""
+    questions = [f"question {i}" for i in range(8)]
+    llm = EchoChatModel(delays={q: 0.02 for q in questions})
+
+    asyncio.run(rag_answer_batch_async(vectorstore, questions, k=2, llm=llm, concurrency=3))
+
+    assert llm.max_in_flight == 3
+
+
+def test_batch_edge_cases(vectorstore):
+    """An empty batch needs no calls; concurrency must be positive"""
+    assert rag_answer_batch(vectorstore, [], llm=EchoChatModel()) == []
+    with pytest.raises(ValueError):
+        rag_answer_batch(vectorstore, ["sick days"], llm=EchoChatModel(), concurrency=0)
+
+
+def test_batch_matches_single_answers(vectorstore):
+    """Batched answers equal one-at-a-time answers"""
+    questions = ["sick days", "remote work"]
+    llm = EchoChatModel()
+
+    batch = rag_answer_batch(vectorstore, questions, k=2, llm=llm)
+    single = [rag_answer(vectorstore, q, k=2, llm=llm) for q in questions]
+
+    for batched, alone in zip(batch, single):
+        assert (batched["answer"], batched["sources"]) == (alone["answer"], alone["sources"])
+
+
+class StreamingChatModel(EchoChatModel):
+    """Streams its answer word by word, optionally failing part-way"""
+
+    fail_after: Optional[int] = None
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        words = self._reply(messages).generations[0].message.content.split(" ")
+        for i, word in enumerate(words):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("connection reset")
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if i == 0 else " " + word))
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        for chunk in self._stream(messages, stop, run_manager, **kwargs):
+            yield chunk
+
+
+def _collect_async(stream):
+    async def collect():
+        return [event async for event in stream]
+    return asyncio.run(collect())
+
+
+def test_streams_match_the_non_streaming_answer(vectorstore):
+    """Sync and async streams yield tokens that add up to rag_answer's answer"""
+    llm = StreamingChatModel()
+    expected = rag_answer(vectorstore, "sick days", k=2, llm=llm)
+
+    for events in (
+        list(rag_answer_stream(vectorstore, "sick days", k=2, llm=llm)),
+        _collect_async(rag_answer_astream(vectorstore, "sick days", k=2, llm=llm))
+    ):
+        tokens = [e["content"] for e in events if e["type"] == "token"]
+        result = events[-1]["result"]
+        assert len(tokens) > 1
+        assert "".join(tokens) == result["answer"] == expected["answer"]
+        assert result["sources"] == expected["sources"]
+        assert result["outcome"] == "answered"
+        assert 0 <= result["time_to_first_token"] <= sum(result["timings"].values())
+
+
+def test_stream_failure_keeps_partial_answer_and_is_not_cached(vectorstore):
+    """A stream that breaks reports the error after the tokens already sent"""
+    cache = SemanticCache()
+    events = list(rag_answer_stream(
+        vectorstore, "sick days", k=2, llm=StreamingChatModel(fail_after=2), cache=cache
+    ))
+    result = events[-1]["result"]
+
+    assert result["outcome"] == "error"
+    assert result["answer"].startswith("Answer to\n\nError generating answer: connection reset")
+    assert cache.stats()["entries"] == 0
+
+
+def test_cached_answer_streams_as_one_token(vectorstore):
+    """An early (cached) answer is streamed whole, with its result"""
+    cache = SemanticCache()
+    list(rag_answer_stream(vectorstore, "sick days", k=2, llm=StreamingChatModel(), cache=cache))
+    events = list(rag_answer_stream(vectorstore, "sick days", k=2, llm=StreamingChatModel(), cache=cache))
+
+    assert [e["type"] for e in events] == ["token", "result"]
+    assert events[-1]["result"]["outcome"] == "cached"
+    assert events[0]["content"] == events[-1]["result"]["answer"]
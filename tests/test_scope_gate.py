@@ -0,0 +1,156 @@
+"""
+Tests for the out-of-scope gate and its calibration
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.bm25 import BM25Index
+from src.local_embeddings import HashedEmbeddings
+from src.numpy_store import NumpyVectorStore
+from src.rag_pipeline import rag_answer, search_chunks
+from src.scope_gate import (
+    QUERY_RELEVANCE_KEY,
+    RELEVANCE_KEY,
+    SCOPE_CALIBRATION_FILE,
+    calibrate_threshold,
+    ensure_calibration,
+    is_out_of_scope,
+    load_scope_threshold,
+    scope_calibration_path,
+    top_relevance
+)
+from src.vector_store import build_indexed_vector_store
+
+
+POLICIES_DIR = Path(__file__).parent.parent / "data" / "policies"
+
+
+@pytest.fixture(autouse=True)
+def fresh_threshold(monkeypatch):
+    """Each test reads the threshold from its own environment"""
+    monkeypatch.delenv("SCOPE_THRESHOLD", raising=False)
+    monkeypatch.delenv("SCOPE_CALIBRATION_PATH", raising=False)
+    load_scope_threshold.cache_clear()
+    yield
+    load_scope_threshold.cache_clear()
+
+
+def _doc(text: str, **metadata) -> Document:
+    return Document(page_content=text, metadata=metadata)
+
+
+def test_threshold_splits_separable_groups():
+    """Separable groups get a threshold halfway between them"""
+    calibration = calibrate_threshold([0.6, 0.8], [0.2, 0.4])
+
+    assert calibration["separable"]
+    assert calibration["threshold"] == 0.5
+    assert calibration["out_of_scope_refused"] == 1.0
+
+
+def test_threshold_never_refuses_in_scope_questions():
+    """Overlapping groups put the threshold a margin below every in-scope question"""
+    calibration = calibrate_threshold([0.5, 0.8], [0.3, 0.6], margin=0.05)
+
+    assert not calibration["separable"]
+    assert calibration["threshold"] == 0.45
+    assert calibration["out_of_scope_refused"] == 0.5
+    with pytest.raises(ValueError):
+        calibrate_threshold([], [0.3])
+
+
+def test_gate_prefers_the_pre_fusion_vector_score():
+    """query_relevance wins over per-chunk scores; unscored chunks never refuse"""
+    fused = [_doc("keyword hit"), _doc("vector hit", **{RELEVANCE_KEY: 0.2})]
+    assert top_relevance(fused) == 0.2
+    assert is_out_of_scope(fused, 0.3)
+
+    for doc in fused:
+        doc.metadata[QUERY_RELEVANCE_KEY] = 0.7
+    assert top_relevance(fused) == 0.7
+    assert not is_out_of_scope(fused, 0.3)
+
+    assert not is_out_of_scope([_doc("keyword hit")], 0.3)
+    assert not is_out_of_scope(fused, None)
+
+
+def test_hybrid_search_stamps_the_best_vector_score():
+    """Every fused chunk carries the top vector similarity, even keyword-only hits"""
+    embeddings = HashedEmbeddings(256)
+    docs = [
+        _doc("Employees receive ten paid sick days per year.", source="a.md", chunk_id="a"),
+        _doc("Per diem covers meals on business travel.", source="b.md", chunk_id="b"),
+        _doc("Remote work is allowed three days per week.", source="c.md", chunk_id="c")
+    ]
+    store = NumpyVectorStore(embeddings)
+    store.add_documents(docs, ids=["a", "b", "c"])
+    question = "how many sick days do employees get"
+    embedding = embeddings.embed_query(question)
+
+    best = search_chunks(store, embedding, question, k=1)[0].metadata[RELEVANCE_KEY]
+    fused = search_chunks(store, embedding, question, k=3, keyword_index=BM25Index.from_documents(docs))
+
+    assert [doc.metadata[QUERY_RELEVANCE_KEY] for doc in fused] == [best] * len(fused)
+
+
+def test_refusal_reports_the_retrieved_chunks(monkeypatch):
+    """A gated question still says how many chunks were retrieved"""
+    monkeypatch.setenv("SCOPE_THRESHOLD", "1.01")
+    store = NumpyVectorStore(HashedEmbeddings(256))
+    store.add_documents([_doc(f"policy text {i}", source=f"{i}.md") for i in range(3)])
+
+    llm = FakeListChatModel(responses=["never called"])
+    result = rag_answer(store, "what's the weather", k=2, llm=llm)
+
+    assert result["out_of_scope"]
+    assert result["outcome"] == "out_of_scope"
+    assert result["chunks_retrieved"] == 2
+
+
+def test_threshold_comes_from_a_matching_calibration(tmp_path, monkeypatch):
+    """Calibrations of another embedding model are ignored; SCOPE_THRESHOLD wins"""
+    path = tmp_path / SCOPE_CALIBRATION_FILE
+    path.write_text(json.dumps({"threshold": 0.4, "embedding_model": "hashed-tf-64"}), encoding="utf-8")
+
+    assert load_scope_threshold(str(path), "hashed-tf-64") == 0.4
+    assert load_scope_threshold(str(path), "text-embedding-3-small") is None
+    assert load_scope_threshold(str(tmp_path / "missing.json"), "hashed-tf-64") is None
+
+    monkeypatch.setenv("SCOPE_THRESHOLD", "0.25")
+    load_scope_threshold.cache_clear()
+    assert load_scope_threshold(str(path), "hashed-tf-64") == 0.25
+
+
+def test_calibration_lives_in_the_index_directory(tmp_path, monkeypatch):
+    """The calibration path follows the index, not the working directory"""
+    assert scope_calibration_path(str(tmp_path)) == str(tmp_path / SCOPE_CALIBRATION_FILE)
+
+    monkeypatch.setenv("SCOPE_CALIBRATION_PATH", str(tmp_path / "custom.json"))
+    assert scope_calibration_path(str(tmp_path)) == str(tmp_path / "custom.json")
+
+
+def test_build_calibrates_into_its_persist_directory(tmp_path, monkeypatch):
+    """An index build writes its calibration next to the index, once per model"""
+    policies = tmp_path / "policies"
+    shutil.copytree(POLICIES_DIR, policies)
+    persist = tmp_path / "index"
+    monkeypatch.chdir(tmp_path)
+
+    store = build_indexed_vector_store(
+        str(policies), str(persist), embeddings=HashedEmbeddings(64), backend="numpy"
+    )
+
+    path = persist / SCOPE_CALIBRATION_FILE
+    calibration = json.loads(path.read_text(encoding="utf-8"))
+    assert calibration["embedding_model"] == "hashed-tf-64"
+    assert load_scope_threshold(str(path), "hashed-tf-64") == calibration["threshold"]
+    assert not (tmp_path / "evaluation").exists()
+
+    # Same model: the existing calibration is kept
+    assert ensure_calibration(store, str(path)) is None
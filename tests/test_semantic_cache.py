@@ -0,0 +1,63 @@
+"""
+Tests for the semantic answer cache
+"""
+
+from src.semantic_cache import SemanticCache
+
+
+QUESTION = [1.0, 0.0, 0.0]
+PARAPHRASE = [0.99, 0.1, 0.0]
+CHUNKS = ["policy-1", "policy-2"]
+
+
+def test_paraphrase_with_same_chunks_is_a_hit():
+    """A similar question retrieving the same chunks gets the cached answer"""
+    cache = SemanticCache(threshold=0.9)
+    cache.store(QUESTION, CHUNKS, {"answer": "Ten days."}, index_version="v1")
+
+    result = cache.lookup(PARAPHRASE, reversed(CHUNKS), index_version="v1")
+
+    assert result["answer"] == "Ten days."
+    assert result["cache_similarity"] >= 0.9
+
+
+def test_different_chunks_are_a_miss():
+    """A similar question that retrieved other chunks is answered fresh"""
+    cache = SemanticCache(threshold=0.9)
+    cache.store(QUESTION, CHUNKS, {"answer": "Ten days."}, index_version="v1")
+
+    assert cache.lookup(PARAPHRASE, ["policy-3"], index_version="v1") is None
+
+
+def test_new_index_version_drops_every_entry():
+    """Entries cached for one index version are never served for another"""
+    cache = SemanticCache(threshold=0.9)
+    cache.store(QUESTION, CHUNKS, {"answer": "Ten days."}, index_version="v1")
+    cache.store([0.0, 1.0, 0.0], ["policy-3"], {"answer": "Yes."}, index_version="v1")
+
+    assert cache.lookup(QUESTION, CHUNKS, index_version="v2") is None
+    assert cache.stats()["entries"] == 0
+    # Going back does not resurrect them either
+    assert cache.lookup(QUESTION, CHUNKS, index_version="v1") is None
+
+
+def test_store_under_new_version_invalidates_old_entries():
+    """Storing for a new version also clears answers from the old one"""
+    cache = SemanticCache(threshold=0.9)
+    cache.store(QUESTION, CHUNKS, {"answer": "Ten days."}, index_version="v1")
+    cache.store([0.0, 1.0, 0.0], ["policy-3"], {"answer": "Yes."}, index_version="v2")
+
+    assert cache.stats()["entries"] == 1
+    assert cache.lookup(QUESTION, CHUNKS, index_version="v2") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Beyond max_entries the entry unused for longest is dropped"""
+    cache = SemanticCache(threshold=0.9, max_entries=2)
+    cache.store([1.0, 0.0, 0.0], ["a"], {"answer": "A"})
+    cache.store([0.0, 1.0, 0.0], ["b"], {"answer": "B"})
+    cache.lookup([1.0, 0.0, 0.0], ["a"])
+    cache.store([0.0, 0.0, 1.0], ["c"], {"answer": "C"})
+
+    assert cache.lookup([1.0, 0.0, 0.0], ["a"])["answer"] == "A"
+    assert cache.lookup([0.0, 1.0, 0.0], ["b"]) is None
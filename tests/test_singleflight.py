@@ -0,0 +1,174 @@
+"""
+Tests for request coalescing
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.singleflight import AsyncSingleFlight, SingleFlight, flight_key
+
+
+CALLERS = 5
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+def _run_concurrently(flights, fn, release):
+    """Call flights.do from CALLERS threads once they have all joined"""
+    with ThreadPoolExecutor(CALLERS) as pool:
+        futures = [pool.submit(flights.do, "key", fn) for _ in range(CALLERS)]
+        _wait_for(lambda: flights.coalesced == CALLERS - 1)
+        release.set()
+        return futures
+
+
+def test_flight_key_ignores_case_spacing_and_punctuation():
+    """Rewordings that differ only in formatting share a flight"""
+    assert flight_key("How many  sick days?", "v1") == flight_key("how many sick days", "v1")
+    assert flight_key("How many sick days?", "v1") != flight_key("How many sick days?", "v2")
+
+
+def test_concurrent_callers_share_one_computation():
+    """One caller computes, every other one gets its result"""
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def answer():
+        calls.append(1)
+        release.wait()
+        return {"answer": "Ten days."}
+
+    futures = _run_concurrently(flights, answer, release)
+    results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(value == {"answer": "Ten days."} for value, _ in results)
+    assert sorted(shared for _, shared in results) == [False] + [True] * (CALLERS - 1)
+    assert flights.leaders == 1
+
+
+def test_followers_get_their_own_copy_and_question():
+    """Followers get a coalesced copy; the leader keeps the original result"""
+    flights = SingleFlight()
+    release = threading.Event()
+    result = {"question": "How many sick days?", "answer": "Ten days."}
+
+    def answer():
+        release.wait()
+        return result
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        futures = [
+            pool.submit(flights.do, "key", answer, f"question {i}") for i in range(CALLERS)
+        ]
+        _wait_for(lambda: flights.coalesced == CALLERS - 1)
+        release.set()
+        results = [future.result() for future in futures]
+
+    for i, (value, shared) in enumerate(results):
+        if shared:
+            assert value is not result
+            assert value == {"question": f"question {i}", "answer": "Ten days.", "coalesced": True}
+        else:
+            assert value is result
+    assert "coalesced" not in result
+
+
+def test_leader_error_is_raised_in_every_follower():
+    """A failed computation fails all callers instead of hanging them"""
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait()
+        raise RuntimeError("LLM unavailable")
+
+    futures = _run_concurrently(flights, fail, release)
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="LLM unavailable"):
+            future.result()
+
+
+def test_finished_flight_is_not_reused():
+    """A caller arriving after the flight ended computes afresh"""
+    flights = SingleFlight()
+    counter = iter(range(10))
+
+    first, _ = flights.do("key", lambda: next(counter))
+    second, shared = flights.do("key", lambda: next(counter))
+
+    assert (first, second, shared) == (0, 1, False)
+
+
+def test_stream_followers_get_every_event_and_their_own_question():
+    """Followers replay the leader's tokens; their result carries their question"""
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def events():
+        yield {"type": "token", "text": "Ten "}
+        release.wait()
+        yield {"type": "token", "text": "days."}
+        yield {"type": "result", "result": {"question": "leader", "answer": "Ten days."}}
+
+    leader = flights.stream("key", events, "leader")
+    assert next(leader) == {"type": "token", "text": "Ten "}
+    follower = flights.stream("key", events, "follower")
+    # Joins the running flight and replays the token already produced
+    assert next(follower) == {"type": "token", "text": "Ten "}
+    release.set()
+
+    leader_events = list(leader)
+    follower_events = list(follower)
+
+    assert follower_events[0] == {"type": "token", "text": "days."}
+    assert flights.leaders == 1
+    assert follower_events[-1]["result"]["question"] == "follower"
+    assert follower_events[-1]["result"]["coalesced"] is True
+    assert "coalesced" not in leader_events[-1]["result"]
+
+
+def test_async_callers_share_one_computation_and_its_error():
+    """The async flight coalesces callers and propagates the leader's error"""
+    async def scenario():
+        flights = AsyncSingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def answer():
+            calls.append(1)
+            await release.wait()
+            return "Ten days."
+
+        async def fail():
+            await release.wait()
+            raise RuntimeError("LLM unavailable")
+
+        tasks = [asyncio.ensure_future(flights.do("ok", answer)) for _ in range(CALLERS)]
+        failing = [asyncio.ensure_future(flights.do("bad", fail)) for _ in range(CALLERS)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*tasks)
+        errors = await asyncio.gather(*failing, return_exceptions=True)
+        return calls, results, errors, flights
+
+    calls, results, errors, flights = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ["Ten days."] * CALLERS
+    assert sum(shared for _, shared in results) == CALLERS - 1
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert flights.coalesced == 2 * (CALLERS - 1)